@@ -1 +1,8 @@
-from . import models
+# The calculation core (``engine``) is importable without Odoo; the models,
+# reports, wizards and controllers are only loaded when the package is
+# imported as an addon.
+if __name__.startswith("odoo.addons."):
+    from . import models
+    from . import report
+    from . import wizard
+    from . import controllers
@@ -42,6 +42,7 @@
     "license": "LGPL-3",
     "depends": [
         "base",
+        "bus",
         "sale",
     ],
     "data": [
@@ -62,10 +63,20 @@
         "data/hotwater/hvac_water_heater_data.xml",
         "data/hotwater/hvac_pool_heater_data.xml",
         
+        # Scheduled Actions
+        "data/hvac_cron_data.xml",
+        
         # Main Menu and Terms (MUST BE FIRST)
         "views/hvac_terms_views.xml",
+        "views/hvac_perf_stat_views.xml",
+        "views/hvac_report_job_views.xml",
+        "views/hvac_portfolio_report_views.xml",
+        "views/hvac_scenario_views.xml",
         "views/hvac_main_menus.xml",
         
+        # Wizards
+        "wizard/hvac_space_import_views.xml",
+        
         # Views - Heating
         "views/heating/hvac_boiler_views.xml",
         "views/heating/hvac_radiator_views.xml",
@@ -87,6 +98,10 @@
         "views/hotwater/hvac_hotwater_project_views.xml",
         "views/hotwater/hvac_hotwater_menus.xml",
         
+        # Views - Buildings
+        "views/building/hvac_building_views.xml",
+        "views/building/hvac_building_menus.xml",
+        
         # Reports
         "report/report_heating_project.xml",
         "report/report_cooling_project.xml",
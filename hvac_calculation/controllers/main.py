@@ -0,0 +1,13 @@
+from odoo import http
+from odoo.http import request
+
+
+class HVACSweepController(http.Controller):
+
+    @http.route('/hvac/sweep', type='jsonrpc', auth='user')
+    def sensitivity_sweep(self, discipline, project_id, parameter, start, stop, points=100):
+        """Totals curve and plant breakpoints of a project over one space input
+        (see ``hvac.scenario.get_sensitivity_sweep``)."""
+        return request.env['hvac.scenario'].get_sensitivity_sweep(
+            discipline, project_id, parameter, start, stop, points,
+        )
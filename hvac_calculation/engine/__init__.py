@@ -0,0 +1,16 @@
+"""Pure-Python HVAC calculation core.
+
+Nothing in this package depends on Odoo: the model computes call it, and it
+can be imported on its own (``from hvac_calculation.engine import loads``) to
+run sizing scripts, tests or benchmarks without a database.
+"""
+from . import duct
+from . import hourly
+from . import hydronic
+from . import loads
+from . import memo
+from . import optimizer
+from . import plant
+from . import scenario
+from . import selection
+from . import sweep
@@ -0,0 +1,200 @@
+"""Sizing of air duct networks.
+
+A duct network is a tree of segments rooted at an AHU or a ducted FCU; the
+rooms (and their diffusers) hang at the end of segments. The airflow of a
+segment is the airflow of every room downstream of it. Segments are sized
+either by equal friction (the same pressure gradient everywhere) or by
+static regain (each downstream segment slows the air enough for the
+recovered velocity pressure to cover its own friction loss), then given a
+rectangular section of the same pressure drop to get the sheet metal and
+insulation quantities.
+
+As for the pipe networks, a change to the rooms of one segment is re-sized
+from the previous result along that branch only (plus, with static regain,
+the branches fed from the re-sized segments, whose velocity they regain).
+"""
+import math
+from collections import namedtuple
+
+from .hydronic import subtree_totals, topological_order, upstream
+
+CFM_TO_M3S = 0.000471947
+CFM_PER_TON = 400  # supply air per ton of refrigeration
+AIR_DENSITY = 1.2  # kg/m³
+AIR_VISCOSITY = 1.5e-5  # m²/s, kinematic
+STEEL_DENSITY = 7850  # kg/m³
+DUCT_ROUGHNESS = 0.09  # mm, galvanized steel
+
+FRICTION_RATE = 0.8  # Pa/m, equal friction design
+MAX_VELOCITY = 7.5  # m/s, main ducts
+REGAIN_COEFFICIENT = 0.75  # share of the velocity pressure drop recovered as static pressure
+DUCT_HEIGHT = 250  # mm, preferred height of the rectangular ducts
+MAX_ASPECT_RATIO = 4  # width over height of the rectangular ducts
+SEAM_ALLOWANCE = 15  # % extra sheet for seams, joints and hangers
+
+# Round duct diameters (mm)
+ROUND_SIZES = (100, 125, 150, 200, 250, 300, 350, 400, 450, 500, 550, 600, 700, 800, 900, 1000, 1200)
+
+DuctResult = namedtuple(
+    'DuctResult', 'airflow diameter width height velocity gradient pressure_drop path_pressure_drop sheet_area',
+)
+NetworkResult = namedtuple('NetworkResult', 'segments index_path index_pressure_drop unsized resized')
+
+
+def room_airflow(cooling_load_ton, unit_airflow_cfm=0, unit_qty=0):
+    """Supply airflow (CFM) of a room: the airflow of its units when known,
+    400 CFM per ton otherwise."""
+    if unit_airflow_cfm:
+        return unit_airflow_cfm * (unit_qty or 1)
+    return (cooling_load_ton or 0) * CFM_PER_TON
+
+
+def round_duct(airflow_cfm, diameter):
+    """``(velocity m/s, gradient Pa/m)`` of ``airflow_cfm`` in a round duct."""
+    diameter = diameter / 1000
+    velocity = airflow_cfm * CFM_TO_M3S / (math.pi * diameter ** 2 / 4)
+    reynolds = velocity * diameter / AIR_VISCOSITY
+    if reynolds <= 0:
+        return 0.0, 0.0
+    factor = 0.25 / math.log10(DUCT_ROUGHNESS / 1000 / diameter / 3.7 + 5.74 / reynolds ** 0.9) ** 2
+    return velocity, factor / diameter * AIR_DENSITY * velocity ** 2 / 2
+
+
+def equivalent_diameter(width, height):
+    """Round diameter with the same friction as a ``width`` x ``height`` duct (Huebscher)."""
+    return 1.30 * (width * height) ** 0.625 / (width + height) ** 0.25
+
+
+def rectangular_duct(diameter, height=DUCT_HEIGHT):
+    """``(width, height)`` (mm, 50 mm steps) of the rectangular duct
+    equivalent to a round one. The height is ``height`` unless the duct
+    is narrower than that, then it is square, or wider than the aspect
+    ratio allows, then it is raised."""
+    if diameter <= height:
+        side = math.ceil(diameter * 0.92 / 50) * 50
+        return side, side
+    width = height
+    while equivalent_diameter(width, height) < diameter:
+        if width >= MAX_ASPECT_RATIO * height:
+            height += 50
+        else:
+            width += 50
+    return width, height
+
+
+def equal_friction_size(airflow_cfm, friction_rate=FRICTION_RATE, max_velocity=MAX_VELOCITY):
+    """Smallest round size within the friction rate and velocity limit;
+    ``None`` when even the largest is too small."""
+    for diameter in ROUND_SIZES:
+        velocity, gradient = round_duct(airflow_cfm, diameter)
+        if gradient <= friction_rate and velocity <= max_velocity:
+            return diameter
+    return None
+
+
+def static_regain_size(airflow_cfm, length, upstream_velocity, max_velocity=MAX_VELOCITY):
+    """Smallest round size whose velocity drop from ``upstream_velocity``
+    regains at least the friction loss over ``length``; ``None`` when even
+    the largest does not."""
+    for diameter in ROUND_SIZES:
+        velocity, gradient = round_duct(airflow_cfm, diameter)
+        regain = REGAIN_COEFFICIENT * AIR_DENSITY / 2 * (upstream_velocity ** 2 - velocity ** 2)
+        if velocity <= max_velocity and regain >= gradient * length:
+            return diameter
+    return None
+
+
+def solve(segments, method='equal_friction', friction_rate=FRICTION_RATE, max_velocity=MAX_VELOCITY,
+          duct_height=DUCT_HEIGHT, previous=None, dirty=()):
+    """Size a network.
+
+    ``segments`` maps each segment id to a dict with ``parent_id``,
+    ``length`` (m) and ``airflow`` (CFM of the rooms at its end). The root
+    segments, and the branches whose upstream velocity is too low for any
+    regain, are sized by equal friction. Segments no duct size can
+    carry within the limits get the largest one and are listed in
+    ``unsized``.
+
+    ``previous`` and ``dirty`` work as in :func:`.hydronic.solve`, the
+    ``airflow`` being only needed for the dirty segments and the segments
+    upstream of them; ``unsized`` then only lists segments sized again.
+    """
+    parents = {segment_id: segment['parent_id'] for segment_id, segment in segments.items()}
+    order = topological_order(parents)
+    if previous is None:
+        resize = set(order)
+    else:
+        resize = upstream(parents, dirty) | {segment_id for segment_id in order if segment_id not in previous}
+
+    airflows = subtree_totals(
+        order, parents, {segment_id: segments[segment_id].get('airflow') for segment_id in resize}, resize,
+        {segment_id: previous[segment_id].airflow for segment_id in order if segment_id not in resize},
+    )
+
+    results = {}
+    unsized = []
+    resized = []
+    slowed = set()  # resized segments, whose velocity the static regain of their branches depends on
+    for segment_id in order:
+        airflow = airflows[segment_id]
+        length = segments[segment_id]['length'] or 0
+        parent = results.get(parents[segment_id])
+        if segment_id not in resize and not (method == 'static_regain' and parents[segment_id] in slowed):
+            res = previous[segment_id]
+            results[segment_id] = res._replace(
+                path_pressure_drop=(parent.path_pressure_drop if parent else 0) + res.pressure_drop,
+            )
+            continue
+        resized.append(segment_id)
+        if not airflow:
+            results[segment_id] = DuctResult(0, 0, 0, 0, 0, 0, 0, parent.path_pressure_drop if parent else 0, 0)
+            continue
+        diameter = None
+        if method == 'static_regain' and parent and parent.velocity:
+            diameter = static_regain_size(airflow, length, parent.velocity, max_velocity)
+        if not diameter:
+            # first segments, and branches too slow to regain anything
+            diameter = equal_friction_size(airflow, friction_rate, max_velocity)
+        if not diameter:
+            unsized.append(segment_id)
+            diameter = ROUND_SIZES[-1]
+        velocity, gradient = round_duct(airflow, diameter)
+        width, height = rectangular_duct(diameter, duct_height)
+        pressure_drop = gradient * length
+        results[segment_id] = DuctResult(
+            airflow, diameter, width, height, velocity, gradient, pressure_drop,
+            (parent.path_pressure_drop if parent else 0) + pressure_drop,
+            2 * (width + height) / 1000 * length * (1 + SEAM_ALLOWANCE / 100),
+        )
+        slowed.add(segment_id)
+
+    index_path = []
+    index_pressure_drop = 0
+    if results:
+        segment_id = max(order, key=lambda segment_id: results[segment_id].path_pressure_drop)
+        index_pressure_drop = results[segment_id].path_pressure_drop
+        while segment_id in parents:
+            index_path.append(segment_id)
+            segment_id = parents[segment_id]
+        index_path.reverse()
+    return NetworkResult(results, index_path, index_pressure_drop, unsized, resized)
+
+
+def sheet_weight(sheet_area, thickness):
+    """Weight (kg) of ``sheet_area`` m² of ``thickness`` mm steel sheet."""
+    return sheet_area * (thickness or 0) / 1000 * STEEL_DENSITY
+
+
+def select_diffusers(airflow_cfm, diffusers):
+    """Diffusers of a room as ``(diffuser id, qty)``: the fewest outlets,
+    then the smallest model covering the airflow per outlet. ``diffusers``
+    are ``(id, airflow_cfm)`` pairs; ``None`` when there is none."""
+    diffusers = sorted((airflow, diffuser_id) for diffuser_id, airflow in diffusers if airflow > 0)
+    if not airflow_cfm or not diffusers:
+        return None
+    qty = math.ceil(airflow_cfm / diffusers[-1][0])
+    per_outlet = airflow_cfm / qty
+    for airflow, diffuser_id in diffusers:
+        if airflow >= per_outlet:
+            return diffuser_id, qty
+    return diffusers[-1][1], qty
@@ -0,0 +1,166 @@
+"""Hourly cooling loads over a summer design day.
+
+Each room gets a 24-value profile (W, hour 0 to 23, solar time) built from
+its envelope, solar, people, lighting and equipment gains. The building
+(block) load is the sum of the profiles hour by hour: its peak is the
+time-coincident load the plant has to meet, lower than the sum of the room
+peaks when the rooms peak at different hours (east versus west glass,
+offices versus flats).
+
+The model is deliberately simple: steady-state conduction with a fixed
+time lag for walls, clear-sky solar gains through glass, and fixed gains
+per schedule. It is meant for plant sizing, not for energy simulation.
+"""
+import math
+
+HOURS = range(24)
+
+INDOOR_TEMP = 24.0  # °C
+DESIGN_TEMP = 43.0  # °C, outdoor dry-bulb at the hottest hour
+DAILY_RANGE = 12.0  # K, outdoor swing over the design day
+
+WALL_U = 0.6  # W/m²K
+WINDOW_U = 2.8  # W/m²K
+SHGC = 0.4  # solar heat gain coefficient of the glazing
+WALL_LAG = 3  # hours between outdoor temperature and wall heat flow
+PERSON_W = 130  # W per occupant, sensible + latent
+
+LIGHTING_WATT_PER_SQM = 10
+EQUIPMENT_WATT_PER_SQM = 15
+
+# Fraction of the daily range below the peak temperature, hour 0 to 23
+RANGE_FRACTIONS = (
+    0.82, 0.87, 0.92, 0.96, 0.99, 1.00, 0.98, 0.93, 0.84, 0.71, 0.56, 0.39,
+    0.23, 0.11, 0.03, 0.00, 0.03, 0.10, 0.21, 0.34, 0.47, 0.58, 0.68, 0.76,
+)
+
+# Wall azimuth (degrees from north) per orientation
+ORIENTATIONS = {
+    'n': 0, 'ne': 45, 'e': 90, 'se': 135, 's': 180, 'sw': 225, 'w': 270, 'nw': 315,
+}
+
+
+def _solar_profile(wall_azimuth):
+    """Clear-sky gain (W/m² of glass, before SHGC) on a vertical window.
+
+    The sun rises due east at 6, culminates due south at 80° at noon and
+    sets due west at 18.
+    """
+    profile = []
+    for hour in HOURS:
+        if not 6 < hour < 18:
+            profile.append(0.0)
+            continue
+        altitude = math.radians(80) * math.sin(math.pi * (hour - 6) / 12)
+        azimuth = math.radians(90 + 180 * (hour - 6) / 12)
+        direct = 800 * math.sqrt(math.sin(altitude))
+        incidence = math.cos(altitude) * math.cos(azimuth - math.radians(wall_azimuth))
+        diffuse = 100 * math.sqrt(math.sin(altitude))
+        profile.append(direct * max(0.0, incidence) + diffuse)
+    return profile
+
+
+SOLAR = {orientation: _solar_profile(azimuth) for orientation, azimuth in ORIENTATIONS.items()}
+SOLAR['interior'] = [0.0] * 24
+
+
+def _schedule(occupied, unoccupied, start, end):
+    return [occupied if start <= hour < end else unoccupied for hour in HOURS]
+
+
+# Fraction of the installed gains in use, hour 0 to 23
+SCHEDULES = {
+    'office': {
+        'people': _schedule(0.95, 0.0, 8, 18),
+        'lighting': _schedule(0.9, 0.05, 8, 18),
+        'equipment': _schedule(0.9, 0.2, 8, 18),
+    },
+    'residential': {
+        'people': [0.9] * 8 + [0.4] * 9 + [0.8] * 7,
+        'lighting': [0.2] * 7 + [0.1] * 11 + [0.8] * 6,
+        'equipment': [0.3] * 17 + [0.6] * 7,
+    },
+    'retail': {
+        'people': _schedule(0.8, 0.0, 10, 22),
+        'lighting': _schedule(0.95, 0.1, 10, 22),
+        'equipment': _schedule(0.8, 0.2, 10, 22),
+    },
+    'continuous': {
+        'people': [1.0] * 24,
+        'lighting': [1.0] * 24,
+        'equipment': [1.0] * 24,
+    },
+}
+
+
+def outdoor_temperatures(design_temp=DESIGN_TEMP, daily_range=DAILY_RANGE):
+    """Outdoor dry-bulb temperature (°C) of the design day, hour 0 to 23."""
+    design_temp = design_temp or DESIGN_TEMP
+    daily_range = daily_range or DAILY_RANGE
+    return [design_temp - daily_range * fraction for fraction in RANGE_FRACTIONS]
+
+
+def room_profile(room, outdoor, indoor_temp=INDOOR_TEMP):
+    """Hourly cooling load (W) of ``qty`` identical rooms.
+
+    ``room`` maps the space fields to their values: ``area``, ``qty``,
+    ``load_factor_percent``, ``orientation``, ``wall_area``, ``window_area``,
+    ``occupants``, ``lighting_w_per_sqm``, ``equipment_w_per_sqm`` and
+    ``schedule``; missing or empty values fall back to the defaults.
+    """
+    indoor_temp = indoor_temp or INDOOR_TEMP
+    area = room.get('area') or 0
+    schedule = SCHEDULES[room.get('schedule') or 'office']
+    solar = SOLAR[room.get('orientation') or 'interior']
+    wall_ua = (room.get('wall_area') or 0) * WALL_U
+    window_area = room.get('window_area') or 0
+    window_ua = window_area * WINDOW_U
+    solar_gain = window_area * SHGC
+    people = (room.get('occupants') or 0) * PERSON_W
+    lighting = area * (room.get('lighting_w_per_sqm') or LIGHTING_WATT_PER_SQM)
+    equipment = area * (room.get('equipment_w_per_sqm') or EQUIPMENT_WATT_PER_SQM)
+    factor = (room.get('load_factor_percent') or 100) / 100 * (room.get('qty') or 1)
+    people_schedule, lighting_schedule, equipment_schedule = (
+        schedule['people'], schedule['lighting'], schedule['equipment'],
+    )
+    return [
+        max(0.0, (
+            wall_ua * (outdoor[hour - WALL_LAG] - indoor_temp)
+            + window_ua * (outdoor[hour] - indoor_temp)
+            + solar_gain * solar[hour]
+            + people * people_schedule[hour]
+            + lighting * lighting_schedule[hour]
+            + equipment * equipment_schedule[hour]
+        )) * factor
+        for hour in HOURS
+    ]
+
+
+def room_profiles(rooms, outdoor, indoor_temp=INDOOR_TEMP):
+    """Batch :func:`room_profile`."""
+    return [room_profile(room, outdoor, indoor_temp) for room in rooms]
+
+
+def peak(profile):
+    """Peak of a profile as ``(W, hour)``; ``(0, 0)`` for an empty one."""
+    if not profile:
+        return 0.0, 0
+    hour = max(HOURS, key=profile.__getitem__)
+    return profile[hour], hour
+
+
+def block_profile(profiles):
+    """Time-coincident load (W) of a set of rooms, hour by hour."""
+    profiles = [profile for profile in profiles if profile]
+    if not profiles:
+        return [0.0] * 24
+    return [sum(loads) for loads in zip(*profiles)]
+
+
+def block_load(profiles):
+    """Block load of a set of rooms as ``(peak W, peak hour, diversity)``;
+    the diversity is the block peak over the sum of the room peaks."""
+    profiles = [profile for profile in profiles if profile]
+    block_peak, hour = peak(block_profile(profiles))
+    room_peaks = sum(max(profile) for profile in profiles)
+    return block_peak, hour, block_peak / room_peaks if room_peaks else 1.0
@@ -0,0 +1,183 @@
+"""Sizing of a two-pipe hydronic heating network.
+
+The network is a tree rooted at the boiler: every segment has at most one
+parent, and the emitters (radiators, UFH manifolds) hang at the end of
+segments. The flow in a segment is therefore the flow of all the emitters
+downstream of it, found with one pass over the tree in reverse topological
+order; no system of equations has to be solved. The pipe of each segment
+is the smallest one within the velocity and pressure gradient limits, and
+the index circuit is the path from the boiler with the largest pressure
+drop, which sets the pump head.
+
+A change to the emitters of one segment only changes the flow of that
+segment and of the segments upstream of it, so a network can be re-sized
+from its previous result by sizing that branch alone.
+"""
+import math
+from collections import namedtuple
+
+WATER_HEAT_CAPACITY = 4186  # J/kg.K
+WATER_DENSITY = 977  # kg/m³ at 70 °C
+WATER_VISCOSITY = 4.0e-7  # m²/s, kinematic, at 70 °C
+
+DELTA_T = 20  # K, supply - return
+MAX_VELOCITY = 1.0  # m/s
+MAX_GRADIENT = 250  # Pa/m
+FITTING_ALLOWANCE = 30  # % of the straight length
+EMITTER_PRESSURE_DROP = 10000  # Pa, radiator valve and lockshield of the index emitter
+
+# Absolute roughness (mm) per pipe material
+ROUGHNESS = {'ppr': 0.007, 'pex': 0.007, 'multilayer': 0.007, 'copper': 0.0015, 'steel': 0.045}
+
+Pipe = namedtuple('Pipe', 'id diameter roughness price')
+SegmentResult = namedtuple(
+    'SegmentResult', 'heat_load flow pipe_id velocity gradient pressure_drop path_pressure_drop',
+)
+NetworkResult = namedtuple('NetworkResult', 'segments index_path index_pressure_drop unsized resized')
+
+
+def flow_rate(heat_load, delta_t=DELTA_T):
+    """Water flow (m³/h) carrying ``heat_load`` W at ``delta_t`` K."""
+    return (heat_load or 0) / (WATER_HEAT_CAPACITY * (delta_t or DELTA_T)) / WATER_DENSITY * 3600
+
+
+def friction_factor(reynolds, relative_roughness):
+    """Darcy friction factor: laminar below Re 2300, Swamee-Jain above."""
+    if reynolds <= 0:
+        return 0.0
+    if reynolds < 2300:
+        return 64 / reynolds
+    return 0.25 / math.log10(relative_roughness / 3.7 + 5.74 / reynolds ** 0.9) ** 2
+
+
+def pipe_flow(flow, pipe):
+    """``(velocity m/s, gradient Pa/m)`` of ``flow`` m³/h in ``pipe``."""
+    diameter = pipe.diameter / 1000
+    velocity = flow / 3600 / (math.pi * diameter ** 2 / 4)
+    reynolds = velocity * diameter / WATER_VISCOSITY
+    factor = friction_factor(reynolds, pipe.roughness / pipe.diameter)
+    return velocity, factor / diameter * WATER_DENSITY * velocity ** 2 / 2
+
+
+def select_pipe(flow, pipes, max_velocity=MAX_VELOCITY, max_gradient=MAX_GRADIENT):
+    """Smallest pipe of ``pipes`` (sorted by diameter) carrying ``flow``
+    within both limits, as ``(pipe, velocity, gradient)``; ``None`` when
+    even the largest is too small."""
+    for pipe in pipes:
+        velocity, gradient = pipe_flow(flow, pipe)
+        if velocity <= max_velocity and gradient <= max_gradient:
+            return pipe, velocity, gradient
+    return None
+
+
+def topological_order(parents):
+    """Segment ids, each after its parent. ``parents`` maps each id to its
+    parent id (``None`` or a missing id for the segments fed by the source).
+    Raise ``ValueError`` on a loop."""
+    children = {}
+    roots = []
+    for segment_id, parent_id in parents.items():
+        if parent_id in parents:
+            children.setdefault(parent_id, []).append(segment_id)
+        else:
+            roots.append(segment_id)
+    order = []
+    stack = list(reversed(roots))
+    while stack:
+        segment_id = stack.pop()
+        order.append(segment_id)
+        stack.extend(reversed(children.get(segment_id, ())))
+    if len(order) != len(parents):
+        raise ValueError("The network contains a loop.")
+    return order
+
+
+def upstream(parents, segment_ids):
+    """``segment_ids`` and every segment upstream of them, up to the source."""
+    result = set()
+    for segment_id in segment_ids:
+        while segment_id in parents and segment_id not in result:
+            result.add(segment_id)
+            segment_id = parents[segment_id]
+    return result
+
+
+def subtree_totals(order, parents, values, resize, previous):
+    """Total of ``values`` (per segment) over each segment and everything
+    downstream of it. Only the segments of ``resize`` are summed; the others
+    keep their ``previous`` total."""
+    totals = {
+        segment_id: (values.get(segment_id) or 0) if segment_id in resize else previous[segment_id]
+        for segment_id in order
+    }
+    for segment_id in reversed(order):
+        parent_id = parents[segment_id]
+        if parent_id in resize:
+            totals[parent_id] += totals[segment_id]
+    return totals
+
+
+def solve(segments, pipes, delta_t=DELTA_T, max_velocity=MAX_VELOCITY, max_gradient=MAX_GRADIENT,
+          emitter_pressure_drop=EMITTER_PRESSURE_DROP, previous=None, dirty=()):
+    """Size a network.
+
+    ``segments`` maps each segment id to a dict with ``parent_id``,
+    ``length`` (m), ``fitting_allowance`` (%) and ``heat_load`` (W of the
+    emitters at its end). The pressure drops count supply and return.
+    Segments no pipe can carry are listed in ``unsized`` and left out of
+    the pressure drops.
+
+    With ``previous``, the results of the last sizing per segment id, only
+    the ``dirty`` segments (emitters, length or parent changed) and the
+    segments upstream of them are sized again, and only they need a
+    ``heat_load``; the others keep their previous result. The segments
+    sized are listed in ``resized``.
+    """
+    pipes = sorted(pipes, key=lambda pipe: pipe.diameter)
+    parents = {segment_id: segment['parent_id'] for segment_id, segment in segments.items()}
+    order = topological_order(parents)
+    if previous is None:
+        resize = set(order)
+    else:
+        resize = upstream(parents, dirty) | {segment_id for segment_id in order if segment_id not in previous}
+
+    loads = subtree_totals(
+        order, parents, {segment_id: segments[segment_id].get('heat_load') for segment_id in resize}, resize,
+        {segment_id: previous[segment_id].heat_load for segment_id in order if segment_id not in resize},
+    )
+
+    results = {}
+    unsized = []
+    resized = []
+    path_drops = {}
+    for segment_id in order:
+        segment = segments[segment_id]
+        if segment_id in resize:
+            resized.append(segment_id)
+            flow = flow_rate(loads[segment_id], delta_t)
+            selected = select_pipe(flow, pipes, max_velocity, max_gradient) if flow else None
+            pipe_id = velocity = gradient = pressure_drop = 0
+            if selected:
+                pipe, velocity, gradient = selected
+                pipe_id = pipe.id
+                length = (segment['length'] or 0) * (1 + (segment.get('fitting_allowance') or 0) / 100)
+                pressure_drop = 2 * gradient * length
+        else:
+            _load, flow, pipe_id, velocity, gradient, pressure_drop, _path = previous[segment_id]
+        if flow and not pipe_id:
+            unsized.append(segment_id)
+        path_drops[segment_id] = path_drops.get(parents[segment_id], 0) + pressure_drop
+        results[segment_id] = SegmentResult(
+            loads[segment_id], flow, pipe_id, velocity, gradient, pressure_drop, path_drops[segment_id],
+        )
+
+    index_path = []
+    index_pressure_drop = 0
+    if path_drops:
+        segment_id = max(order, key=path_drops.__getitem__)
+        index_pressure_drop = path_drops[segment_id] + emitter_pressure_drop
+        while segment_id in parents:
+            index_path.append(segment_id)
+            segment_id = parents[segment_id]
+        index_path.reverse()
+    return NetworkResult(results, index_path, index_pressure_drop, unsized, resized)
@@ -0,0 +1,156 @@
+"""Load formulas of the cooling, heating and hot water calculations.
+
+Each formula has a scalar version, used by forms and onchanges, and a batch
+version taking one sequence per input column (as returned by ``mapped``)
+and returning lists, used by the stored computes. Empty inputs (``0``,
+``None`` or ``False``) fall back to the same defaults as the space fields.
+"""
+import math
+
+W_TO_BTU = 3.412  # BTU/hr per W
+W_PER_TON = 3517  # W per ton of refrigeration
+KW_TO_BTU = 3412  # BTU/hr per kW
+POOL_M3_PER_KW = 5  # approximate initial pool heating: 1 kW per 5 m³
+HEATER_STORAGE_RATIO = 0.5  # storage sized for half the daily demand
+
+COOLING_WATT_PER_SQM = 150
+HEATING_WATT_PER_SQM = 100
+DEFAULT_HEIGHT = 3.0
+DEFAULT_POOL_DEPTH = 1.5
+
+# Standard hot water demand per fixture (liters/day)
+FIXTURE_DEMAND = {'shower': 50, 'bathtub': 100, 'sink': 20}
+# Peak flow rates per fixture (L/min)
+FIXTURE_FLOW = {'shower': 10, 'bathtub': 15, 'sink': 5}
+
+DEMAND_SPACE_TYPES = ('bathroom', 'kitchen', 'laundry')
+POOL_SPACE_TYPES = ('pool', 'jacuzzi')
+
+
+# Cooling
+def room_load(area, watt_per_sqm, load_factor_percent, qty, default_watt_per_sqm):
+    """Load (W) of ``qty`` identical rooms."""
+    return (area or 0) * (watt_per_sqm or default_watt_per_sqm) * (load_factor_percent or 100) / 100 * (qty or 1)
+
+
+def room_loads(areas, watt_per_sqms, load_factor_percents, qtys, default_watt_per_sqm):
+    """Loads of a batch of spaces, from their input columns."""
+    return [
+        (area or 0) * (watt_per_sqm or default_watt_per_sqm) * (load_factor_percent or 100) / 100 * (qty or 1)
+        for area, watt_per_sqm, load_factor_percent, qty
+        in zip(areas, watt_per_sqms, load_factor_percents, qtys)
+    ]
+
+
+def cooling_load(area, watt_per_sqm, load_factor_percent, qty):
+    """Cooling load of a space as ``(W, BTU/hr, TR)``."""
+    watt = room_load(area, watt_per_sqm, load_factor_percent, qty, COOLING_WATT_PER_SQM)
+    return watt, watt * W_TO_BTU, watt / W_PER_TON
+
+
+def cooling_loads(areas, watt_per_sqms, load_factor_percents, qtys):
+    """Batch :func:`cooling_load`, as three lists ``(W, BTU/hr, TR)``."""
+    watts = room_loads(areas, watt_per_sqms, load_factor_percents, qtys, COOLING_WATT_PER_SQM)
+    return watts, [watt * W_TO_BTU for watt in watts], [watt / W_PER_TON for watt in watts]
+
+
+def volumes(areas, heights):
+    return [(area or 0) * (height or DEFAULT_HEIGHT) for area, height in zip(areas, heights)]
+
+
+def watt_to_btu(watt):
+    return watt * W_TO_BTU if watt else 0
+
+
+def btu_to_watt(btu):
+    return btu / W_TO_BTU if btu else 0
+
+
+def kw_to_btu(kw):
+    return kw * KW_TO_BTU if kw else 0
+
+
+# Heating
+def heat_load(area, watt_per_sqm, load_factor_percent, qty):
+    """Heat load of a space (W)."""
+    return room_load(area, watt_per_sqm, load_factor_percent, qty, HEATING_WATT_PER_SQM)
+
+
+def heat_loads(areas, watt_per_sqms, load_factor_percents, qtys):
+    return room_loads(areas, watt_per_sqms, load_factor_percents, qtys, HEATING_WATT_PER_SQM)
+
+
+def units_needed(load, unit_capacity):
+    """Number of units of ``unit_capacity`` covering ``load``, at least one."""
+    if not unit_capacity:
+        return 1
+    return max(1, math.ceil(load / unit_capacity))
+
+
+# Hot water
+def fixture_demand(space_type, showers, bathtubs, sinks, qty):
+    """Daily hot water demand (L/day) of ``qty`` identical usage points."""
+    if space_type not in DEMAND_SPACE_TYPES:
+        return 0
+    return (
+        (showers or 0) * FIXTURE_DEMAND['shower']
+        + (bathtubs or 0) * FIXTURE_DEMAND['bathtub']
+        + (sinks or 0) * FIXTURE_DEMAND['sink']
+    ) * (qty or 1)
+
+
+def fixture_demands(space_types, showers, bathtubs, sinks, qtys):
+    shower, bathtub, sink = FIXTURE_DEMAND['shower'], FIXTURE_DEMAND['bathtub'], FIXTURE_DEMAND['sink']
+    return [
+        ((s or 0) * shower + (b or 0) * bathtub + (k or 0) * sink) * (qty or 1)
+        if space_type in DEMAND_SPACE_TYPES else 0
+        for space_type, s, b, k, qty in zip(space_types, showers, bathtubs, sinks, qtys)
+    ]
+
+
+def peak_flow(showers, bathtubs, sinks):
+    """Peak flow (L/min) of one usage point."""
+    return (
+        (showers or 0) * FIXTURE_FLOW['shower']
+        + (bathtubs or 0) * FIXTURE_FLOW['bathtub']
+        + (sinks or 0) * FIXTURE_FLOW['sink']
+    )
+
+
+def peak_flows(showers, bathtubs, sinks):
+    shower, bathtub, sink = FIXTURE_FLOW['shower'], FIXTURE_FLOW['bathtub'], FIXTURE_FLOW['sink']
+    return [
+        (s or 0) * shower + (b or 0) * bathtub + (k or 0) * sink
+        for s, b, k in zip(showers, bathtubs, sinks)
+    ]
+
+
+def heater_storage(demand_liters_per_day):
+    """Storage (L) a water heater needs for the given daily demand."""
+    return demand_liters_per_day * HEATER_STORAGE_RATIO
+
+
+def pool_dimensions(length, width, depth):
+    """Pool ``(area m², volume m³)``."""
+    area = (length or 0) * (width or 0)
+    return area, area * (depth or DEFAULT_POOL_DEPTH)
+
+
+def pool_dimensions_batch(lengths, widths, depths):
+    """Batch :func:`pool_dimensions`, as two lists ``(areas, volumes)``."""
+    areas = [(length or 0) * (width or 0) for length, width in zip(lengths, widths)]
+    return areas, [area * (depth or DEFAULT_POOL_DEPTH) for area, depth in zip(areas, depths)]
+
+
+def pool_heating_kw(space_type, volume):
+    """Initial heating load (kW) of a pool or jacuzzi."""
+    if space_type in POOL_SPACE_TYPES and volume:
+        return volume / POOL_M3_PER_KW
+    return 0
+
+
+def pool_heating_kws(space_types, volumes_):
+    return [
+        volume / POOL_M3_PER_KW if space_type in POOL_SPACE_TYPES and volume else 0
+        for space_type, volume in zip(space_types, volumes_)
+    ]
@@ -0,0 +1,103 @@
+"""Bounded LRU memo of the selection results shared by all spaces.
+
+Typical room types (apartments, hotel keys) repeat the same load and
+constraints many times. Results are keyed on the catalog revision, so a
+catalog change makes the old entries unreachable and the LRU drops them.
+
+:class:`VersionedMemo` keeps one result per record instead, replaced when
+the record changes (used for the sweep baselines of the projects).
+"""
+import functools
+import math
+import threading
+from collections import OrderedDict
+
+
+class SelectionMemo:
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, compute):
+        """Value of ``key``, calling ``compute()`` on a miss."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+
+class VersionedMemo:
+    """Bounded LRU holding one value per key with the version it was
+    computed for: a new version replaces the entry, so editing a record
+    never leaves its older results behind."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version, compute):
+        """Value of ``key`` at ``version``, calling ``compute()`` when the
+        stored one is missing or of another version."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] == version:
+                self._data.move_to_end(key)
+                return entry[1]
+        value = compute()
+        with self._lock:
+            self._data[key] = (version, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+selection_memo = SelectionMemo()
+
+
+def memoized(func):
+    """Memoise ``func(catalog, load, *constraints)`` in ``selection_memo``.
+
+    The load is rounded up to 0.01 before both the lookup and the
+    computation, so every load of a bucket gets the same result, and that
+    result still covers each of them.
+    """
+    @functools.wraps(func)
+    def wrapper(catalog, load, *constraints):
+        load = math.ceil(round(load * 100, 6)) / 100
+        key = (func.__qualname__, catalog.revision, load, constraints)
+        return selection_memo.get(key, lambda: func(catalog, load, *constraints))
+    return wrapper
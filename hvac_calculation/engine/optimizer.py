@@ -0,0 +1,102 @@
+"""Cheapest combination of catalog units covering a load.
+
+A :class:`CombinationTable` is a bounded covering-knapsack table built once
+per catalog partition: for every capacity step up to ``max_units`` times the
+largest unit, it keeps the cheapest multiset of at most ``max_units`` units
+(mixed models allowed) reaching that capacity. Answering a space is then a
+lookup and a walk back through at most ``max_units`` choices.
+
+Capacities are rounded down and loads up to the table step, so a returned
+combination always covers the load. Single-model combinations are also
+checked exactly, without rounding, and win ties.
+"""
+import math
+from collections import Counter, namedtuple
+
+INF = float('inf')
+MAX_UNITS = 10  # largest number of units a room may combine; the table grows with it
+
+Combination = namedtuple("Combination", ["cost", "units", "capacity"])
+Combination.__doc__ = """``units`` is a tuple of ``(unit id, qty)``, largest unit first."""
+
+
+class CombinationTable:
+
+    def __init__(self, rows, capacity_field, step, max_units):
+        rows = sorted(
+            (row for row in rows if (row[capacity_field] or 0) > 0),
+            key=lambda row: (-row[capacity_field], row["id"]),
+        )
+        self.step = step
+        self.max_units = max_units
+        self.ids = [row["id"] for row in rows]
+        self.capacities = [row[capacity_field] for row in rows]
+        self.prices = [row["price"] or 0 for row in rows]
+        self._steps = [int(capacity / step + 1e-9) for capacity in self.capacities]
+        self._size = max_units * max(self._steps, default=0)
+        self._costs, self._choices = self._build()
+
+    def _build(self):
+        units = [(cap, price) for cap, price in zip(self._steps, self.prices) if cap]
+        size = self._size
+        prev = [0.0] + [INF] * size
+        costs, choices = [prev], [None]
+        for _k in range(self.max_units):
+            cost = prev[:]
+            choice = [-1] * (size + 1)
+            for c in range(1, size + 1):
+                best, pick = cost[c], -1
+                for u, (cap, price) in enumerate(units):
+                    value = price + prev[c - cap if c > cap else 0]
+                    if value < best:
+                        best, pick = value, u
+                cost[c], choice[c] = best, pick
+            costs.append(cost)
+            choices.append(choice)
+            prev = cost
+        return costs, choices
+
+    def _make(self, counts):
+        units = tuple(sorted(counts.items(), key=lambda item: -self.capacities[item[0]]))
+        return Combination(
+            cost=sum(self.prices[u] * qty for u, qty in units),
+            units=tuple((self.ids[u], qty) for u, qty in units),
+            capacity=sum(self.capacities[u] * qty for u, qty in units),
+        )
+
+    def cheapest_homogeneous(self, load):
+        """Cheapest ``n`` copies of one model covering ``load``, else None."""
+        best = None
+        for u, capacity in enumerate(self.capacities):
+            qty = max(1, math.ceil(load / capacity))
+            if qty > self.max_units:
+                continue
+            key = (self.prices[u] * qty, qty, capacity)
+            if best is None or key < best[0]:
+                best = (key, u, qty)
+        return self._make({best[1]: best[2]}) if best else None
+
+    def cheapest_mixed(self, load):
+        """Cheapest multiset of at most ``max_units`` units covering ``load``
+        at table precision, else None."""
+        c = max(0, math.ceil(load / self.step - 1e-9))
+        k = self.max_units
+        if c > self._size or self._costs[k][c] == INF:
+            return None
+        counts = Counter()
+        while c > 0 and k > 0:
+            u = self._choices[k][c]
+            if u >= 0:
+                counts[u] += 1
+                c -= self._steps[u]
+            k -= 1
+        return self._make(counts) if counts else None
+
+    def cheapest(self, load):
+        """Cheapest combination covering ``load``, single-model ones first on
+        equal cost, else None when ``max_units`` units cannot cover it."""
+        homogeneous = self.cheapest_homogeneous(load)
+        mixed = self.cheapest_mixed(load)
+        if mixed and (not homogeneous or mixed.cost < homogeneous.cost):
+            return mixed
+        return homogeneous
@@ -0,0 +1,100 @@
+"""Chiller and boiler plant staging: ``n`` identical units sharing the load,
+optionally with one standby unit (N+1)."""
+import math
+from bisect import bisect_left
+from collections import namedtuple
+
+PlantOption = namedtuple("PlantOption", [
+    "unit_id",
+    "duty_qty",  # units needed to cover the load
+    "qty",  # units to buy, standby included
+    "capacity",  # duty capacity
+    "cost",
+    "efficiency",
+    "load_ratio",  # share of each duty unit's capacity used at design load
+])
+
+RANKINGS = {
+    'price': lambda option: (option.cost, -option.efficiency, option.qty),
+    # best rated efficiency first, then the least oversized plant
+    'efficiency': lambda option: (-option.efficiency, -option.load_ratio, option.cost),
+}
+
+
+def chiller_cop(row):
+    """COP of a chiller row, derived from its EER (BTU/Wh) when missing."""
+    return row["cop"] or (row["eer"] or 0) / 3.412
+
+
+def boiler_efficiency(row):
+    return (row["efficiency"] or 0) / 100
+
+
+class PlantTable:
+    """Every ``n x model`` plant (``n <= max_units``) sorted by capacity, with
+    the cheapest plant of each capacity suffix precomputed, so the cheapest
+    plant covering a load is one bisection away whatever the catalog size."""
+
+    def __init__(self, rows, capacity_field, efficiency, max_units):
+        self.max_units = max_units
+        self._units = [
+            (row["id"], row[capacity_field], row["price"] or 0, efficiency(row))
+            for row in rows if (row[capacity_field] or 0) > 0
+        ]
+        plants = sorted(
+            (n * capacity, n, u)
+            for u, (_id, capacity, _price, _eff) in enumerate(self._units)
+            for n in range(1, max_units + 1)
+        )
+        self.capacities = [plant[0] for plant in plants]
+        self._plants = plants
+        self._cheapest = {redundancy: self._suffix_min(redundancy) for redundancy in (False, True)}
+
+    def _option(self, load, n, u, redundancy):
+        unit_id, capacity, price, efficiency = self._units[u]
+        qty = n + 1 if redundancy else n
+        return PlantOption(
+            unit_id=unit_id,
+            duty_qty=n,
+            qty=qty,
+            capacity=n * capacity,
+            cost=qty * price,
+            efficiency=efficiency,
+            load_ratio=load / (n * capacity) if load else 0,
+        )
+
+    def _suffix_min(self, redundancy):
+        best, result = None, [None] * len(self._plants)
+        for i in range(len(self._plants) - 1, -1, -1):
+            _capacity, n, u = self._plants[i]
+            price, efficiency = self._units[u][2], self._units[u][3]
+            key = ((n + redundancy) * price, n, -efficiency)
+            if best is None or key < best[0]:
+                best = (key, n, u)
+            result[i] = best
+        return result
+
+    def cheapest(self, load, redundancy=False):
+        """Cheapest plant covering ``load``, else None."""
+        i = bisect_left(self.capacities, load)
+        if i == len(self.capacities):
+            return None
+        _key, n, u = self._cheapest[redundancy][i]
+        return self._option(load, n, u, redundancy)
+
+    def options(self, load, redundancy=False, ranking='price', limit=5):
+        """Best plants covering ``load``, one per model, as ranked by
+        ``ranking`` (see ``RANKINGS``)."""
+        options = []
+        for u, (_id, capacity, _price, _eff) in enumerate(self._units):
+            n = max(1, math.ceil(load / capacity))
+            if n <= self.max_units:
+                options.append(self._option(load, n, u, redundancy))
+        options.sort(key=RANKINGS[ranking])
+        return options[:limit]
+
+    def best(self, load, redundancy=False, ranking='price'):
+        if ranking == 'price':
+            return self.cheapest(load, redundancy)
+        options = self.options(load, redundancy, ranking, limit=1)
+        return options[0] if options else None
@@ -0,0 +1,145 @@
+"""What-if evaluation of a cooling or heating project.
+
+A variant is the project with some inputs overridden for every space (load
+per m², load factor, system type, radiator height) or for the plant
+(redundancy, ranking, unit counts). It is evaluated on plain rows, with the
+same formulas and memoised selections as the stored computes, but with the
+suggested quantities everywhere: a what-if re-sizes the equipment instead
+of keeping the quantities entered by hand. The pipe and duct networks are
+not re-sized; their totals are carried over from the project.
+"""
+from collections import namedtuple
+
+from . import hourly, loads, plant, selection
+
+# overrides applied to every space; the others apply to the project
+SPACE_OVERRIDES = ('watt_per_sqm', 'load_factor_percent', 'system_type', 'preferred_height')
+# space overrides after which the rooms drop their hand-picked unit
+RESELECT_OVERRIDES = ('system_type', 'preferred_height')
+
+VariantResult = namedtuple(
+    'VariantResult', 'load_kw plant_unit_id plant_qty terminal_qty equipment_total grand_total',
+)
+
+
+def _split(project, overrides):
+    """Space overrides, and the project values with its overrides applied."""
+    space_overrides = {key: overrides[key] for key in SPACE_OVERRIDES if key in overrides}
+    project = dict(project, **{key: value for key, value in overrides.items() if key not in SPACE_OVERRIDES})
+    return space_overrides, project
+
+
+def best_plant(catalog, efficiency, load_kw, project):
+    """Plant option of the project settings covering ``load_kw``, else None."""
+    if not load_kw:
+        return None
+    plants = catalog.plants(efficiency, project['plant_max_units'] or 1)
+    return plants.best(load_kw, project['redundancy'], project['plant_ranking'] or 'price')
+
+
+def variant_result(load_kw, option, terminal_qty, equipment_subtotal, project):
+    """Totals of a variant, after the equipment discount and with the networks."""
+    equipment_total = equipment_subtotal * (1 - (project['equipment_discount'] or 0) / 100)
+    return VariantResult(
+        load_kw,
+        option.unit_id if option else False,
+        option.qty if option else 0,
+        terminal_qty,
+        equipment_total,
+        equipment_total + (project['network_total'] or 0),
+    )
+
+
+def heating_variant(spaces, project, overrides, radiators, boilers):
+    """Evaluate a heating variant.
+
+    ``spaces`` are rows of ``hvac.heating.space`` (see the engine inputs of
+    ``hvac.scenario``), ``project`` the project values: ``max_units_per_space``,
+    ``plant_max_units``, ``redundancy``, ``plant_ranking``,
+    ``equipment_discount`` and ``network_total`` (piping after discount),
+    and the space model settings: ``combination_step`` (W) of the radiator
+    combinations, ``ufh_watt_per_sqm`` set when a room is switched to UFH,
+    and the ``ufh_price_per_sqm`` and ``thermostat_price`` defaults.
+    ``overrides`` only holds the values to override.
+    """
+    space_overrides, project = _split(project, overrides)
+    reselect = any(key in space_overrides for key in RESELECT_OVERRIDES)
+    max_units = project['max_units_per_space'] or 1
+    total_load = terminal_cost = 0.0
+    terminal_qty = 0
+    for space in spaces:
+        if space_overrides:
+            if 'system_type' in space_overrides and 'watt_per_sqm' not in space_overrides:
+                # as the system type onchange of the space
+                space = dict(space, watt_per_sqm=(
+                    project['ufh_watt_per_sqm'] if space_overrides['system_type'] == 'ufh' else loads.HEATING_WATT_PER_SQM
+                ))
+            space = dict(space, **space_overrides)
+        load = loads.heat_load(space['area'], space['watt_per_sqm'], space['load_factor_percent'], space['qty'])
+        total_load += load
+        if space['system_type'] == 'radiator':
+            radiator_id = not reselect and space['selected_radiator_id']
+            if radiator_id not in radiators.by_id:
+                radiator_id = False  # none, or archived since it was picked
+            if not radiator_id and load:
+                radiator_id = selection.optimal_radiator(
+                    radiators, load, space['is_bathroom'], int(space['preferred_height'] or 680),
+                    project['combination_step'], max_units,
+                )
+            if radiator_id:
+                qty = loads.units_needed(load, radiators.capacity(radiator_id))
+                terminal_cost += (radiators.by_id[radiator_id]['price'] or 0) * qty
+                terminal_qty += qty
+        elif space['system_type'] == 'ufh':
+            terminal_cost += (space['area'] or 0) * (space['ufh_price_per_sqm'] or project['ufh_price_per_sqm'])
+            terminal_cost += (space['thermostat_price'] or project['thermostat_price']) * (space['qty'] or 1)
+    load_kw = total_load / 1000
+    option = best_plant(boilers, plant.boiler_efficiency, load_kw, project)
+    return variant_result(load_kw, option, terminal_qty, (option.cost if option else 0) + terminal_cost, project)
+
+
+def cooling_variant(spaces, project, overrides, fcus, chillers):
+    """Evaluate a cooling variant.
+
+    As :func:`heating_variant`, the project values also holding
+    ``load_method``, ``design_temp``, ``daily_range``, ``indoor_temp`` and
+    ``ahu_total``, ``network_total`` being the ductwork after discount, and
+    ``combination_step`` in kW. With the hourly method, the plant is sized
+    on the block load.
+    """
+    space_overrides, project = _split(project, overrides)
+    reselect = any(key in space_overrides for key in RESELECT_OVERRIDES)
+    max_units = project['max_units_per_space'] or 1
+    is_hourly = project['load_method'] == 'hourly'
+    outdoor = hourly.outdoor_temperatures(project['design_temp'], project['daily_range']) if is_hourly else None
+    total_load = terminal_cost = 0.0
+    terminal_qty = 0
+    profiles = []
+    for space in spaces:
+        if space_overrides:
+            space = dict(space, **space_overrides)
+        if is_hourly:
+            profile = hourly.room_profile(space, outdoor, project['indoor_temp'])
+            profiles.append(profile)
+            load = max(profile)
+        else:
+            load = loads.room_load(
+                space['area'], space['watt_per_sqm'], space['load_factor_percent'], space['qty'],
+                loads.COOLING_WATT_PER_SQM,
+            )
+        total_load += load
+        if space['system_type'] == 'fcu':
+            fcu_id = not reselect and space['selected_fcu_id']
+            if fcu_id not in fcus.by_id:
+                fcu_id = False  # none, or archived since it was picked
+            if not fcu_id and load:
+                fcu_id = selection.optimal_fcu(fcus, load / 1000, project['combination_step'], max_units)
+            if fcu_id:
+                qty = loads.units_needed(load, fcus.capacity(fcu_id) * 1000)
+                terminal_cost += (fcus.by_id[fcu_id]['price'] or 0) * qty
+                terminal_qty += qty
+            terminal_cost += (space['thermostat_price'] or project['thermostat_price']) * (space['qty'] or 1)
+    load_kw = (hourly.block_load(profiles)[0] if is_hourly else total_load) / 1000
+    option = best_plant(chillers, plant.chiller_cop, load_kw, project)
+    equipment_subtotal = (option.cost if option else 0) + (project['ahu_total'] or 0) + terminal_cost
+    return variant_result(load_kw, option, terminal_qty, equipment_subtotal, project)
@@ -0,0 +1,166 @@
+"""Equipment selection over plain catalog rows (dicts with an ``id``)."""
+import itertools
+from bisect import bisect_left
+
+from .memo import memoized
+from .optimizer import CombinationTable
+from .plant import PlantTable
+
+
+class CapacityIndex:
+    """Catalog units sorted by capacity, answering "smallest unit >= load"."""
+
+    __slots__ = ("capacities", "ids")
+
+    def __init__(self, rows, capacity_field):
+        rows = sorted(rows, key=lambda row: (row[capacity_field] or 0, row["id"]))
+        self.capacities = [row[capacity_field] or 0 for row in rows]
+        self.ids = [row["id"] for row in rows]
+
+    def __bool__(self):
+        return bool(self.ids)
+
+    def smallest_covering(self, load):
+        """Id of the smallest unit whose capacity covers ``load``, else False."""
+        i = bisect_left(self.capacities, load)
+        return self.ids[i] if i < len(self.ids) else False
+
+    def smallest_covering_batch(self, loads):
+        capacities, ids, size = self.capacities, self.ids, len(self.ids)
+        result = []
+        for load in loads:
+            i = bisect_left(capacities, load)
+            result.append(ids[i] if i < size else False)
+        return result
+
+    def largest(self):
+        return self.ids[-1] if self.ids else False
+
+    def largest_capacity(self):
+        return self.capacities[-1] if self.capacities else 0
+
+
+_revisions = itertools.count(1)
+
+
+class EquipmentCatalog:
+    """Active rows of one equipment model, with capacity indexes per partition.
+
+    Each catalog gets a process-wide unique ``revision``, used to key the
+    memoised selection results.
+    """
+
+    def __init__(self, rows, capacity_field):
+        self.revision = next(_revisions)
+        self.rows = rows
+        self.capacity_field = capacity_field
+        self.by_id = {row["id"]: row for row in rows}
+        self._indexes = {}
+        self._tables = {}
+        self._plants = {}
+
+    def index(self, **criteria):
+        """Capacity index of the rows matching ``criteria`` (field=value)."""
+        key = tuple(sorted(criteria.items()))
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = CapacityIndex(self._filter(key), self.capacity_field)
+        return index
+
+    def _filter(self, key):
+        return [row for row in self.rows if all(row[fname] == value for fname, value in key)]
+
+    def combinations(self, step, max_units, **criteria):
+        """Cheapest-combination table of the rows matching ``criteria``,
+        built once and shared by every space using this catalog."""
+        key = (step, max_units, tuple(sorted(criteria.items())))
+        table = self._tables.get(key)
+        if table is None:
+            table = self._tables[key] = CombinationTable(self._filter(key[2]), self.capacity_field, step, max_units)
+        return table
+
+    def plants(self, efficiency, max_units):
+        """Plant staging table of the whole catalog, ``efficiency`` being a
+        function of a row."""
+        key = (efficiency, max_units)
+        table = self._plants.get(key)
+        if table is None:
+            table = self._plants[key] = PlantTable(self.rows, self.capacity_field, efficiency, max_units)
+        return table
+
+    def smallest_covering(self, load, **criteria):
+        return self.index(**criteria).smallest_covering(load)
+
+    def largest(self, **criteria):
+        return self.index(**criteria).largest()
+
+    def capacity(self, unit_id):
+        return self.by_id[unit_id][self.capacity_field] if unit_id else 0
+
+    def describe(self, combination):
+        """``"2 x name + 1 x name"`` label of a :class:`Combination`."""
+        return " + ".join(f"{qty} x {self.by_id[unit_id]['name']}" for unit_id, qty in combination.units)
+
+
+def select_radiator(radiators, heat_load, radiator_type, height=None):
+    """Smallest radiator of the given type (and height) covering the load,
+    else the largest one of that type and height."""
+    criteria = {'radiator_type': radiator_type}
+    if height is not None:
+        criteria['height'] = height
+    index = radiators.index(**criteria)
+    if index and heat_load <= index.largest_capacity():
+        return index.smallest_covering(heat_load)
+    return index.largest()
+
+
+def suggest_radiator(radiators, heat_load, is_bathroom, preferred_height):
+    """Radiator suggested for a space: a towel radiator in bathrooms, else an
+    aluminum one of the preferred height, else the largest aluminum one."""
+    if is_bathroom:
+        return select_radiator(radiators, heat_load, 'towel')
+    return (
+        select_radiator(radiators, heat_load, 'aluminum', preferred_height)
+        or radiators.largest(radiator_type='aluminum')
+    )
+
+
+def radiator_criteria(is_bathroom, preferred_height):
+    """Radiators allowed in a space: towel radiators in bathrooms, else
+    aluminum ones of the preferred height."""
+    if is_bathroom:
+        return {'radiator_type': 'towel'}
+    return {'radiator_type': 'aluminum', 'height': preferred_height}
+
+
+# Memoised selections: (catalog, load, *constraints)
+@memoized
+def optimal_fcu(fcus, load_kw, step, max_units):
+    """FCU model whose copies cover the load at the lowest price, else the
+    smallest FCU that covers it, else the largest one."""
+    best = fcus.combinations(step, max_units).cheapest_homogeneous(load_kw)
+    if best:
+        return best.units[0][0]
+    return fcus.smallest_covering(load_kw) or fcus.largest()
+
+
+@memoized
+def cheapest_fcus(fcus, load_kw, step, max_units):
+    return fcus.combinations(step, max_units).cheapest(load_kw)
+
+
+@memoized
+def optimal_radiator(radiators, heat_load, is_bathroom, preferred_height, step, max_units):
+    """Radiator model whose copies cover the load at the lowest price, else
+    the single-unit suggestion."""
+    table = radiators.combinations(step, max_units, **radiator_criteria(is_bathroom, preferred_height))
+    best = table.cheapest_homogeneous(heat_load)
+    if best:
+        return best.units[0][0]
+    return suggest_radiator(radiators, heat_load, is_bathroom, preferred_height)
+
+
+@memoized
+def cheapest_radiators(radiators, heat_load, is_bathroom, preferred_height, step, max_units):
+    table = radiators.combinations(step, max_units, **radiator_criteria(is_bathroom, preferred_height))
+    return table.cheapest(heat_load)
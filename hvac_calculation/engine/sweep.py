@@ -0,0 +1,178 @@
+"""Sensitivity sweeps of a project over one input of every space.
+
+The load of a space is linear in its load factor and in its load per m²
+(with the hourly method, in its load factor only), so a project is reduced
+once to a :class:`Baseline`: the plant load, and the load of every group of
+rooms with the same terminal unit and load, as ``constant + slope * value``.
+Each point of a sweep is then one multiplication per group and one plant
+lookup, and the plant breakpoints are found by bisection between points.
+
+The rooms keep their terminal model, re-counted for the load of each
+point; :mod:`.scenario` re-selects them. Radiator heights are discrete and
+leave the loads unchanged, so a height sweep evaluates one
+:func:`.scenario.heating_variant` per height.
+"""
+from collections import Counter, namedtuple
+
+from . import hourly, loads, plant, scenario
+
+LINEAR_PARAMETERS = ('load_factor_percent', 'watt_per_sqm')
+RADIATOR_HEIGHTS = (580, 680, 880)
+MAX_POINTS = 1000
+BREAKPOINT_ITERATIONS = 30  # bisection steps: the range over 2**30
+
+# constant and slope of the plant load (W); terminals maps
+# (constant, slope, unit capacity W, unit price) to the number of rooms
+Baseline = namedtuple('Baseline', 'load_constant load_slope terminals fixed_cost')
+SweepPoint = namedtuple('SweepPoint', ('value',) + scenario.VariantResult._fields)
+Breakpoint = namedtuple('Breakpoint', 'value from_unit_id to_unit_id')
+
+
+def sweep_values(start, stop, points):
+    """``points`` values evenly spread from ``start`` to ``stop``."""
+    if points < 2:
+        return [start]
+    step = (stop - start) / (points - 1)
+    return [start + step * i for i in range(points)]
+
+
+def _space_load(space, parameter, default_watt_per_sqm):
+    """``(constant, slope)`` of the load per m² of a space."""
+    if parameter == 'load_factor_percent':
+        return 0.0, loads.room_load(space['area'], space['watt_per_sqm'], 1, space['qty'], default_watt_per_sqm)
+    if parameter == 'watt_per_sqm':
+        return 0.0, loads.room_load(space['area'], 1, space['load_factor_percent'], space['qty'], default_watt_per_sqm)
+    return loads.room_load(
+        space['area'], space['watt_per_sqm'], space['load_factor_percent'], space['qty'], default_watt_per_sqm,
+    ), 0.0
+
+
+def cooling_baseline(spaces, project, parameter, fcus):
+    """Baseline of a cooling project; ``spaces`` are the rows of
+    :func:`.scenario.cooling_variant` with their ``fcu_id``."""
+    is_hourly = project['load_method'] == 'hourly'
+    if is_hourly:
+        outdoor = hourly.outdoor_temperatures(project['design_temp'], project['daily_range'])
+    constant_profiles, slope_profiles = [], []
+    load_slope = 0.0
+    terminals = Counter()
+    fixed_cost = 0.0
+    for space in spaces:
+        if not is_hourly:
+            constant, slope = _space_load(space, parameter, loads.COOLING_WATT_PER_SQM)
+            load_slope += slope
+        elif parameter == 'load_factor_percent':
+            profile = hourly.room_profile(dict(space, load_factor_percent=1), outdoor, project['indoor_temp'])
+            slope_profiles.append(profile)
+            constant, slope = 0.0, max(profile)
+        else:
+            # the hourly loads do not depend on the load per m²
+            profile = hourly.room_profile(space, outdoor, project['indoor_temp'])
+            constant_profiles.append(profile)
+            constant, slope = max(profile), 0.0
+        if space['system_type'] != 'fcu':
+            continue
+        fcu = fcus.by_id.get(space['fcu_id'])
+        if fcu:
+            terminals[constant, slope, (fcu['cooling_capacity_kw'] or 0) * 1000, fcu['price'] or 0] += 1
+        fixed_cost += (space['thermostat_price'] or project['thermostat_price']) * (space['qty'] or 1)
+    if is_hourly:
+        # the block profile is linear as well: one of the two is empty
+        return Baseline(
+            hourly.block_load(constant_profiles)[0], hourly.block_load(slope_profiles)[0], terminals, fixed_cost,
+        )
+    return Baseline(0.0, load_slope, terminals, fixed_cost)
+
+
+def heating_baseline(spaces, project, parameter, radiators):
+    """Baseline of a heating project; ``spaces`` are the rows of
+    :func:`.scenario.heating_variant` with their ``radiator_id``."""
+    load_constant = load_slope = 0.0
+    terminals = Counter()
+    fixed_cost = 0.0
+    for space in spaces:
+        constant, slope = _space_load(space, parameter, loads.HEATING_WATT_PER_SQM)
+        load_constant += constant
+        load_slope += slope
+        if space['system_type'] == 'radiator':
+            radiator = radiators.by_id.get(space['radiator_id'])
+            if radiator:
+                terminals[constant, slope, radiator['watt_output'] or 0, radiator['price'] or 0] += 1
+        elif space['system_type'] == 'ufh':
+            fixed_cost += (space['area'] or 0) * (space['ufh_price_per_sqm'] or project['ufh_price_per_sqm'])
+            fixed_cost += (space['thermostat_price'] or project['thermostat_price']) * (space['qty'] or 1)
+    return Baseline(load_constant, load_slope, terminals, fixed_cost)
+
+
+def sweep(baseline, values, project, plants, efficiency):
+    """Points of a linear sweep over ``values``, and the plant breakpoints.
+
+    ``project`` holds the values of :func:`.scenario.heating_variant`
+    (plus ``ahu_total`` for cooling), ``plants`` is the boiler or chiller
+    catalog and ``efficiency`` its efficiency function.
+    """
+    terminals = list(baseline.terminals.items())
+    equipment_fixed = baseline.fixed_cost + (project.get('ahu_total') or 0)
+
+    def plant_at(value):
+        load_kw = (baseline.load_constant + baseline.load_slope * value) / 1000
+        return load_kw, scenario.best_plant(plants, efficiency, load_kw, project)
+
+    points = []
+    for value in values:
+        load_kw, option = plant_at(value)
+        terminal_qty = 0
+        terminal_cost = 0.0
+        for (constant, slope, capacity, price), count in terminals:
+            qty = loads.units_needed(constant + slope * value, capacity) * count
+            terminal_qty += qty
+            terminal_cost += price * qty
+        equipment_subtotal = (option.cost if option else 0) + equipment_fixed + terminal_cost
+        points.append(SweepPoint(
+            value, *scenario.variant_result(load_kw, option, terminal_qty, equipment_subtotal, project),
+        ))
+
+    def unit_at(value):
+        option = plant_at(value)[1]
+        return option.unit_id if option else False
+
+    return points, breakpoints(points, unit_at)
+
+
+def height_sweep(spaces, project, heights, radiators, boilers):
+    """Points of a radiator height sweep of a heating project, and the
+    plant breakpoints (none: the loads do not change)."""
+    points = [
+        SweepPoint(height, *scenario.heating_variant(
+            spaces, project, {'preferred_height': str(height)}, radiators, boilers,
+        ))
+        for height in heights
+    ]
+    return points, breakpoints(points)
+
+
+def breakpoints(points, unit_at=None):
+    """Values where the plant unit changes between two points. With
+    ``unit_at``, the plant unit at any value, they are refined by
+    bisection, to the first value selecting the new unit."""
+    result = []
+    for low, high in zip(points, points[1:]):
+        if low.plant_unit_id == high.plant_unit_id:
+            continue
+        low_value, high_value = low.value, high.value
+        if unit_at:
+            for _i in range(BREAKPOINT_ITERATIONS):
+                middle = (low_value + high_value) / 2
+                if unit_at(middle) == low.plant_unit_id:
+                    low_value = middle
+                else:
+                    high_value = middle
+        result.append(Breakpoint(high_value, low.plant_unit_id, high.plant_unit_id))
+    return result
+
+
+# discipline: (baseline, plant efficiency)
+BASELINES = {
+    'cooling': (cooling_baseline, plant.chiller_cop),
+    'heating': (heating_baseline, plant.boiler_efficiency),
+}
@@ -1,11 +1,21 @@
 # Shared Models
+from . import hvac_perf_stat
 from . import hvac_terms
+from . import hvac_capacity_index
+from . import hvac_floor_summary_mixin
+from . import hvac_network_segment_mixin
+from . import hvac_project_mixin
+from . import hvac_report_job
+from . import hvac_space_mixin
+from . import hvac_takeoff_line_mixin
+from . import ir_actions_report
 
 # Heating Models
 from .heating import hvac_boiler
 from .heating import hvac_radiator
 from .heating import hvac_heating_piping
 from .heating import hvac_heating_space
+from .heating import hvac_heating_floor_summary
 from .heating import hvac_heating_project
 
 # Cooling Models
@@ -14,6 +24,7 @@ from .cooling import hvac_ahu
 from .cooling import hvac_fcu
 from .cooling import hvac_ductwork
 from .cooling import hvac_cooling_space
+from .cooling import hvac_cooling_floor_summary
 from .cooling import hvac_cooling_project
 
 # Hot Water Models
@@ -21,3 +32,12 @@ from .hotwater import hvac_water_heater
 from .hotwater import hvac_pool_heater
 from .hotwater import hvac_hotwater_space
 from .hotwater import hvac_hotwater_project
+
+# Buildings
+from .building import hvac_building
+
+# What-If Scenarios
+from . import hvac_scenario
+
+# Reporting (materialized views over the tables above, must come last)
+from . import hvac_portfolio_report
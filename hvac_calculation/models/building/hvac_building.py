@@ -0,0 +1,247 @@
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+from ..hvac_perf_stat import instrument_methods
+
+FLOORS = [
+    ('basement', 'Basement'),
+    ('ground', 'Ground Floor'),
+    ('first', 'First Floor'),
+    ('second', 'Second Floor'),
+    ('third', 'Third Floor'),
+    ('fourth', 'Fourth Floor'),
+    ('roof', 'Roof Floor'),
+    ('annex', 'Annex'),
+]
+
+
+@instrument_methods
+class HVACBuilding(models.Model):
+    """One building, its rooms entered once, and the discipline projects
+    calculated from them."""
+    _name = "hvac.building"
+    _description = "HVAC Building"
+    _order = "date desc, id desc"
+
+    # discipline: (project field, project model, section title of the combined quotation)
+    _projects = {
+        'cooling': ('cooling_project_id', 'hvac.cooling.project', "Central Air Conditioning"),
+        'heating': ('heating_project_id', 'hvac.heating.project', "Central Heating"),
+        'hotwater': ('hotwater_project_id', 'hvac.hotwater.project', "Hot Water & Pool Heating"),
+    }
+
+    name = fields.Char(string="Building", required=True)
+    customer_id = fields.Many2one("res.partner", string="Customer")
+    attention_to = fields.Char(string="Attention To")
+    date = fields.Date(string="Date", default=fields.Date.context_today)
+    company_id = fields.Many2one('res.company', string='Company', required=True, default=lambda self: self.env.company)
+    currency_id = fields.Many2one('res.currency', string='Currency', related='company_id.currency_id', readonly=True)
+
+    room_ids = fields.One2many("hvac.building.room", "building_id", string="Rooms", copy=True)
+    room_count = fields.Integer(string="Rooms", compute="_compute_room_count")
+
+    with_cooling = fields.Boolean(string="Air Conditioning", default=True)
+    with_heating = fields.Boolean(string="Central Heating", default=True)
+    with_hotwater = fields.Boolean(string="Hot Water", default=True)
+    cooling_project_id = fields.Many2one("hvac.cooling.project", string="Cooling Project", readonly=True, copy=False)
+    heating_project_id = fields.Many2one("hvac.heating.project", string="Heating Project", readonly=True, copy=False)
+    hotwater_project_id = fields.Many2one("hvac.hotwater.project", string="Hot Water Project", readonly=True, copy=False)
+
+    total_cooling_load_kw = fields.Float(related="cooling_project_id.total_cooling_load_kw")
+    total_heat_load_kw = fields.Float(related="heating_project_id.total_heat_load_kw")
+    total_demand_liters = fields.Float(related="hotwater_project_id.total_demand_liters")
+    grand_total = fields.Float(string="Grand Total", compute="_compute_grand_total")
+
+    sale_order_id = fields.Many2one("sale.order", string="Quotation", readonly=True, copy=False)
+    notes = fields.Text(string="Notes")
+
+    @api.depends("room_ids")
+    def _compute_room_count(self):
+        for rec in self:
+            rec.room_count = len(rec.room_ids)
+
+    @api.depends("cooling_project_id.grand_total", "heating_project_id.grand_total", "hotwater_project_id.grand_total")
+    def _compute_grand_total(self):
+        for rec in self:
+            rec.grand_total = sum(rec[fname].grand_total for fname, _model, _title in self._projects.values())
+
+    def _get_projects(self):
+        """The discipline projects of ``self`` as ``[(discipline, project)]``."""
+        self.ensure_one()
+        return [
+            (discipline, self[fname])
+            for discipline, (fname, _model, _title) in self._projects.items()
+            if self[fname]
+        ]
+
+    # Actions
+    def action_generate_projects(self):
+        """Create the missing discipline projects and their spaces."""
+        for building in self:
+            vals = {}
+            for discipline, (fname, model_name, title) in self._projects.items():
+                if building[f"with_{discipline}"] and not building[fname]:
+                    vals[fname] = self.env[model_name].create({
+                        'name': f"{building.name} - {title}",
+                        'customer_id': building.customer_id.id,
+                        'attention_to': building.attention_to,
+                        'date': building.date,
+                        'company_id': building.company_id.id,
+                    }).id
+            if vals:
+                building.write(vals)
+        self.room_ids._sync_spaces()
+
+    def action_create_quotation(self):
+        """One quotation for the whole building, a section per discipline."""
+        self.ensure_one()
+        if not self.customer_id:
+            raise UserError("Please select a customer first.")
+        if not self._get_projects():
+            raise UserError("Please generate the discipline projects first.")
+        # as the mass quotation of the projects: confirmed ones, not quoted yet
+        projects = [
+            (discipline, project) for discipline, project in self._get_projects()
+            if project._filter_quotable()
+        ]
+        if not projects:
+            raise UserError("No discipline project is confirmed and waiting for a quotation.")
+
+        order_lines = []
+        for discipline, project in projects:
+            lines = project._prepare_quotation_lines()[project.id]
+            if lines:
+                order_lines.append((0, 0, {'display_type': 'line_section', 'name': self._projects[discipline][2]}))
+                order_lines += lines
+        sale_order = self.env['sale.order'].create({
+            'partner_id': self.customer_id.id,
+            'origin': self.name,
+            'order_line': order_lines,
+        })
+        self.sale_order_id = sale_order
+        for _discipline, project in projects:
+            project.write({'sale_order_id': sale_order.id, 'state': 'quoted'})
+
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': 'sale.order',
+            'res_id': sale_order.id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
+
+
+@instrument_methods
+class HVACBuildingRoom(models.Model):
+    """A room of a building, stored once. Its discipline spaces (cooling,
+    heating, hot water) are created when the room takes part in the
+    discipline, and follow its edits."""
+    _name = "hvac.building.room"
+    _description = "Building Room"
+    _order = "floor_sequence, sequence, id"
+
+    # discipline: (building project field, room flag, space model, {room field: space field})
+    _disciplines = {
+        'cooling': ('cooling_project_id', 'is_cooled', 'hvac.cooling.space', {
+            'sequence': 'sequence', 'floor': 'floor', 'room_name': 'room_name',
+            'area': 'area', 'height': 'height', 'qty': 'qty',
+        }),
+        'heating': ('heating_project_id', 'is_heated', 'hvac.heating.space', {
+            'sequence': 'sequence', 'floor': 'floor', 'room_name': 'room_name',
+            'area': 'area', 'qty': 'qty', 'is_bathroom': 'is_bathroom',
+        }),
+        'hotwater': ('hotwater_project_id', 'has_hotwater', 'hvac.hotwater.space', {
+            'sequence': 'sequence', 'room_name': 'name', 'qty': 'qty',
+            'shower_count': 'shower_count', 'bathtub_count': 'bathtub_count', 'sink_count': 'sink_count',
+        }),
+    }
+
+    sequence = fields.Integer(string="Sequence", default=10)
+    building_id = fields.Many2one("hvac.building", string="Building", required=True, index=True, ondelete="cascade")
+
+    floor = fields.Selection(FLOORS, string="Floor", default='ground')
+    floor_sequence = fields.Integer(string="Floor Sequence", compute="_compute_floor_sequence", store=True)
+    room_name = fields.Char(string="Room Name")
+    area = fields.Float(string="Area (m²)")
+    height = fields.Float(string="Height (m)", default=3.0)
+    qty = fields.Integer(string="Room Qty", default=1)
+    is_bathroom = fields.Boolean(string="Bathroom")
+
+    is_cooled = fields.Boolean(string="Cooled", default=True)
+    is_heated = fields.Boolean(string="Heated", default=True)
+    has_hotwater = fields.Boolean(string="Hot Water", compute="_compute_has_hotwater", store=True, readonly=False)
+    shower_count = fields.Integer(string="Showers", default=0)
+    bathtub_count = fields.Integer(string="Bathtubs", default=0)
+    sink_count = fields.Integer(string="Sinks", default=0)
+
+    cooling_space_ids = fields.One2many("hvac.cooling.space", "building_room_id", string="Cooling Spaces")
+    heating_space_ids = fields.One2many("hvac.heating.space", "building_room_id", string="Heating Spaces")
+    hotwater_space_ids = fields.One2many("hvac.hotwater.space", "building_room_id", string="Hot Water Spaces")
+    cooling_load_watt = fields.Float(string="Cooling Load (W)", compute="_compute_loads")
+    heat_load = fields.Float(string="Heat Load (W)", compute="_compute_loads")
+    demand_liters_per_day = fields.Float(string="Demand (L/day)", compute="_compute_loads")
+
+    notes = fields.Text(string="Notes")
+
+    @api.depends("floor")
+    def _compute_floor_sequence(self):
+        floor_order = {key: index for index, (key, _label) in enumerate(FLOORS, 1)}
+        for rec in self:
+            rec.floor_sequence = floor_order.get(rec.floor, 99)
+
+    @api.depends("shower_count", "bathtub_count", "sink_count")
+    def _compute_has_hotwater(self):
+        for rec in self:
+            rec.has_hotwater = bool(rec.shower_count or rec.bathtub_count or rec.sink_count)
+
+    @api.depends("cooling_space_ids.cooling_load_watt", "heating_space_ids.heat_load", "hotwater_space_ids.demand_liters_per_day")
+    def _compute_loads(self):
+        for rec in self:
+            rec.cooling_load_watt = sum(rec.cooling_space_ids.mapped("cooling_load_watt"))
+            rec.heat_load = sum(rec.heating_space_ids.mapped("heat_load"))
+            rec.demand_liters_per_day = sum(rec.hotwater_space_ids.mapped("demand_liters_per_day"))
+
+    def _sync_spaces(self, vals=None):
+        """Bring the discipline spaces of ``self`` in line with the rooms:
+        create the missing ones, drop those of rooms left out of the
+        discipline, and apply ``vals`` (a room write) to the others. Each
+        step is one batched call per discipline, so the three calculations
+        are recomputed together at the next flush."""
+        for fname, flag, space_model_name, field_map in self._disciplines.values():
+            space_model = self.env[space_model_name]
+            spaces = space_model.search([('building_room_id', 'in', self.ids)])
+            wanted = self.filtered(lambda room: room[flag] and room.building_id[fname])
+            stale = spaces.filtered(lambda space: space.building_room_id not in wanted)
+            if stale:
+                stale.unlink()
+            spaces -= stale
+            missing = wanted - spaces.building_room_id
+            if missing:
+                space_model.create([{
+                    'project_id': room.building_id[fname].id,
+                    'building_room_id': room.id,
+                    **{space_fname: room[room_fname] for room_fname, space_fname in field_map.items()},
+                } for room in missing])
+            space_vals = {
+                space_fname: vals[room_fname]
+                for room_fname, space_fname in field_map.items() if room_fname in (vals or {})
+            }
+            if spaces and space_vals:
+                spaces.write(space_vals)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        rooms = super().create(vals_list)
+        rooms._sync_spaces()
+        return rooms
+
+    def write(self, vals):
+        res = super().write(vals)
+        if set(vals) - {'notes'}:
+            self._sync_spaces(vals)
+        return res
+
+    def unlink(self):
+        # through the ORM, so that the project totals follow
+        for _fname, _flag, space_model_name, _field_map in self._disciplines.values():
+            self.env[space_model_name].search([('building_room_id', 'in', self.ids)]).unlink()
+        return super().unlink()
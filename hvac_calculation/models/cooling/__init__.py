@@ -3,4 +3,5 @@ from . import hvac_ahu
 from . import hvac_fcu
 from . import hvac_ductwork
 from . import hvac_cooling_space
+from . import hvac_cooling_floor_summary
 from . import hvac_cooling_project
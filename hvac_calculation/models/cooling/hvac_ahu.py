@@ -1,6 +1,8 @@
 from odoo import models, fields, api
+from ..hvac_perf_stat import instrument_methods
 
 
+@instrument_methods
 class HVACAHU(models.Model):
     _name = "hvac.ahu"
     _description = "HVAC Air Handling Unit"
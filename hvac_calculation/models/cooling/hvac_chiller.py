@@ -1,8 +1,12 @@
 from odoo import models, fields, api
+from ...engine import loads
+from ..hvac_perf_stat import instrument_methods
 
 
+@instrument_methods
 class HVACChiller(models.Model):
     _name = "hvac.chiller"
+    _inherit = ["hvac.catalog.mixin"]
     _description = "HVAC Chiller"
     _order = "cooling_capacity_kw asc"
 
@@ -47,7 +51,7 @@ class HVACChiller(models.Model):
     @api.depends("cooling_capacity_kw")
     def _compute_capacity_btu(self):
         for rec in self:
-            rec.cooling_capacity_btu = rec.cooling_capacity_kw * 3412 if rec.cooling_capacity_kw else 0
+            rec.cooling_capacity_btu = loads.kw_to_btu(rec.cooling_capacity_kw)
 
     def name_get(self):
         result = []
@@ -0,0 +1,28 @@
+from odoo import models, fields, api
+
+
+class HVACCoolingFloorSummary(models.Model):
+    _name = "hvac.cooling.floor.summary"
+    _inherit = ["hvac.floor.summary.mixin"]
+    _description = "Cooling Floor Summary"
+
+    _space_model = "hvac.cooling.space"
+    _summary_sums = {
+        'room_count': 'qty',
+        'area': 'area',
+        'cooling_load_watt': 'cooling_load_watt',
+        'cooling_load_btu': 'cooling_load_btu',
+        'cooling_load_ton': 'cooling_load_ton',
+        'equipment_cost': 'space_subtotal',
+    }
+
+    project_id = fields.Many2one("hvac.cooling.project", string="Project", required=True, index=True, ondelete="cascade")
+    cooling_load_watt = fields.Float(string="Cooling Load (W)", readonly=True)
+    cooling_load_kw = fields.Float(string="Cooling Load (kW)", compute="_compute_cooling_load_kw", store=True)
+    cooling_load_btu = fields.Float(string="Cooling Load (BTU/hr)", readonly=True)
+    cooling_load_ton = fields.Float(string="Cooling Load (TR)", readonly=True)
+
+    @api.depends("cooling_load_watt")
+    def _compute_cooling_load_kw(self):
+        for rec in self:
+            rec.cooling_load_kw = rec.cooling_load_watt / 1000
@@ -1,12 +1,31 @@
+from collections import defaultdict
+
 from odoo import models, fields, api
-from odoo.exceptions import UserError
+from odoo.exceptions import UserError, ValidationError
+from ...engine import duct, hourly, loads, optimizer, plant
+from ..hvac_perf_stat import instrument_methods
 
 
+@instrument_methods
 class HVACCoolingProject(models.Model):
     _name = "hvac.cooling.project"
+    _inherit = ["hvac.project.mixin"]
     _description = "Central Air Conditioning Project"
     _order = "date desc, id desc"
 
+    _offer_report = "hvac_calculation.action_report_cooling_project"
+    _report_child_fields = ('space_ids', 'duct_line_ids')
+    _line_totals = {'ductwork_total': 'duct_line_ids'}
+    # project fields the room loads depend on
+    _design_parameters = ('load_method', 'design_temp', 'daily_range', 'indoor_temp')
+    # project fields the room equipment selection depends on
+    _selection_parameters = ('max_units_per_space',)
+    # project fields the whole duct network is re-sized on
+    _ductwork_parameters = (
+        'duct_material_id', 'duct_sizing_method', 'duct_friction_rate', 'duct_max_velocity', 'duct_height',
+        'insulation_price', 'diffuser_type',
+    )
+
     name = fields.Char(string="Project Name", required=True)
     customer_id = fields.Many2one("res.partner", string="Customer")
     attention_to = fields.Char(string="Attention To")
@@ -19,19 +38,57 @@ class HVACCoolingProject(models.Model):
 
     # Spaces
     space_ids = fields.One2many("hvac.cooling.space", "project_id", string="Spaces")
+    floor_summary_ids = fields.One2many("hvac.cooling.floor.summary", "project_id", string="Floors", readonly=True)
 
-    # Cooling Load Totals
-    total_cooling_load_watt = fields.Float(string="Total Cooling Load (W)", compute="_compute_totals", store=True)
+    # Cooling Load Totals (maintained incrementally by the spaces, see hvac.space.mixin)
+    total_cooling_load_watt = fields.Float(string="Total Cooling Load (W)", readonly=True, copy=False)
     total_cooling_load_kw = fields.Float(string="Total Cooling Load (kW)", compute="_compute_totals", store=True)
-    total_cooling_load_btu = fields.Float(string="Total Cooling Load (BTU/hr)", compute="_compute_totals", store=True)
-    total_cooling_load_ton = fields.Float(string="Total Cooling Load (TR)", compute="_compute_totals", store=True)
-    total_cooling_area = fields.Float(string="Total Cooling Area (m²)", compute="_compute_totals", store=True)
+    total_cooling_load_btu = fields.Float(string="Total Cooling Load (BTU/hr)", readonly=True, copy=False)
+    total_cooling_load_ton = fields.Float(string="Total Cooling Load (TR)", readonly=True, copy=False)
+    total_cooling_area = fields.Float(string="Total Cooling Area (m²)", readonly=True, copy=False)
+    max_units_per_space = fields.Integer(
+        string="Max FCUs per Room", default=4,
+        help="Largest number of units the FCU sizing may combine in one room.",
+    )
+
+    # Load Method
+    load_method = fields.Selection([
+        ('rule', 'Rule of Thumb (W/m²)'),
+        ('hourly', 'Hourly Design Day'),
+    ], string="Load Method", default='rule', required=True,
+        help="Hourly: each room is simulated over a design day, and the plant is sized "
+             "for the time-coincident (block) peak instead of the sum of the room peaks.")
+    design_temp = fields.Float(string="Outdoor Design Temp (°C)", default=hourly.DESIGN_TEMP)
+    daily_range = fields.Float(string="Daily Range (K)", default=hourly.DAILY_RANGE)
+    indoor_temp = fields.Float(string="Indoor Temp (°C)", default=hourly.INDOOR_TEMP)
+    block_load_kw = fields.Float(string="Block Load (kW)", compute="_compute_block_load", store=True)
+    block_peak_hour = fields.Integer(string="Block Peak Hour", compute="_compute_block_load", store=True)
+    load_diversity = fields.Float(
+        string="Diversity", compute="_compute_block_load", store=True, digits=(16, 2),
+        help="Block peak over the sum of the room peaks.",
+    )
+    plant_load_kw = fields.Float(
+        string="Plant Load (kW)", compute="_compute_plant_load", store=True,
+        help="Load the chiller plant is sized for: the block load with the hourly method, "
+             "the total cooling load otherwise.",
+    )
 
     # Chiller Selection
     suggested_chiller_id = fields.Many2one("hvac.chiller", string="Suggested Chiller", compute="_compute_suggested_chiller", store=True, readonly=False)
     selected_chiller_id = fields.Many2one("hvac.chiller", string="Selected Chiller")
     chiller_id = fields.Many2one("hvac.chiller", string="Chiller", compute="_compute_final_chiller", store=True)
-    chiller_qty = fields.Integer(string="Chiller Qty", default=1)
+    suggested_chiller_qty = fields.Integer(string="Suggested Chiller Qty", compute="_compute_suggested_chiller_qty", store=True)
+    chiller_qty = fields.Integer(
+        string="Chiller Qty", compute="_compute_chiller_qty", store=True, readonly=False,
+        help="Raised to the suggested quantity whenever that one grows above it.",
+    )
+    chiller_redundancy = fields.Boolean(string="N+1 Redundancy", help="Add one standby chiller to the suggested plant.")
+    plant_ranking = fields.Selection([
+        ('price', 'Lowest Price'),
+        ('efficiency', 'Best Efficiency'),
+    ], string="Rank Plants By", default='price')
+    plant_max_units = fields.Integer(string="Max Chillers", default=4)
+    chiller_options = fields.Text(string="Plant Options", compute="_compute_chiller_options")
     chiller_price = fields.Float(string="Chiller Price", compute="_compute_equipment_totals", store=True)
 
     # AHU Selection (Optional)
@@ -40,17 +97,42 @@ class HVACCoolingProject(models.Model):
 
     # Ductwork
     duct_line_ids = fields.One2many("hvac.duct.line", "project_id", string="Ductwork & Diffusers")
-    ductwork_total = fields.Float(string="Ductwork Total", compute="_compute_ductwork_total", store=True)
+    ductwork_total = fields.Float(string="Ductwork Total", readonly=True, copy=False)
+    duct_segment_ids = fields.One2many("hvac.duct.segment", "project_id", string="Duct Segments")
+    duct_material_id = fields.Many2one(
+        "hvac.duct.material", string="Duct Material", domain=[('material_type', 'in', ('gi', 'aluminum'))],
+        help="Sheet metal of the generated ductwork; its thickness gives the weight.",
+    )
+    duct_sizing_method = fields.Selection([
+        ('equal_friction', 'Equal Friction'),
+        ('static_regain', 'Static Regain'),
+    ], string="Sizing Method", default='equal_friction')
+    duct_friction_rate = fields.Float(string="Friction Rate (Pa/m)", default=duct.FRICTION_RATE)
+    duct_max_velocity = fields.Float(string="Max Velocity (m/s)", default=duct.MAX_VELOCITY)
+    duct_height = fields.Integer(string="Duct Height (mm)", default=duct.DUCT_HEIGHT)
+    insulation_price = fields.Float(string="Insulation Price (per m²)")
+    diffuser_type = fields.Selection([
+        ('supply_square', 'Supply - Square'),
+        ('supply_round', 'Supply - Round'),
+        ('supply_linear', 'Supply - Linear'),
+        ('supply_jet', 'Supply - Jet'),
+    ], string="Diffuser Type", default='supply_square')
+    duct_index_pressure_drop = fields.Float(string="Index Run Drop (Pa)", readonly=True, copy=False, digits=(16, 1))
+    duct_index_segment_id = fields.Many2one("hvac.duct.segment", string="Index Run End", readonly=True, copy=False)
+    ductwork_sized = fields.Boolean(
+        string="Ductwork Sized", readonly=True, copy=False,
+        help="Once sized, the edited branches of the network are re-sized as the rooms and segments change.",
+    )
 
     # Pricing
-    fcu_total = fields.Float(string="FCU Total", compute="_compute_equipment_totals", store=True)
-    thermostat_total = fields.Float(string="Thermostat Total", compute="_compute_equipment_totals", store=True)
-    thermostat_count = fields.Integer(string="Thermostat Count", compute="_compute_equipment_totals", store=True)
+    fcu_total = fields.Float(string="FCU Total", readonly=True, copy=False)
+    thermostat_total = fields.Float(string="Thermostat Total", readonly=True, copy=False)
+    thermostat_count = fields.Integer(string="Thermostat Count", readonly=True, copy=False)
     equipment_subtotal = fields.Float(string="Equipment Subtotal", compute="_compute_equipment_totals", store=True)
     equipment_discount = fields.Float(string="Equipment Discount (%)", default=0)
     equipment_total = fields.Float(string="Equipment Total", compute="_compute_equipment_totals", store=True)
     ductwork_discount = fields.Float(string="Ductwork Discount (%)", default=0)
-    ductwork_total_after_discount = fields.Float(string="Ductwork After Discount", compute="_compute_ductwork_total", store=True)
+    ductwork_total_after_discount = fields.Float(string="Ductwork After Discount", compute="_compute_ductwork_total_after_discount", store=True)
     grand_total = fields.Float(string="Grand Total", compute="_compute_grand_total", store=True)
 
     # Terms
@@ -82,47 +164,279 @@ class HVACCoolingProject(models.Model):
                 vals['offer_code'] = self.env['ir.sequence'].next_by_code('hvac.cooling.project') or 'New'
         return super().create(vals_list)
 
-    @api.depends("space_ids.cooling_load_watt", "space_ids.cooling_load_btu", "space_ids.cooling_load_ton", "space_ids.area")
+    def write(self, vals):
+        res = super().write(vals)
+        if set(self._design_parameters + self._selection_parameters) & set(vals):
+            # the room loads or equipment changed without any space write
+            self.action_recompute_totals()
+        if set(self._design_parameters + self._selection_parameters + self._ductwork_parameters) & set(vals):
+            # the whole network is sized again, unless its inputs are incomplete
+            self.filtered("ductwork_sized").duct_segment_ids._mark_dirty()
+        return res
+
+    @api.constrains("max_units_per_space")
+    def _check_max_units_per_space(self):
+        for rec in self:
+            if not 1 <= rec.max_units_per_space <= optimizer.MAX_UNITS:
+                raise ValidationError(f"The units per room must be between 1 and {optimizer.MAX_UNITS}.")
+
+    @api.depends("total_cooling_load_watt")
     def _compute_totals(self):
         for rec in self:
-            rec.total_cooling_load_watt = sum(rec.space_ids.mapped("cooling_load_watt"))
             rec.total_cooling_load_kw = rec.total_cooling_load_watt / 1000
-            rec.total_cooling_load_btu = sum(rec.space_ids.mapped("cooling_load_btu"))
-            rec.total_cooling_load_ton = sum(rec.space_ids.mapped("cooling_load_ton"))
-            rec.total_cooling_area = sum(rec.space_ids.mapped("area"))
 
-    @api.depends("total_cooling_load_kw")
+    @api.depends("load_method", "space_ids.hourly_profile")
+    def _compute_block_load(self):
+        for rec in self:
+            if rec.load_method == 'hourly':
+                peak, hour, diversity = hourly.block_load(rec.space_ids.mapped("hourly_profile"))
+                rec.block_load_kw = peak / 1000
+                rec.block_peak_hour = hour
+                rec.load_diversity = diversity
+            else:
+                rec.block_load_kw = rec.block_peak_hour = rec.load_diversity = 0
+
+    @api.depends("load_method", "block_load_kw", "total_cooling_load_kw")
+    def _compute_plant_load(self):
+        for rec in self:
+            rec.plant_load_kw = rec.block_load_kw if rec.load_method == 'hourly' else rec.total_cooling_load_kw
+
+    def _get_chiller_plants(self, chillers):
+        return chillers.plants(plant.chiller_cop, self.plant_max_units or 1)
+
+    @api.depends("plant_load_kw", "chiller_redundancy", "plant_ranking", "plant_max_units")
     def _compute_suggested_chiller(self):
+        chillers = self.env["hvac.capacity.index"]._get_catalog("hvac.chiller")
         for rec in self:
-            if rec.total_cooling_load_kw:
-                chiller = self.env["hvac.chiller"].search([
-                    ('cooling_capacity_kw', '>=', rec.total_cooling_load_kw), ('active', '=', True)
-                ], order='cooling_capacity_kw asc', limit=1)
-                rec.suggested_chiller_id = chiller.id if chiller else False
+            best = False
+            if rec.plant_load_kw:
+                # Best staged plant: the load may be shared by several units
+                best = rec._get_chiller_plants(chillers).best(
+                    rec.plant_load_kw, rec.chiller_redundancy, rec.plant_ranking or 'price',
+                )
+            rec.suggested_chiller_id = best.unit_id if best else False
+
+    @api.depends("chiller_id", "plant_load_kw", "chiller_redundancy")
+    def _compute_suggested_chiller_qty(self):
+        for rec in self:
+            if rec.chiller_id and rec.chiller_id.cooling_capacity_kw:
+                duty_qty = loads.units_needed(rec.plant_load_kw, rec.chiller_id.cooling_capacity_kw)
+                rec.suggested_chiller_qty = duty_qty + 1 if rec.chiller_redundancy else duty_qty
             else:
-                rec.suggested_chiller_id = False
+                rec.suggested_chiller_qty = 1
+
+    @api.depends("suggested_chiller_qty")
+    def _compute_chiller_qty(self):
+        for rec in self:
+            rec.chiller_qty = max(rec.chiller_qty, rec.suggested_chiller_qty)
+
+    @api.depends("plant_load_kw", "chiller_redundancy", "plant_ranking", "plant_max_units")
+    def _compute_chiller_options(self):
+        chillers = self.env["hvac.capacity.index"]._get_catalog("hvac.chiller")
+        for rec in self:
+            options = []
+            if rec.plant_load_kw:
+                options = rec._get_chiller_plants(chillers).options(
+                    rec.plant_load_kw, rec.chiller_redundancy, rec.plant_ranking or 'price',
+                )
+            rec.chiller_options = rec._describe_plant_options(chillers, options, "COP {:.2f}") or False
 
     @api.depends("suggested_chiller_id", "selected_chiller_id")
     def _compute_final_chiller(self):
         for rec in self:
             rec.chiller_id = rec.selected_chiller_id or rec.suggested_chiller_id
 
-    @api.depends("chiller_id", "chiller_qty", "ahu_ids", "space_ids.fcu_subtotal", "space_ids.thermostat_subtotal", "equipment_discount")
+    @api.depends("chiller_id", "chiller_qty", "ahu_ids", "fcu_total", "thermostat_total", "equipment_discount")
     def _compute_equipment_totals(self):
         for rec in self:
             rec.chiller_price = (rec.chiller_id.price or 0) * (rec.chiller_qty or 1)
             rec.ahu_total = sum(rec.ahu_ids.mapped("price"))
-            rec.fcu_total = sum(rec.space_ids.mapped("fcu_subtotal"))
-            rec.thermostat_count = sum(rec.space_ids.mapped("thermostat_qty"))
-            rec.thermostat_total = sum(rec.space_ids.mapped("thermostat_subtotal"))
             rec.equipment_subtotal = rec.chiller_price + rec.ahu_total + rec.fcu_total + rec.thermostat_total
             discount = rec.equipment_discount or 0
             rec.equipment_total = rec.equipment_subtotal * (1 - discount / 100)
 
-    @api.depends("duct_line_ids.subtotal", "ductwork_discount")
-    def _compute_ductwork_total(self):
+    # Ductwork
+    def action_size_ducts(self):
+        """Size every duct segment from the supply air of the rooms it
+        feeds, pick the diffusers of the rooms, and replace the generated
+        ductwork lines with the sheet metal, insulation and diffusers."""
+        action = False
+        for project in self:
+            action = project._size_ducts() or action
+        return action
+
+    def _get_room_airflows(self, segments):
+        """Supply air (CFM) of the rooms connected to ``segments``, as
+        ``{space id: (segment id, CFM)}``: the airflow of the room FCUs, or
+        400 CFM per ton without one."""
+        spaces = self.env["hvac.cooling.space"].search_read(
+            [('duct_segment_id', 'in', segments.ids)],
+            ["duct_segment_id", "cooling_load_ton", "fcu_id", "fcu_qty"], load=None,
+        )
+        fcus = self._read_by_id("hvac.fcu", {space["fcu_id"] for space in spaces}, ["airflow_cfm"])
+        return {
+            space["id"]: (space["duct_segment_id"], duct.room_airflow(
+                space["cooling_load_ton"],
+                fcus[space["fcu_id"]]["airflow_cfm"] if space["fcu_id"] else 0,
+                space["fcu_qty"],
+            ))
+            for space in spaces
+        }
+
+    def _resize_dirty_networks(self):
+        for project in self.filtered("ductwork_sized"):
+            project._size_ducts(incremental=True)
+
+    def _size_ducts(self, incremental=False):
+        """Size the duct network of ``self``; ``incremental`` only re-sizes
+        the dirty segments and the segments upstream of them (see
+        :func:`.duct.solve`), and only re-selects the diffusers of the rooms
+        of the dirty segments."""
+        self.ensure_one()
+        segments = self.duct_segment_ids
+        if not segments and not incremental:
+            raise UserError("Please define the duct segments of the network first.")
+        material = self.duct_material_id
+        error = False
+        if not material:
+            error = "Please select the duct material first."
+        elif material.unit == 'kg' and not material.thickness:
+            error = "The duct material priced per kilogram needs a thickness."
+        if error:
+            if incremental:
+                # the segments stay dirty until the material is fixed
+                return
+            raise UserError(error)
+
+        rows = segments.read([
+            "parent_id", "length", "dirty", "airflow_cfm", "diameter", "width", "height", "velocity",
+            "pressure_gradient", "pressure_drop", "sheet_area",
+        ], load=None)
+        previous = dirty = None
+        resize = segments
+        if incremental:
+            previous = {
+                row["id"]: duct.DuctResult(
+                    row["airflow_cfm"], row["diameter"], row["width"], row["height"], row["velocity"],
+                    row["pressure_gradient"], row["pressure_drop"], 0, row["sheet_area"],
+                )
+                for row in rows
+            }
+            dirty = [row["id"] for row in rows if row["dirty"]]
+            resize = segments.browse(duct.upstream({row["id"]: row["parent_id"] for row in rows}, dirty))
+        rooms = self._get_room_airflows(resize)
+        airflows = defaultdict(float)
+        for segment_id, airflow in rooms.values():
+            airflows[segment_id] += airflow
+        network = {row["id"]: dict(row, airflow=airflows[row["id"]]) for row in rows}
+        result = duct.solve(
+            network, self.duct_sizing_method, self.duct_friction_rate or duct.FRICTION_RATE,
+            self.duct_max_velocity or duct.MAX_VELOCITY, self.duct_height or duct.DUCT_HEIGHT,
+            previous=previous, dirty=dirty or (),
+        )
+
+        values = {}
+        for segment_id in result.resized:
+            res = result.segments[segment_id]
+            values[segment_id] = {
+                'airflow_cfm': res.airflow,
+                'diameter': res.diameter,
+                'width': res.width,
+                'height': res.height,
+                'velocity': res.velocity,
+                'pressure_gradient': res.gradient,
+                'pressure_drop': res.pressure_drop,
+                'sheet_area': res.sheet_area,
+                'sheet_weight': duct.sheet_weight(res.sheet_area, material.thickness),
+                'unsized': segment_id in result.unsized,
+                'dirty': False,
+            }
+        self._write_by_id(segments._name, values, {row["id"]: row for row in rows})
+        sheet_area = length = 0.0
+        for segment_id, res in result.segments.items():
+            if res.sheet_area:
+                sheet_area += res.sheet_area
+                length += network[segment_id]["length"] or 0
+
+        diffusers = self.env["hvac.diffuser"].search_read(
+            [('diffuser_type', '=', self.diffuser_type), ('airflow_cfm', '>', 0)],
+            ["name", "size", "airflow_cfm", "price"], load=None,
+        )
+        catalog = [(row["id"], row["airflow_cfm"]) for row in diffusers]
+        # rooms of the resized segments that did not change keep their diffusers
+        if incremental:
+            dirty = set(dirty)
+            changed = {space_id: room for space_id, room in rooms.items() if room[0] in dirty}
+        else:
+            changed = rooms
+        values = {}
+        for space in self.env["hvac.cooling.space"].browse(changed):
+            airflow = changed[space.id][1]
+            # the airflow covers the ``qty`` identical rooms of the space
+            selected = duct.select_diffusers(airflow / (space.qty or 1), catalog)
+            values[space.id] = {
+                'supply_airflow_cfm': airflow,
+                'diffuser_id': selected[0] if selected else False,
+                'diffuser_qty': selected[1] * (space.qty or 1) if selected else 0,
+            }
+        self._write_by_id("hvac.cooling.space", values)
+        diffuser_qty = dict(self.env["hvac.cooling.space"]._read_group(
+            [('project_id', '=', self.id), ('duct_segment_id', '!=', False), ('diffuser_id', '!=', False)],
+            ['diffuser_id'], ['diffuser_qty:sum'],
+        ))
+
+        quantities = {
+            'kg': duct.sheet_weight(sheet_area, material.thickness), 'sqm': sheet_area, 'meter': length,
+        }
+        lines = [{
+            'name': f"{material.name} ({material.thickness:g} mm)" if material.thickness else material.name,
+            'line_type': 'duct',
+            'material_id': material.id,
+            'unit': material.unit,
+            'quantity': round(quantities[material.unit], 1),
+            'unit_price': material.price_per_unit,
+        }]
+        if material.insulation:
+            lines.append({
+                'name': f"Duct Insulation ({material.insulation_thickness:g} mm)",
+                'line_type': 'insulation',
+                'material_id': material.id,
+                'unit': 'sqm',
+                'quantity': round(sheet_area, 1),
+                'unit_price': self.insulation_price,
+            })
+        lines += [{
+            'name': f"{diffuser.name} ({diffuser.size})" if diffuser.size else diffuser.name,
+            'line_type': 'diffuser',
+            'diffuser_id': diffuser.id,
+            'unit': 'No.',
+            'quantity': qty,
+            'unit_price': diffuser.price,
+        } for diffuser, qty in diffuser_qty.items()]
+        self._sync_generated_lines(
+            'duct_line_ids', ['line_type', 'material_id', 'diffuser_id'], [line for line in lines if line['quantity']],
+        )
+        self.write({
+            'duct_index_pressure_drop': result.index_pressure_drop,
+            'duct_index_segment_id': result.index_path[-1] if result.index_path else False,
+            'ductwork_sized': True,
+        })
+        if result.unsized and not incremental:
+            return {
+                'type': 'ir.actions.client',
+                'tag': 'display_notification',
+                'params': {
+                    'title': "Ductwork",
+                    'message': "No duct size carries the airflow of: %s. Split the run or relax the limits."
+                               % ", ".join(segments.browse(result.unsized).mapped("name")),
+                    'type': 'warning',
+                    'sticky': True,
+                },
+            }
+
+    @api.depends("ductwork_total", "ductwork_discount")
+    def _compute_ductwork_total_after_discount(self):
         for rec in self:
-            rec.ductwork_total = sum(rec.duct_line_ids.mapped("subtotal"))
             discount = rec.ductwork_discount or 0
             rec.ductwork_total_after_discount = rec.ductwork_total * (1 - discount / 100)
 
@@ -146,62 +460,52 @@ class HVACCoolingProject(models.Model):
     def action_confirm(self):
         self.write({'state': 'confirmed'})
 
-    def action_create_quotation(self):
-        self.ensure_one()
-        if not self.customer_id:
-            raise UserError("Please select a customer first.")
-        
-        order_lines = []
-        
-        if self.chiller_id:
-            order_lines.append((0, 0, {
-                "name": f"{self.chiller_id.name} ({self.chiller_id.cooling_capacity_ton:.1f} TR)",
-                "product_uom_qty": self.chiller_qty or 1,
-                "price_unit": self.chiller_id.price or 0,
-            }))
-        
-        for ahu in self.ahu_ids:
-            order_lines.append((0, 0, {
-                "name": f"{ahu.name} ({ahu.airflow_cfm:.0f} CFM)",
-                "product_uom_qty": 1,
-                "price_unit": ahu.price or 0,
-            }))
-        
-        for space in self.space_ids.filtered(lambda s: s.system_type == 'fcu' and s.fcu_id):
-            order_lines.append((0, 0, {
-                "name": f"{space.fcu_id.name} - {space.room_name or 'Room'}",
-                "product_uom_qty": space.fcu_qty or 1,
-                "price_unit": space.fcu_id.price or 0,
-            }))
-            if space.thermostat_qty:
-                order_lines.append((0, 0, {
-                    "name": f"Thermostat - {space.room_name or 'Room'}",
-                    "product_uom_qty": space.thermostat_qty,
-                    "price_unit": space.thermostat_price or 3000,
-                }))
-        
-        for line in self.duct_line_ids:
-            order_lines.append((0, 0, {
-                "name": line.name,
-                "product_uom_qty": line.quantity or 1,
-                "price_unit": line.unit_price or 0,
-            }))
-        
-        sale_order = self.env['sale.order'].create({
-            'partner_id': self.customer_id.id,
-            'origin': self.offer_code,
-            'order_line': order_lines,
-        })
-        
-        self.write({'sale_order_id': sale_order.id, 'state': 'quoted'})
-        
-        return {
-            'type': 'ir.actions.act_window',
-            'res_model': 'sale.order',
-            'res_id': sale_order.id,
-            'view_mode': 'form',
-            'target': 'current',
-        }
+    def _prepare_quotation_lines(self):
+        projects = self.read(["chiller_id", "chiller_qty", "ahu_ids"], load=None)
+        spaces = self.env["hvac.cooling.space"].search_read([
+            ('project_id', 'in', self.ids), ('system_type', '=', 'fcu'), ('fcu_id', '!=', False),
+        ], ["project_id", "room_name", "fcu_id", "fcu_qty", "thermostat_qty", "thermostat_price"], load=None)
+        duct_lines = self.env["hvac.duct.line"].search_read([
+            ('project_id', 'in', self.ids),
+        ], ["project_id", "name", "quantity", "unit_price"], load=None)
+
+        chillers = self._read_by_id("hvac.chiller", {p["chiller_id"] for p in projects}, ["name", "cooling_capacity_ton", "price"])
+        ahus = self._read_by_id("hvac.ahu", {i for p in projects for i in p["ahu_ids"]}, ["name", "airflow_cfm", "price"])
+        fcus = self._read_by_id("hvac.fcu", {s["fcu_id"] for s in spaces}, ["name", "price"])
+
+        order_lines = {}
+        for project in projects:
+            lines = order_lines[project["id"]] = []
+            chiller = chillers.get(project["chiller_id"])
+            if chiller:
+                lines.append(self._quotation_line(
+                    f"{chiller['name']} ({chiller['cooling_capacity_ton']:.1f} TR)",
+                    project["chiller_qty"] or 1,
+                    chiller["price"] or 0,
+                ))
+            for ahu in (ahus[i] for i in project["ahu_ids"]):
+                lines.append(self._quotation_line(
+                    f"{ahu['name']} ({ahu['airflow_cfm']:.0f} CFM)", 1, ahu["price"] or 0,
+                ))
+
+        for space in spaces:
+            lines = order_lines[space["project_id"]]
+            fcu = fcus[space["fcu_id"]]
+            room_name = space["room_name"] or 'Room'
+            lines.append(self._quotation_line(
+                f"{fcu['name']} - {room_name}", space["fcu_qty"] or 1, fcu["price"] or 0,
+            ))
+            if space["thermostat_qty"]:
+                lines.append(self._quotation_line(
+                    f"Thermostat - {room_name}", space["thermostat_qty"], space["thermostat_price"] or 3000,
+                ))
+
+        for line in duct_lines:
+            order_lines[line["project_id"]].append(self._quotation_line(
+                line["name"], line["quantity"] or 1, line["unit_price"] or 0,
+            ))
+
+        return order_lines
 
     def action_view_quotation(self):
         self.ensure_one()
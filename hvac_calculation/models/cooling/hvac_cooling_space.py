@@ -1,12 +1,37 @@
 from odoo import models, fields, api
-import math
 
+from ...engine import hourly, loads, selection
+from ..hvac_perf_stat import instrument_methods
 
+
+@instrument_methods
 class HVACCoolingSpace(models.Model):
     _name = "hvac.cooling.space"
+    _inherit = ["hvac.space.mixin"]
     _description = "Cooling Space/Room"
     _order = "floor_sequence, sequence, id"
 
+    _project_totals = {
+        'total_cooling_load_watt': 'cooling_load_watt',
+        'total_cooling_load_btu': 'cooling_load_btu',
+        'total_cooling_load_ton': 'cooling_load_ton',
+        'total_cooling_area': 'area',
+        'fcu_total': 'fcu_subtotal',
+        'thermostat_total': 'thermostat_subtotal',
+        'thermostat_count': 'thermostat_qty',
+    }
+
+    # written by the duct sizing, outside every total and summary
+    _summary_neutral_fields = {'sequence', 'notes', 'supply_airflow_cfm', 'diffuser_id', 'diffuser_qty'}
+    _network_fields = ('duct_segment_id', 'cooling_load_ton', 'fcu_id', 'fcu_qty', 'qty')
+
+    _fcu_combination_step = 0.1  # kW, precision of the FCU combination table
+    # space fields read by the hourly load engine
+    _hourly_inputs = (
+        'area', 'qty', 'load_factor_percent', 'orientation', 'wall_area', 'window_area',
+        'occupants', 'lighting_w_per_sqm', 'equipment_w_per_sqm', 'schedule',
+    )
+
     sequence = fields.Integer(string="Sequence", default=10)
     
     project_id = fields.Many2one(
@@ -47,6 +72,33 @@ class HVACCoolingSpace(models.Model):
     cooling_load_btu = fields.Float(string="Cooling Load (BTU/hr)", compute="_compute_cooling_load", store=True)
     cooling_load_ton = fields.Float(string="Cooling Load (TR)", compute="_compute_cooling_load", store=True)
 
+    # Hourly Load (projects using the hourly design day method)
+    orientation = fields.Selection([
+        ('interior', 'Interior'),
+        ('n', 'North'),
+        ('ne', 'North-East'),
+        ('e', 'East'),
+        ('se', 'South-East'),
+        ('s', 'South'),
+        ('sw', 'South-West'),
+        ('w', 'West'),
+        ('nw', 'North-West'),
+    ], string="Orientation", default='interior', help="Facing of the exposed wall and windows.")
+    wall_area = fields.Float(string="Exposed Wall (m²)")
+    window_area = fields.Float(string="Window Area (m²)")
+    occupants = fields.Integer(string="Occupants")
+    lighting_w_per_sqm = fields.Float(string="Lighting (W/m²)", default=hourly.LIGHTING_WATT_PER_SQM)
+    equipment_w_per_sqm = fields.Float(string="Equipment (W/m²)", default=hourly.EQUIPMENT_WATT_PER_SQM)
+    schedule = fields.Selection([
+        ('office', 'Office'),
+        ('residential', 'Residential'),
+        ('retail', 'Retail'),
+        ('continuous', '24 Hours'),
+    ], string="Schedule", default='office')
+    hourly_profile = fields.Json(string="Hourly Load (W)", compute="_compute_hourly_profile", store=True)
+    hourly_peak_watt = fields.Float(string="Peak Load (W)", compute="_compute_hourly_profile", store=True)
+    hourly_peak_hour = fields.Integer(string="Peak Hour", compute="_compute_hourly_profile", store=True)
+
     # System Type
     system_type = fields.Selection([
         ('fcu', 'Fan Coil Unit'),
@@ -67,6 +119,15 @@ class HVACCoolingSpace(models.Model):
     fcu_qty = fields.Integer(string="FCU Qty", default=1)
     fcu_unit_price = fields.Float(string="FCU Unit Price", related="fcu_id.price", readonly=True)
     fcu_subtotal = fields.Float(string="FCU Subtotal", compute="_compute_fcu_subtotal", store=True)
+    fcu_combination = fields.Char(
+        string="Cheapest FCU Mix", compute="_compute_fcu_combination", store=True,
+        help="Advisory: cheapest mix of models covering the load. The room is priced and quoted "
+             "with the single FCU model and quantity.",
+    )
+    fcu_combination_cost = fields.Float(
+        string="Cheapest FCU Mix Cost", compute="_compute_fcu_combination", store=True,
+        help="Advisory: price of the cheapest mix, to compare with the subtotal of the room.",
+    )
 
     # Thermostat
     thermostat_price = fields.Float(string="Thermostat Price", default=3000)
@@ -76,6 +137,15 @@ class HVACCoolingSpace(models.Model):
     # Space Subtotal
     space_subtotal = fields.Float(string="Space Subtotal", compute="_compute_space_subtotal", store=True)
 
+    # Ductwork
+    duct_segment_id = fields.Many2one(
+        "hvac.duct.segment", string="Duct Segment", index="btree_not_null", ondelete="set null",
+        domain="[('project_id', '=', project_id)]", help="Segment at the end of which the diffusers of this space are connected.",
+    )
+    supply_airflow_cfm = fields.Float(string="Supply Air (CFM)", readonly=True, copy=False, digits=(16, 0))
+    diffuser_id = fields.Many2one("hvac.diffuser", string="Diffuser", readonly=True, copy=False)
+    diffuser_qty = fields.Integer(string="Diffuser Qty", readonly=True, copy=False)
+
     notes = fields.Text(string="Notes")
 
     # Computed Methods
@@ -87,42 +157,74 @@ class HVACCoolingSpace(models.Model):
 
     @api.depends("area", "height")
     def _compute_volume(self):
-        for rec in self:
-            rec.volume = (rec.area or 0) * (rec.height or 3.0)
+        for rec, volume in zip(self, loads.volumes(self.mapped("area"), self.mapped("height"))):
+            rec.volume = volume
 
     @api.depends("watt_per_sqm")
     def _compute_btu_per_sqm(self):
         for rec in self:
-            rec.btu_per_sqm = rec.watt_per_sqm * 3.412 if rec.watt_per_sqm else 0
+            rec.btu_per_sqm = loads.watt_to_btu(rec.watt_per_sqm)
 
-    @api.depends("area", "watt_per_sqm", "load_factor_percent", "qty")
-    def _compute_cooling_load(self):
+    @api.depends(*_hourly_inputs, "project_id.load_method", "project_id.design_temp",
+                 "project_id.daily_range", "project_id.indoor_temp")
+    def _compute_hourly_profile(self):
+        outdoor = {}
         for rec in self:
-            load_factor = (rec.load_factor_percent or 100) / 100
-            rec.cooling_load_watt = (rec.area or 0) * (rec.watt_per_sqm or 150) * load_factor * (rec.qty or 1)
-            rec.cooling_load_btu = rec.cooling_load_watt * 3.412
-            rec.cooling_load_ton = rec.cooling_load_watt / 3517
+            project = rec.project_id
+            if project.load_method != 'hourly':
+                rec.hourly_profile = False
+                rec.hourly_peak_watt = rec.hourly_peak_hour = 0
+                continue
+            if project not in outdoor:
+                outdoor[project] = hourly.outdoor_temperatures(project.design_temp, project.daily_range)
+            profile = hourly.room_profile(
+                {fname: rec[fname] for fname in self._hourly_inputs}, outdoor[project], project.indoor_temp,
+            )
+            rec.hourly_profile = [round(load, 1) for load in profile]
+            rec.hourly_peak_watt, rec.hourly_peak_hour = hourly.peak(profile)
+
+    @api.depends("area", "watt_per_sqm", "load_factor_percent", "qty", "hourly_peak_watt", "project_id.load_method")
+    def _compute_cooling_load(self):
+        watts, btus, tons = loads.cooling_loads(
+            self.mapped("area"),
+            self.mapped("watt_per_sqm"),
+            self.mapped("load_factor_percent"),
+            self.mapped("qty"),
+        )
+        for rec, watt, btu, ton in zip(self, watts, btus, tons):
+            if rec.project_id.load_method == 'hourly':
+                # the room peak of the design day replaces the W/m² rule
+                watt = rec.hourly_peak_watt
+                btu, ton = loads.watt_to_btu(watt), watt / loads.W_PER_TON
+            rec.cooling_load_watt = watt
+            rec.cooling_load_btu = btu
+            rec.cooling_load_ton = ton
 
-    @api.depends("cooling_load_watt", "system_type")
+    @api.depends("cooling_load_watt", "system_type", "project_id.max_units_per_space")
     def _compute_suggested_fcu(self):
+        fcus = self.env["hvac.capacity.index"]._get_catalog("hvac.fcu")
         for rec in self:
             if rec.cooling_load_watt and rec.system_type == 'fcu':
-                # Find smallest FCU that covers the load
-                fcu = self.env["hvac.fcu"].search([
-                    ('cooling_capacity_kw', '>=', rec.cooling_load_watt / 1000),
-                    ('active', '=', True)
-                ], order='cooling_capacity_kw asc', limit=1)
-                
-                # If no single FCU covers it, get the largest
-                if not fcu:
-                    fcu = self.env["hvac.fcu"].search([
-                        ('active', '=', True)
-                    ], order='cooling_capacity_kw desc', limit=1)
-                
-                rec.suggested_fcu_id = fcu.id if fcu else False
+                rec.suggested_fcu_id = selection.optimal_fcu(
+                    fcus, rec.cooling_load_watt / 1000,
+                    self._fcu_combination_step, rec.project_id.max_units_per_space or 1,
+                )
             else:
                 rec.suggested_fcu_id = False
 
+    @api.depends("cooling_load_watt", "system_type", "project_id.max_units_per_space")
+    def _compute_fcu_combination(self):
+        fcus = self.env["hvac.capacity.index"]._get_catalog("hvac.fcu")
+        for rec in self:
+            best = False
+            if rec.cooling_load_watt and rec.system_type == 'fcu':
+                best = selection.cheapest_fcus(
+                    fcus, rec.cooling_load_watt / 1000,
+                    self._fcu_combination_step, rec.project_id.max_units_per_space or 1,
+                )
+            rec.fcu_combination = fcus.describe(best) if best else False
+            rec.fcu_combination_cost = best.cost if best else 0
+
     @api.depends("suggested_fcu_id", "selected_fcu_id")
     def _compute_final_fcu(self):
         for rec in self:
@@ -132,8 +234,7 @@ class HVACCoolingSpace(models.Model):
     def _compute_suggested_fcu_qty(self):
         for rec in self:
             if rec.system_type == 'fcu' and rec.fcu_id and rec.fcu_id.cooling_capacity_kw:
-                fcu_watt = rec.fcu_id.cooling_capacity_kw * 1000
-                rec.suggested_fcu_qty = max(1, math.ceil(rec.cooling_load_watt / fcu_watt))
+                rec.suggested_fcu_qty = loads.units_needed(rec.cooling_load_watt, rec.fcu_id.cooling_capacity_kw * 1000)
             else:
                 rec.suggested_fcu_qty = 1
 
@@ -169,13 +270,12 @@ class HVACCoolingSpace(models.Model):
     @api.onchange("fcu_id")
     def _onchange_fcu_id(self):
         if self.fcu_id and self.cooling_load_watt and self.fcu_id.cooling_capacity_kw:
-            fcu_watt = self.fcu_id.cooling_capacity_kw * 1000
-            self.fcu_qty = max(1, math.ceil(self.cooling_load_watt / fcu_watt))
+            self.fcu_qty = loads.units_needed(self.cooling_load_watt, self.fcu_id.cooling_capacity_kw * 1000)
 
     @api.onchange("btu_per_sqm")
     def _onchange_btu_per_sqm(self):
         if self.btu_per_sqm:
-            self.watt_per_sqm = self.btu_per_sqm / 3.412
+            self.watt_per_sqm = loads.btu_to_watt(self.btu_per_sqm)
 
     @api.onchange("system_type")
     def _onchange_system_type(self):
@@ -1,4 +1,5 @@
 from odoo import models, fields, api
+from ..hvac_perf_stat import instrument_methods
 
 
 class HVACDuctMaterial(models.Model):
@@ -76,11 +77,15 @@ class HVACDiffuser(models.Model):
         return result
 
 
+@instrument_methods
 class HVACDuctLine(models.Model):
     _name = "hvac.duct.line"
+    _inherit = ["hvac.takeoff.line.mixin"]
     _description = "Ductwork Line"
     _order = "sequence, id"
 
+    _project_total = 'ductwork_total'
+
     sequence = fields.Integer(string="Sequence", default=10)
     
     project_id = fields.Many2one(
@@ -118,6 +123,10 @@ class HVACDuctLine(models.Model):
         compute="_compute_subtotal",
         store=True
     )
+    generated = fields.Boolean(
+        string="Generated", readonly=True, copy=False,
+        help="Created by the duct sizing from the duct segments; replaced at the next sizing.",
+    )
     
     notes = fields.Text(string="Notes")
 
@@ -138,3 +147,43 @@ class HVACDuctLine(models.Model):
             self.name = self.diffuser_id.name
             self.unit_price = self.diffuser_id.price
             self.unit = 'No.'
+
+
+class HVACDuctSegment(models.Model):
+    """A duct run of the supply air network, from its parent segment (or
+    the AHU / ducted FCU) to the rooms and segments it feeds."""
+    _name = "hvac.duct.segment"
+    _inherit = ["hvac.network.segment.mixin"]
+    _description = "Duct Segment"
+    _order = "sequence, id"
+
+    _index_segment_field = 'duct_index_segment_id'
+
+    sequence = fields.Integer(string="Sequence", default=10)
+    project_id = fields.Many2one("hvac.cooling.project", string="Project", required=True, index=True, ondelete="cascade")
+    name = fields.Char(string="Segment", required=True)
+    parent_id = fields.Many2one(
+        "hvac.duct.segment", string="Fed From", ondelete="set null",
+        domain="[('project_id', '=', project_id), ('id', '!=', id)]",
+        help="Upstream segment; leave empty for the segments leaving the air handler.",
+    )
+    child_ids = fields.One2many("hvac.duct.segment", "parent_id", string="Feeds")
+    ahu_id = fields.Many2one("hvac.ahu", string="Air Handler", help="AHU feeding this run, for the first segment of a network.")
+    length = fields.Float(string="Length (m)", default=5)
+    space_ids = fields.One2many("hvac.cooling.space", "duct_segment_id", string="Rooms")
+
+    # Sizing results (see hvac.cooling.project.action_size_ducts)
+    airflow_cfm = fields.Float(string="Airflow (CFM)", readonly=True, digits=(16, 0))
+    diameter = fields.Integer(string="Round Ø (mm)", readonly=True)
+    width = fields.Integer(string="Width (mm)", readonly=True)
+    height = fields.Integer(string="Height (mm)", readonly=True)
+    velocity = fields.Float(string="Velocity (m/s)", readonly=True, digits=(16, 2))
+    pressure_gradient = fields.Float(string="Gradient (Pa/m)", readonly=True, digits=(16, 2))
+    pressure_drop = fields.Float(string="Pressure Drop (Pa)", readonly=True, digits=(16, 1))
+    path_pressure_drop = fields.Float(
+        string="Drop from Fan (Pa)", compute="_compute_path_pressure_drop", recursive=True, digits=(16, 1),
+    )
+    sheet_area = fields.Float(string="Sheet (m²)", readonly=True, digits=(16, 2))
+    sheet_weight = fields.Float(string="Sheet (kg)", readonly=True, digits=(16, 1))
+    is_index = fields.Boolean(string="Index Run", compute="_compute_is_index")
+    unsized = fields.Boolean(string="Unsized", readonly=True, help="Even the largest duct size exceeds the friction rate or velocity limit.")
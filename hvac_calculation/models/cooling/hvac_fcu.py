@@ -1,8 +1,12 @@
 from odoo import models, fields, api
+from ...engine import loads
+from ..hvac_perf_stat import instrument_methods
 
 
+@instrument_methods
 class HVACFCU(models.Model):
     _name = "hvac.fcu"
+    _inherit = ["hvac.catalog.mixin"]
     _description = "HVAC Fan Coil Unit"
     _order = "cooling_capacity_kw asc"
 
@@ -54,7 +58,7 @@ class HVACFCU(models.Model):
     @api.depends("cooling_capacity_kw")
     def _compute_capacity_btu(self):
         for rec in self:
-            rec.cooling_capacity_btu = rec.cooling_capacity_kw * 3412 if rec.cooling_capacity_kw else 0
+            rec.cooling_capacity_btu = loads.kw_to_btu(rec.cooling_capacity_kw)
 
     @api.depends("cooling_capacity_kw")
     def _compute_capacity_ton(self):
@@ -2,4 +2,5 @@ from . import hvac_boiler
 from . import hvac_radiator
 from . import hvac_heating_piping
 from . import hvac_heating_space
+from . import hvac_heating_floor_summary
 from . import hvac_heating_project
@@ -1,8 +1,11 @@
-from odoo import models, fields, api
+from odoo import models, fields
+from ..hvac_perf_stat import instrument_methods
 
 
+@instrument_methods
 class HVACBoiler(models.Model):
     _name = "hvac.boiler"
+    _inherit = ["hvac.catalog.mixin"]
     _description = "HVAC Boiler"
     _order = "kw_output asc"
 
@@ -0,0 +1,24 @@
+from odoo import models, fields, api
+
+
+class HVACHeatingFloorSummary(models.Model):
+    _name = "hvac.heating.floor.summary"
+    _inherit = ["hvac.floor.summary.mixin"]
+    _description = "Heating Floor Summary"
+
+    _space_model = "hvac.heating.space"
+    _summary_sums = {
+        'room_count': 'qty',
+        'area': 'area',
+        'heat_load': 'heat_load',
+        'equipment_cost': 'space_subtotal',
+    }
+
+    project_id = fields.Many2one("hvac.heating.project", string="Project", required=True, index=True, ondelete="cascade")
+    heat_load = fields.Float(string="Heat Load (W)", readonly=True)
+    heat_load_kw = fields.Float(string="Heat Load (kW)", compute="_compute_heat_load_kw", store=True)
+
+    @api.depends("heat_load")
+    def _compute_heat_load_kw(self):
+        for rec in self:
+            rec.heat_load_kw = rec.heat_load / 1000
@@ -1,4 +1,5 @@
 from odoo import models, fields, api
+from ..hvac_perf_stat import instrument_methods
 
 
 class HVACHeatingPipingMaterial(models.Model):
@@ -28,11 +29,15 @@ class HVACHeatingPipingMaterial(models.Model):
     notes = fields.Text(string="Notes")
 
 
+@instrument_methods
 class HVACHeatingPipingLine(models.Model):
     _name = "hvac.heating.piping.line"
+    _inherit = ["hvac.takeoff.line.mixin"]
     _description = "Heating Piping Line"
     _order = "sequence, id"
 
+    _project_total = 'piping_total'
+
     sequence = fields.Integer(string="Sequence", default=10)
     
     project_id = fields.Many2one(
@@ -60,6 +65,10 @@ class HVACHeatingPipingLine(models.Model):
         compute="_compute_subtotal",
         store=True
     )
+    generated = fields.Boolean(
+        string="Generated", readonly=True, copy=False,
+        help="Created by the piping sizing from the pipe segments; replaced at the next sizing.",
+    )
     
     notes = fields.Text(string="Notes")
 
@@ -73,3 +82,41 @@ class HVACHeatingPipingLine(models.Model):
         if self.material_id:
             self.name = self.material_id.name
             self.unit_price = self.material_id.price_per_unit
+
+
+class HVACHeatingPipeSegment(models.Model):
+    """A pipe run of the heating network, from its parent segment (or the
+    boiler) to the emitters and segments it feeds."""
+    _name = "hvac.heating.pipe.segment"
+    _inherit = ["hvac.network.segment.mixin"]
+    _description = "Heating Pipe Segment"
+    _order = "sequence, id"
+
+    _index_segment_field = 'pipe_index_segment_id'
+    _network_inputs = ('parent_id', 'length', 'fitting_allowance')
+
+    sequence = fields.Integer(string="Sequence", default=10)
+    project_id = fields.Many2one("hvac.heating.project", string="Project", required=True, index=True, ondelete="cascade")
+    name = fields.Char(string="Segment", required=True)
+    parent_id = fields.Many2one(
+        "hvac.heating.pipe.segment", string="Fed From", ondelete="set null",
+        domain="[('project_id', '=', project_id), ('id', '!=', id)]",
+        help="Upstream segment; leave empty for the segments leaving the boiler.",
+    )
+    child_ids = fields.One2many("hvac.heating.pipe.segment", "parent_id", string="Feeds")
+    length = fields.Float(string="Length (m)", default=5)
+    fitting_allowance = fields.Float(string="Fittings (%)", default=30, help="Equivalent length of the fittings, in % of the straight length.")
+    space_ids = fields.One2many("hvac.heating.space", "pipe_segment_id", string="Emitters")
+
+    # Sizing results (see hvac.heating.project.action_size_piping)
+    heat_load = fields.Float(string="Heat Load (W)", readonly=True)
+    flow_m3h = fields.Float(string="Flow (m³/h)", readonly=True, digits=(16, 3))
+    material_id = fields.Many2one("hvac.heating.piping.material", string="Pipe", readonly=True)
+    velocity = fields.Float(string="Velocity (m/s)", readonly=True, digits=(16, 2))
+    pressure_gradient = fields.Float(string="Gradient (Pa/m)", readonly=True, digits=(16, 0))
+    pressure_drop = fields.Float(string="Pressure Drop (kPa)", readonly=True, digits=(16, 2))
+    path_pressure_drop = fields.Float(
+        string="Drop from Boiler (kPa)", compute="_compute_path_pressure_drop", recursive=True, digits=(16, 2),
+    )
+    is_index = fields.Boolean(string="Index Circuit", compute="_compute_is_index")
+    unsized = fields.Boolean(string="Unsized", readonly=True, help="No pipe of the project material carries the flow within the limits.")
@@ -1,12 +1,24 @@
 from odoo import models, fields, api
-from odoo.exceptions import UserError
+from odoo.exceptions import UserError, ValidationError
+from ...engine import hydronic, loads, optimizer, plant
+from ..hvac_perf_stat import instrument_methods
 
 
+@instrument_methods
 class HVACHeatingProject(models.Model):
     _name = "hvac.heating.project"
+    _inherit = ["hvac.project.mixin"]
     _description = "Central Heating Project"
     _order = "date desc, id desc"
 
+    _offer_report = "hvac_calculation.action_report_heating_project"
+    _report_child_fields = ('space_ids', 'piping_line_ids')
+    _line_totals = {'piping_total': 'piping_line_ids'}
+    # project fields the room equipment selection depends on
+    _selection_parameters = ('max_units_per_space',)
+    # project fields the whole pipe network is re-sized on
+    _piping_parameters = ('pipe_material_type', 'pipe_delta_t', 'pipe_max_velocity', 'pipe_max_gradient')
+
     name = fields.Char(string="Project Name", required=True)
     customer_id = fields.Many2one("res.partner", string="Customer")
     attention_to = fields.Char(string="Attention To")
@@ -19,32 +31,67 @@ class HVACHeatingProject(models.Model):
 
     # Spaces
     space_ids = fields.One2many("hvac.heating.space", "project_id", string="Spaces")
+    floor_summary_ids = fields.One2many("hvac.heating.floor.summary", "project_id", string="Floors", readonly=True)
 
-    # Heat Load
-    total_heat_load = fields.Float(string="Total Heat Load (W)", compute="_compute_totals", store=True)
+    # Heat Load (maintained incrementally by the spaces, see hvac.space.mixin)
+    total_heat_load = fields.Float(string="Total Heat Load (W)", readonly=True, copy=False)
     total_heat_load_kw = fields.Float(string="Total Heat Load (kW)", compute="_compute_totals", store=True)
-    total_heating_area = fields.Float(string="Total Heating Area (m²)", compute="_compute_totals", store=True)
+    total_heating_area = fields.Float(string="Total Heating Area (m²)", readonly=True, copy=False)
+    max_units_per_space = fields.Integer(
+        string="Max Radiators per Room", default=4,
+        help="Largest number of units the radiator sizing may combine in one room.",
+    )
 
     # Boiler Selection
     suggested_boiler_id = fields.Many2one("hvac.boiler", string="Suggested Boiler", compute="_compute_suggested_boiler", store=True, readonly=False)
     selected_boiler_id = fields.Many2one("hvac.boiler", string="Selected Boiler")
     boiler_id = fields.Many2one("hvac.boiler", string="Boiler", compute="_compute_final_boiler", store=True)
-    boiler_qty = fields.Integer(string="Boiler Qty", default=1)
+    suggested_boiler_qty = fields.Integer(string="Suggested Boiler Qty", compute="_compute_suggested_boiler_qty", store=True)
+    boiler_qty = fields.Integer(
+        string="Boiler Qty", compute="_compute_boiler_qty", store=True, readonly=False,
+        help="Raised to the suggested quantity whenever that one grows above it.",
+    )
+    boiler_redundancy = fields.Boolean(string="N+1 Redundancy", help="Add one standby boiler to the suggested plant.")
+    plant_ranking = fields.Selection([
+        ('price', 'Lowest Price'),
+        ('efficiency', 'Best Efficiency'),
+    ], string="Rank Plants By", default='price')
+    plant_max_units = fields.Integer(string="Max Boilers", default=4)
+    boiler_options = fields.Text(string="Plant Options", compute="_compute_boiler_options")
     boiler_price = fields.Float(string="Boiler Price", compute="_compute_equipment_totals", store=True)
 
     # Piping
     piping_line_ids = fields.One2many("hvac.heating.piping.line", "project_id", string="Piping Network")
-    piping_total = fields.Float(string="Piping Total", compute="_compute_piping_total", store=True)
+    piping_total = fields.Float(string="Piping Total", readonly=True, copy=False)
+    pipe_segment_ids = fields.One2many("hvac.heating.pipe.segment", "project_id", string="Pipe Segments")
+    pipe_material_type = fields.Selection([
+        ('ppr', 'PPR Pipe'),
+        ('pex', 'PEX Pipe'),
+        ('copper', 'Copper Pipe'),
+        ('steel', 'Steel Pipe'),
+        ('multilayer', 'Multilayer Pipe'),
+    ], string="Pipe Material", default='ppr')
+    pipe_delta_t = fields.Float(string="Supply - Return (K)", default=hydronic.DELTA_T)
+    pipe_max_velocity = fields.Float(string="Max Velocity (m/s)", default=hydronic.MAX_VELOCITY)
+    pipe_max_gradient = fields.Float(string="Max Gradient (Pa/m)", default=hydronic.MAX_GRADIENT)
+    index_pressure_drop = fields.Float(string="Index Circuit Drop (kPa)", readonly=True, copy=False, digits=(16, 2))
+    pump_head = fields.Float(string="Pump Head (m)", readonly=True, copy=False, digits=(16, 2))
+    pipe_index_segment_id = fields.Many2one("hvac.heating.pipe.segment", string="Index Emitter Segment", readonly=True, copy=False)
+    piping_sized = fields.Boolean(
+        string="Piping Sized", readonly=True, copy=False,
+        help="Once sized, the edited branches of the network are re-sized as the rooms and segments change.",
+    )
 
     # Pricing
-    ufh_total = fields.Float(string="UFH Total", compute="_compute_equipment_totals", store=True)
-    thermostat_total = fields.Float(string="Thermostat Total", compute="_compute_equipment_totals", store=True)
-    thermostat_count = fields.Integer(string="Thermostat Count", compute="_compute_equipment_totals", store=True)
+    radiator_total = fields.Float(string="Radiator Total", readonly=True, copy=False)
+    ufh_total = fields.Float(string="UFH Total", readonly=True, copy=False)
+    thermostat_total = fields.Float(string="Thermostat Total", readonly=True, copy=False)
+    thermostat_count = fields.Integer(string="Thermostat Count", readonly=True, copy=False)
     equipment_subtotal = fields.Float(string="Equipment Subtotal", compute="_compute_equipment_totals", store=True)
     equipment_discount = fields.Float(string="Equipment Discount (%)", default=0)
     equipment_total = fields.Float(string="Equipment Total", compute="_compute_equipment_totals", store=True)
     piping_discount = fields.Float(string="Piping Discount (%)", default=0)
-    piping_total_after_discount = fields.Float(string="Piping After Discount", compute="_compute_piping_total", store=True)
+    piping_total_after_discount = fields.Float(string="Piping After Discount", compute="_compute_piping_total_after_discount", store=True)
     grand_total = fields.Float(string="Grand Total", compute="_compute_grand_total", store=True)
 
     # Terms
@@ -76,45 +123,203 @@ class HVACHeatingProject(models.Model):
                 vals['offer_code'] = self.env['ir.sequence'].next_by_code('hvac.heating.project') or 'New'
         return super().create(vals_list)
 
-    @api.depends("space_ids.heat_load", "space_ids.area")
+    def write(self, vals):
+        res = super().write(vals)
+        if set(self._selection_parameters) & set(vals):
+            # the room equipment changed without any space write
+            self.action_recompute_totals()
+        if set(self._piping_parameters) & set(vals):
+            # the whole network is sized again, unless its inputs are incomplete
+            self.filtered("piping_sized").pipe_segment_ids._mark_dirty()
+        return res
+
+    @api.constrains("max_units_per_space")
+    def _check_max_units_per_space(self):
+        for rec in self:
+            if not 1 <= rec.max_units_per_space <= optimizer.MAX_UNITS:
+                raise ValidationError(f"The units per room must be between 1 and {optimizer.MAX_UNITS}.")
+
+    @api.depends("total_heat_load")
     def _compute_totals(self):
         for rec in self:
-            rec.total_heat_load = sum(rec.space_ids.mapped("heat_load"))
             rec.total_heat_load_kw = rec.total_heat_load / 1000
-            rec.total_heating_area = sum(rec.space_ids.mapped("area"))
 
-    @api.depends("total_heat_load_kw")
+    def _get_boiler_plants(self, boilers):
+        return boilers.plants(plant.boiler_efficiency, self.plant_max_units or 1)
+
+    @api.depends("total_heat_load_kw", "boiler_redundancy", "plant_ranking", "plant_max_units")
     def _compute_suggested_boiler(self):
+        boilers = self.env["hvac.capacity.index"]._get_catalog("hvac.boiler")
         for rec in self:
+            best = False
             if rec.total_heat_load_kw:
-                boiler = self.env["hvac.boiler"].search([
-                    ('kw_output', '>=', rec.total_heat_load_kw), ('active', '=', True)
-                ], order='kw_output asc', limit=1)
-                rec.suggested_boiler_id = boiler.id if boiler else False
+                # Best staged plant: the load may be shared by several units
+                best = rec._get_boiler_plants(boilers).best(
+                    rec.total_heat_load_kw, rec.boiler_redundancy, rec.plant_ranking or 'price',
+                )
+            rec.suggested_boiler_id = best.unit_id if best else False
+
+    @api.depends("boiler_id", "total_heat_load_kw", "boiler_redundancy")
+    def _compute_suggested_boiler_qty(self):
+        for rec in self:
+            if rec.boiler_id and rec.boiler_id.kw_output:
+                duty_qty = loads.units_needed(rec.total_heat_load_kw, rec.boiler_id.kw_output)
+                rec.suggested_boiler_qty = duty_qty + 1 if rec.boiler_redundancy else duty_qty
             else:
-                rec.suggested_boiler_id = False
+                rec.suggested_boiler_qty = 1
+
+    @api.depends("suggested_boiler_qty")
+    def _compute_boiler_qty(self):
+        for rec in self:
+            rec.boiler_qty = max(rec.boiler_qty, rec.suggested_boiler_qty)
+
+    @api.depends("total_heat_load_kw", "boiler_redundancy", "plant_ranking", "plant_max_units")
+    def _compute_boiler_options(self):
+        boilers = self.env["hvac.capacity.index"]._get_catalog("hvac.boiler")
+        for rec in self:
+            options = []
+            if rec.total_heat_load_kw:
+                options = rec._get_boiler_plants(boilers).options(
+                    rec.total_heat_load_kw, rec.boiler_redundancy, rec.plant_ranking or 'price',
+                )
+            rec.boiler_options = rec._describe_plant_options(boilers, options, "efficiency {:.0%}") or False
 
     @api.depends("suggested_boiler_id", "selected_boiler_id")
     def _compute_final_boiler(self):
         for rec in self:
             rec.boiler_id = rec.selected_boiler_id or rec.suggested_boiler_id
 
-    @api.depends("boiler_id", "boiler_qty", "space_ids.radiator_subtotal", "space_ids.ufh_subtotal", "space_ids.thermostat_subtotal", "equipment_discount")
+    @api.depends("boiler_id", "boiler_qty", "radiator_total", "ufh_total", "thermostat_total", "equipment_discount")
     def _compute_equipment_totals(self):
         for rec in self:
             rec.boiler_price = (rec.boiler_id.price or 0) * (rec.boiler_qty or 1)
-            radiators_total = sum(rec.space_ids.mapped("radiator_subtotal"))
-            rec.ufh_total = sum(rec.space_ids.mapped("ufh_subtotal"))
-            rec.thermostat_count = sum(rec.space_ids.mapped("thermostat_qty"))
-            rec.thermostat_total = sum(rec.space_ids.mapped("thermostat_subtotal"))
-            rec.equipment_subtotal = rec.boiler_price + radiators_total + rec.ufh_total + rec.thermostat_total
+            rec.equipment_subtotal = rec.boiler_price + rec.radiator_total + rec.ufh_total + rec.thermostat_total
             discount = rec.equipment_discount or 0
             rec.equipment_total = rec.equipment_subtotal * (1 - discount / 100)
 
-    @api.depends("piping_line_ids.subtotal", "piping_discount")
-    def _compute_piping_total(self):
+    # Piping
+    def _get_pipes(self):
+        """Pipes of the project material priced per meter, for the sizing
+        (none when the material has no such pipe)."""
+        self.ensure_one()
+        materials = self.env["hvac.heating.piping.material"].search_read([
+            ('material_type', '=', self.pipe_material_type),
+            ('unit', '=', 'meter'),
+            ('diameter', '>', 0),
+        ], ["name", "diameter", "material_type", "price_per_unit"], load=None)
+        pipes = [
+            hydronic.Pipe(row["id"], row["diameter"], hydronic.ROUGHNESS[row["material_type"]], row["price_per_unit"])
+            for row in materials
+        ]
+        return pipes, {row["id"]: row for row in materials}
+
+    def action_size_piping(self):
+        """Size every pipe segment from the heat load of the emitters it
+        feeds, find the index circuit, and replace the generated piping lines
+        with the resulting pipe lengths (supply and return)."""
+        action = False
+        for project in self:
+            action = project._size_piping() or action
+        return action
+
+    def _resize_dirty_networks(self):
+        for project in self.filtered("piping_sized"):
+            project._size_piping(incremental=True)
+
+    def _size_piping(self, incremental=False):
+        """Size the pipe network of ``self``; ``incremental`` only re-sizes
+        the dirty segments and the segments upstream of them, starting from
+        the stored results of the others."""
+        self.ensure_one()
+        segments = self.pipe_segment_ids
+        if not segments:
+            if incremental:
+                self._sync_generated_lines('piping_line_ids', ['material_id'], [])
+                return
+            raise UserError("Please define the pipe segments of the network first.")
+        pipes, materials = self._get_pipes()
+        if not pipes:
+            if incremental:
+                # the segments stay dirty until a pipe is available
+                return
+            raise UserError("No pipe of the selected material has a diameter and a price per meter.")
+        rows = segments.read([
+            "parent_id", "length", "fitting_allowance", "dirty", "heat_load", "flow_m3h", "material_id",
+            "velocity", "pressure_gradient", "pressure_drop",
+        ], load=None)
+        previous = dirty = None
+        resize = segments.ids
+        if incremental:
+            previous = {
+                row["id"]: hydronic.SegmentResult(
+                    row["heat_load"], row["flow_m3h"], row["material_id"] or 0, row["velocity"],
+                    row["pressure_gradient"], row["pressure_drop"] * 1000, 0,
+                )
+                for row in rows
+            }
+            dirty = [row["id"] for row in rows if row["dirty"]]
+            resize = hydronic.upstream({row["id"]: row["parent_id"] for row in rows}, dirty)
+        heat_loads = {
+            segment.id: heat_load
+            for segment, heat_load in self.env["hvac.heating.space"]._read_group(
+                [('pipe_segment_id', 'in', list(resize))], ['pipe_segment_id'], ['heat_load:sum'],
+            )
+        } if resize else {}
+        network = {row["id"]: dict(row, heat_load=heat_loads.get(row["id"], 0)) for row in rows}
+        result = hydronic.solve(
+            network, pipes, self.pipe_delta_t, self.pipe_max_velocity, self.pipe_max_gradient,
+            previous=previous, dirty=dirty or (),
+        )
+
+        values = {}
+        for segment_id in result.resized:
+            res = result.segments[segment_id]
+            values[segment_id] = {
+                'heat_load': res.heat_load,
+                'flow_m3h': res.flow,
+                'material_id': res.pipe_id or False,
+                'velocity': res.velocity,
+                'pressure_gradient': res.gradient,
+                'pressure_drop': res.pressure_drop / 1000,
+                'unsized': segment_id in result.unsized,
+                'dirty': False,
+            }
+        self._write_by_id(segments._name, values, {row["id"]: row for row in rows})
+
+        lengths = dict.fromkeys(materials, 0.0)
+        for segment_id, res in result.segments.items():
+            if res.pipe_id in lengths:
+                # supply and return
+                lengths[res.pipe_id] += 2 * (network[segment_id]["length"] or 0)
+        self._sync_generated_lines('piping_line_ids', ['material_id'], [{
+            'name': f"{materials[pipe_id]['name']} Ø{materials[pipe_id]['diameter']:.0f} mm",
+            'material_id': pipe_id,
+            'unit': 'Meter',
+            'quantity': round(length, 1),
+            'unit_price': materials[pipe_id]["price_per_unit"],
+        } for pipe_id, length in lengths.items() if length])
+        self.write({
+            'index_pressure_drop': result.index_pressure_drop / 1000,
+            'pump_head': result.index_pressure_drop / (hydronic.WATER_DENSITY * 9.81),
+            'pipe_index_segment_id': result.index_path[-1] if result.index_path else False,
+            'piping_sized': True,
+        })
+        if result.unsized and not incremental:
+            return {
+                'type': 'ir.actions.client',
+                'tag': 'display_notification',
+                'params': {
+                    'title': "Piping",
+                    'message': "No pipe carries the flow of: %s. Add larger pipes or relax the limits."
+                               % ", ".join(segments.browse(result.unsized).mapped("name")),
+                    'type': 'warning',
+                    'sticky': True,
+                },
+            }
+
+    @api.depends("piping_total", "piping_discount")
+    def _compute_piping_total_after_discount(self):
         for rec in self:
-            rec.piping_total = sum(rec.piping_line_ids.mapped("subtotal"))
             discount = rec.piping_discount or 0
             rec.piping_total_after_discount = rec.piping_total * (1 - discount / 100)
 
@@ -138,62 +343,61 @@ class HVACHeatingProject(models.Model):
     def action_confirm(self):
         self.write({'state': 'confirmed'})
 
-    def action_create_quotation(self):
-        self.ensure_one()
-        if not self.customer_id:
-            raise UserError("Please select a customer first.")
-        
-        order_lines = []
-        
-        if self.boiler_id:
-            order_lines.append((0, 0, {
-                "name": f"{self.boiler_id.name} ({self.boiler_id.kw_output} kW)",
-                "product_uom_qty": self.boiler_qty or 1,
-                "price_unit": self.boiler_id.price or 0,
-            }))
-        
-        for space in self.space_ids.filtered(lambda s: s.system_type == 'radiator' and s.radiator_id):
-            order_lines.append((0, 0, {
-                "name": f"{space.radiator_id.name} - {space.room_name or 'Room'}",
-                "product_uom_qty": space.radiator_qty or 1,
-                "price_unit": space.radiator_id.price or 0,
-            }))
-        
-        for space in self.space_ids.filtered(lambda s: s.system_type == 'ufh'):
-            order_lines.append((0, 0, {
-                "name": f"Under Floor Heating - {space.room_name or 'Room'}",
-                "product_uom_qty": space.area or 1,
-                "price_unit": space.ufh_price_per_sqm or 1500,
-            }))
-            if space.thermostat_qty:
-                order_lines.append((0, 0, {
-                    "name": f"Room Thermostat - {space.room_name or 'Room'}",
-                    "product_uom_qty": space.thermostat_qty,
-                    "price_unit": space.thermostat_price or 5000,
-                }))
-        
-        for line in self.piping_line_ids:
-            order_lines.append((0, 0, {
-                "name": line.name,
-                "product_uom_qty": line.quantity or 1,
-                "price_unit": line.unit_price or 0,
-            }))
-        
-        sale_order = self.env['sale.order'].create({
-            'partner_id': self.customer_id.id,
-            'origin': self.offer_code,
-            'order_line': order_lines,
-        })
-        
-        self.write({'sale_order_id': sale_order.id, 'state': 'quoted'})
-        
-        return {
-            'type': 'ir.actions.act_window',
-            'res_model': 'sale.order',
-            'res_id': sale_order.id,
-            'view_mode': 'form',
-            'target': 'current',
-        }
+    def _prepare_quotation_lines(self):
+        projects = self.read(["boiler_id", "boiler_qty"], load=None)
+        spaces = self.env["hvac.heating.space"].search_read([
+            ('project_id', 'in', self.ids),
+            '|', '&', ('system_type', '=', 'radiator'), ('radiator_id', '!=', False),
+            ('system_type', '=', 'ufh'),
+        ], [
+            "project_id", "room_name", "system_type", "radiator_id", "radiator_qty",
+            "area", "ufh_price_per_sqm", "thermostat_qty", "thermostat_price",
+        ], load=None)
+        piping_lines = self.env["hvac.heating.piping.line"].search_read([
+            ('project_id', 'in', self.ids),
+        ], ["project_id", "name", "quantity", "unit_price"], load=None)
+
+        boilers = self._read_by_id("hvac.boiler", {p["boiler_id"] for p in projects}, ["name", "kw_output", "price"])
+        radiators = self._read_by_id("hvac.radiator", {s["radiator_id"] for s in spaces}, ["name", "price"])
+
+        order_lines = {}
+        for project in projects:
+            lines = order_lines[project["id"]] = []
+            boiler = boilers.get(project["boiler_id"])
+            if boiler:
+                lines.append(self._quotation_line(
+                    f"{boiler['name']} ({boiler['kw_output']} kW)",
+                    project["boiler_qty"] or 1,
+                    boiler["price"] or 0,
+                ))
+
+        for space in spaces:
+            if space["system_type"] == 'radiator':
+                radiator = radiators[space["radiator_id"]]
+                order_lines[space["project_id"]].append(self._quotation_line(
+                    f"{radiator['name']} - {space['room_name'] or 'Room'}",
+                    space["radiator_qty"] or 1,
+                    radiator["price"] or 0,
+                ))
+
+        for space in spaces:
+            if space["system_type"] == 'ufh':
+                lines = order_lines[space["project_id"]]
+                room_name = space["room_name"] or 'Room'
+                lines.append(self._quotation_line(
+                    f"Under Floor Heating - {room_name}", space["area"] or 1, space["ufh_price_per_sqm"] or 1500,
+                ))
+                if space["thermostat_qty"]:
+                    lines.append(self._quotation_line(
+                        f"Room Thermostat - {room_name}", space["thermostat_qty"], space["thermostat_price"] or 5000,
+                    ))
+
+        for line in piping_lines:
+            order_lines[line["project_id"]].append(self._quotation_line(
+                line["name"], line["quantity"] or 1, line["unit_price"] or 0,
+            ))
+
+        return order_lines
 
     def action_view_quotation(self):
         self.ensure_one()
@@ -1,12 +1,29 @@
 from odoo import models, fields, api
-import math
 
+from ...engine import loads, selection
+from ..hvac_perf_stat import instrument_methods
 
+
+@instrument_methods
 class HVACHeatingSpace(models.Model):
     _name = "hvac.heating.space"
+    _inherit = ["hvac.space.mixin"]
     _description = "Heating Space/Room"
     _order = "floor_sequence, sequence, id"
 
+    _project_totals = {
+        'total_heat_load': 'heat_load',
+        'total_heating_area': 'area',
+        'radiator_total': 'radiator_subtotal',
+        'ufh_total': 'ufh_subtotal',
+        'thermostat_total': 'thermostat_subtotal',
+        'thermostat_count': 'thermostat_qty',
+    }
+    _network_fields = ('pipe_segment_id', 'heat_load')
+
+    _radiator_combination_step = 25  # W, precision of the radiator combination table
+    _ufh_watt_per_sqm = 80  # load per m² set when a room is switched to UFH
+
     sequence = fields.Integer(string="Sequence", default=10)
     
     project_id = fields.Many2one(
@@ -73,6 +90,15 @@ class HVACHeatingSpace(models.Model):
     radiator_qty = fields.Integer(string="Radiator Qty", default=1)
     radiator_unit_price = fields.Float(string="Radiator Unit Price", related="radiator_id.price", readonly=True)
     radiator_subtotal = fields.Float(string="Radiator Subtotal", compute="_compute_radiator_subtotal", store=True)
+    radiator_combination = fields.Char(
+        string="Cheapest Radiator Mix", compute="_compute_radiator_combination", store=True,
+        help="Advisory: cheapest mix of models covering the load. The room is priced and quoted "
+             "with the single Radiator model and quantity.",
+    )
+    radiator_combination_cost = fields.Float(
+        string="Cheapest Radiator Mix Cost", compute="_compute_radiator_combination", store=True,
+        help="Advisory: price of the cheapest mix, to compare with the subtotal of the room.",
+    )
 
     # UFH
     ufh_price_per_sqm = fields.Float(string="UFH Price/m²", default=1500)
@@ -86,6 +112,12 @@ class HVACHeatingSpace(models.Model):
     # Space Subtotal
     space_subtotal = fields.Float(string="Space Subtotal", compute="_compute_space_subtotal", store=True)
 
+    # Piping
+    pipe_segment_id = fields.Many2one(
+        "hvac.heating.pipe.segment", string="Pipe Segment", index="btree_not_null", ondelete="set null",
+        domain="[('project_id', '=', project_id)]", help="Segment at the end of which the emitter of this space is connected.",
+    )
+
     notes = fields.Text(string="Notes")
 
     # Computed Methods
@@ -97,47 +129,46 @@ class HVACHeatingSpace(models.Model):
 
     @api.depends("area", "watt_per_sqm", "load_factor_percent", "qty")
     def _compute_heat_load(self):
-        for rec in self:
-            load_factor = (rec.load_factor_percent or 100) / 100
-            rec.heat_load = (rec.area or 0) * (rec.watt_per_sqm or 100) * load_factor * (rec.qty or 1)
+        heat_loads = loads.heat_loads(
+            self.mapped("area"),
+            self.mapped("watt_per_sqm"),
+            self.mapped("load_factor_percent"),
+            self.mapped("qty"),
+        )
+        for rec, heat_load in zip(self, heat_loads):
+            rec.heat_load = heat_load
+
+    def _get_radiator_constraints(self):
+        """Selection constraints of this space, as passed to the memoised
+        ``engine.selection`` functions after the load."""
+        return (
+            self.is_bathroom,
+            int(self.preferred_height or 680),
+            self._radiator_combination_step,
+            self.project_id.max_units_per_space or 1,
+        )
 
-    @api.depends("heat_load", "system_type", "is_bathroom", "preferred_height")
+    @api.depends("heat_load", "system_type", "is_bathroom", "preferred_height", "project_id.max_units_per_space")
     def _compute_suggested_radiator(self):
+        radiators = self.env["hvac.capacity.index"]._get_catalog("hvac.radiator")
         for rec in self:
             if rec.heat_load and rec.system_type == 'radiator':
-                if rec.is_bathroom:
-                    largest = self.env["hvac.radiator"].search([
-                        ('radiator_type', '=', 'towel'), ('active', '=', True)
-                    ], order='watt_output desc', limit=1)
-                    if largest and rec.heat_load <= largest.watt_output:
-                        radiator = self.env["hvac.radiator"].search([
-                            ('watt_output', '>=', rec.heat_load),
-                            ('radiator_type', '=', 'towel'), ('active', '=', True)
-                        ], order='watt_output asc', limit=1)
-                    else:
-                        radiator = largest
-                else:
-                    preferred_h = int(rec.preferred_height or 680)
-                    largest = self.env["hvac.radiator"].search([
-                        ('radiator_type', '=', 'aluminum'),
-                        ('height', '=', preferred_h), ('active', '=', True)
-                    ], order='watt_output desc', limit=1)
-                    if largest and rec.heat_load <= largest.watt_output:
-                        radiator = self.env["hvac.radiator"].search([
-                            ('watt_output', '>=', rec.heat_load),
-                            ('radiator_type', '=', 'aluminum'),
-                            ('height', '=', preferred_h), ('active', '=', True)
-                        ], order='watt_output asc', limit=1)
-                    else:
-                        radiator = largest
-                    if not radiator:
-                        radiator = self.env["hvac.radiator"].search([
-                            ('radiator_type', '=', 'aluminum'), ('active', '=', True)
-                        ], order='watt_output desc', limit=1)
-                rec.suggested_radiator_id = radiator.id if radiator else False
+                rec.suggested_radiator_id = selection.optimal_radiator(
+                    radiators, rec.heat_load, *rec._get_radiator_constraints(),
+                )
             else:
                 rec.suggested_radiator_id = False
 
+    @api.depends("heat_load", "system_type", "is_bathroom", "preferred_height", "project_id.max_units_per_space")
+    def _compute_radiator_combination(self):
+        radiators = self.env["hvac.capacity.index"]._get_catalog("hvac.radiator")
+        for rec in self:
+            best = False
+            if rec.heat_load and rec.system_type == 'radiator':
+                best = selection.cheapest_radiators(radiators, rec.heat_load, *rec._get_radiator_constraints())
+            rec.radiator_combination = radiators.describe(best) if best else False
+            rec.radiator_combination_cost = best.cost if best else 0
+
     @api.depends("suggested_radiator_id", "selected_radiator_id")
     def _compute_final_radiator(self):
         for rec in self:
@@ -147,7 +178,7 @@ class HVACHeatingSpace(models.Model):
     def _compute_suggested_radiator_qty(self):
         for rec in self:
             if rec.system_type == 'radiator' and rec.radiator_id and rec.radiator_id.watt_output:
-                rec.suggested_radiator_qty = max(1, math.ceil(rec.heat_load / rec.radiator_id.watt_output))
+                rec.suggested_radiator_qty = loads.units_needed(rec.heat_load, rec.radiator_id.watt_output)
             else:
                 rec.suggested_radiator_qty = 1
 
@@ -199,35 +230,21 @@ class HVACHeatingSpace(models.Model):
     @api.onchange("radiator_id")
     def _onchange_radiator_id(self):
         if self.radiator_id and self.heat_load and self.radiator_id.watt_output:
-            self.radiator_qty = max(1, math.ceil(self.heat_load / self.radiator_id.watt_output))
+            self.radiator_qty = loads.units_needed(self.heat_load, self.radiator_id.watt_output)
 
     @api.onchange("preferred_height")
     def _onchange_preferred_height(self):
         if self.system_type == 'radiator' and not self.is_bathroom and self.heat_load:
             self.selected_radiator_id = False
-            preferred_h = int(self.preferred_height or 680)
-            largest = self.env["hvac.radiator"].search([
-                ('radiator_type', '=', 'aluminum'),
-                ('height', '=', preferred_h), ('active', '=', True)
-            ], order='watt_output desc', limit=1)
-            if largest:
-                if self.heat_load <= largest.watt_output:
-                    radiator = self.env["hvac.radiator"].search([
-                        ('watt_output', '>=', self.heat_load),
-                        ('radiator_type', '=', 'aluminum'),
-                        ('height', '=', preferred_h), ('active', '=', True)
-                    ], order='watt_output asc', limit=1)
-                else:
-                    radiator = largest
-                if radiator:
-                    self.suggested_radiator_id = radiator.id
-                    self.radiator_qty = max(1, math.ceil(self.heat_load / radiator.watt_output))
+            self._compute_suggested_radiator()
+            if self.suggested_radiator_id:
+                self.radiator_qty = loads.units_needed(self.heat_load, self.suggested_radiator_id.watt_output)
 
     @api.onchange("system_type")
     def _onchange_system_type(self):
         self.selected_radiator_id = False
         if self.system_type == 'ufh':
-            self.watt_per_sqm = 80
+            self.watt_per_sqm = self._ufh_watt_per_sqm
             self.ufh_price_per_sqm = 1500
         else:
             self.watt_per_sqm = 100
@@ -1,8 +1,11 @@
 from odoo import models, fields, api
+from ..hvac_perf_stat import instrument_methods
 
 
+@instrument_methods
 class HVACRadiator(models.Model):
     _name = "hvac.radiator"
+    _inherit = ["hvac.catalog.mixin"]
     _description = "HVAC Radiator"
     _order = "radiator_type, height, watt_output"
 
@@ -1,12 +1,17 @@
 from odoo import models, fields, api
-from odoo.exceptions import UserError
+from ..hvac_perf_stat import instrument_methods
 
 
+@instrument_methods
 class HVACHotWaterProject(models.Model):
     _name = "hvac.hotwater.project"
+    _inherit = ["hvac.project.mixin"]
     _description = "Hot Water & Pool Heating Project"
     _order = "date desc, id desc"
 
+    _offer_report = "hvac_calculation.action_report_hotwater_project"
+    _report_child_fields = ('space_ids', 'equipment_line_ids')
+
     name = fields.Char(string="Project Name", required=True)
     customer_id = fields.Many2one("res.partner", string="Customer")
     attention_to = fields.Char(string="Attention To")
@@ -20,19 +25,19 @@ class HVACHotWaterProject(models.Model):
     # Spaces / Usage Points
     space_ids = fields.One2many("hvac.hotwater.space", "project_id", string="Usage Points")
 
-    # Totals
-    total_demand_liters = fields.Float(string="Total Daily Demand (L)", compute="_compute_totals", store=True)
-    total_peak_flow = fields.Float(string="Total Peak Flow (L/min)", compute="_compute_totals", store=True)
-    total_pool_volume = fields.Float(string="Total Pool Volume (m³)", compute="_compute_totals", store=True)
-    total_pool_heating_kw = fields.Float(string="Total Pool Heating (kW)", compute="_compute_totals", store=True)
+    # Totals (maintained incrementally by the spaces, see hvac.space.mixin)
+    total_demand_liters = fields.Float(string="Total Daily Demand (L)", readonly=True, copy=False)
+    total_peak_flow = fields.Float(string="Total Peak Flow (L/min)", readonly=True, copy=False)
+    total_pool_volume = fields.Float(string="Total Pool Volume (m³)", readonly=True, copy=False)
+    total_pool_heating_kw = fields.Float(string="Total Pool Heating (kW)", readonly=True, copy=False)
 
     # Additional Equipment
     equipment_line_ids = fields.One2many("hvac.hotwater.equipment.line", "project_id", string="Additional Equipment")
     equipment_line_total = fields.Float(string="Additional Equipment Total", compute="_compute_equipment_line_total", store=True)
 
     # Pricing
-    heater_total = fields.Float(string="Water Heater Total", compute="_compute_equipment_totals", store=True)
-    pool_heater_total = fields.Float(string="Pool Heater Total", compute="_compute_equipment_totals", store=True)
+    heater_total = fields.Float(string="Water Heater Total", readonly=True, copy=False)
+    pool_heater_total = fields.Float(string="Pool Heater Total", readonly=True, copy=False)
     equipment_subtotal = fields.Float(string="Equipment Subtotal", compute="_compute_equipment_totals", store=True)
     equipment_discount = fields.Float(string="Equipment Discount (%)", default=0)
     equipment_total = fields.Float(string="Equipment Total", compute="_compute_equipment_totals", store=True)
@@ -67,19 +72,9 @@ class HVACHotWaterProject(models.Model):
                 vals['offer_code'] = self.env['ir.sequence'].next_by_code('hvac.hotwater.project') or 'New'
         return super().create(vals_list)
 
-    @api.depends("space_ids.demand_liters_per_day", "space_ids.peak_flow_lpm", "space_ids.pool_volume", "space_ids.pool_heating_load_kw")
-    def _compute_totals(self):
-        for rec in self:
-            rec.total_demand_liters = sum(rec.space_ids.mapped("demand_liters_per_day"))
-            rec.total_peak_flow = sum(rec.space_ids.mapped("peak_flow_lpm"))
-            rec.total_pool_volume = sum(rec.space_ids.filtered(lambda s: s.space_type in ('pool', 'jacuzzi')).mapped("pool_volume"))
-            rec.total_pool_heating_kw = sum(rec.space_ids.mapped("pool_heating_load_kw"))
-
-    @api.depends("space_ids.heater_subtotal", "space_ids.pool_heater_subtotal", "equipment_line_total", "equipment_discount")
+    @api.depends("heater_total", "pool_heater_total", "equipment_line_total", "equipment_discount")
     def _compute_equipment_totals(self):
         for rec in self:
-            rec.heater_total = sum(rec.space_ids.mapped("heater_subtotal"))
-            rec.pool_heater_total = sum(rec.space_ids.mapped("pool_heater_subtotal"))
             rec.equipment_subtotal = rec.heater_total + rec.pool_heater_total + rec.equipment_line_total
             discount = rec.equipment_discount or 0
             rec.equipment_total = rec.equipment_subtotal * (1 - discount / 100)
@@ -109,49 +104,40 @@ class HVACHotWaterProject(models.Model):
     def action_confirm(self):
         self.write({'state': 'confirmed'})
 
-    def action_create_quotation(self):
-        self.ensure_one()
-        if not self.customer_id:
-            raise UserError("Please select a customer first.")
-        
-        order_lines = []
-        
-        for space in self.space_ids:
-            if space.heater_id:
-                order_lines.append((0, 0, {
-                    "name": f"{space.heater_id.name} - {space.name or space.space_type}",
-                    "product_uom_qty": space.heater_qty or 1,
-                    "price_unit": space.heater_id.price or 0,
-                }))
-            if space.pool_heater_id:
-                order_lines.append((0, 0, {
-                    "name": f"{space.pool_heater_id.name} - {space.name or 'Pool'}",
-                    "product_uom_qty": 1,
-                    "price_unit": space.pool_heater_id.price or 0,
-                }))
-        
-        for line in self.equipment_line_ids:
-            order_lines.append((0, 0, {
-                "name": line.name,
-                "product_uom_qty": line.quantity or 1,
-                "price_unit": line.unit_price or 0,
-            }))
-        
-        sale_order = self.env['sale.order'].create({
-            'partner_id': self.customer_id.id,
-            'origin': self.offer_code,
-            'order_line': order_lines,
-        })
-        
-        self.write({'sale_order_id': sale_order.id, 'state': 'quoted'})
-        
-        return {
-            'type': 'ir.actions.act_window',
-            'res_model': 'sale.order',
-            'res_id': sale_order.id,
-            'view_mode': 'form',
-            'target': 'current',
-        }
+    def _prepare_quotation_lines(self):
+        spaces = self.env["hvac.hotwater.space"].search_read([
+            ('project_id', 'in', self.ids),
+            '|', ('heater_id', '!=', False), ('pool_heater_id', '!=', False),
+        ], ["project_id", "name", "space_type", "heater_id", "heater_qty", "pool_heater_id"], load=None)
+        equipment_lines = self.env["hvac.hotwater.equipment.line"].search_read([
+            ('project_id', 'in', self.ids),
+        ], ["project_id", "name", "quantity", "unit_price"], load=None)
+
+        heaters = self._read_by_id("hvac.water.heater", {s["heater_id"] for s in spaces}, ["name", "price"])
+        pool_heaters = self._read_by_id("hvac.pool.heater", {s["pool_heater_id"] for s in spaces}, ["name", "price"])
+
+        order_lines = {project.id: [] for project in self}
+        for space in spaces:
+            lines = order_lines[space["project_id"]]
+            heater = heaters.get(space["heater_id"])
+            if heater:
+                lines.append(self._quotation_line(
+                    f"{heater['name']} - {space['name'] or space['space_type']}",
+                    space["heater_qty"] or 1,
+                    heater["price"] or 0,
+                ))
+            pool_heater = pool_heaters.get(space["pool_heater_id"])
+            if pool_heater:
+                lines.append(self._quotation_line(
+                    f"{pool_heater['name']} - {space['name'] or 'Pool'}", 1, pool_heater["price"] or 0,
+                ))
+
+        for line in equipment_lines:
+            order_lines[line["project_id"]].append(self._quotation_line(
+                line["name"], line["quantity"] or 1, line["unit_price"] or 0,
+            ))
+
+        return order_lines
 
     def action_view_quotation(self):
         self.ensure_one()
@@ -173,6 +159,7 @@ class HVACHotWaterProject(models.Model):
         self.write({'state': 'done'})
 
 
+@instrument_methods
 class HVACHotWaterEquipmentLine(models.Model):
     _name = "hvac.hotwater.equipment.line"
     _description = "Hot Water Equipment Line"
@@ -1,12 +1,25 @@
 from odoo import models, fields, api
-import math
 
+from ...engine import loads
+from ..hvac_perf_stat import instrument_methods
 
+
+@instrument_methods
 class HVACHotWaterSpace(models.Model):
     _name = "hvac.hotwater.space"
+    _inherit = ["hvac.space.mixin"]
     _description = "Hot Water Usage Point"
     _order = "sequence, id"
 
+    _project_totals = {
+        'total_demand_liters': 'demand_liters_per_day',
+        'total_peak_flow': 'peak_flow_lpm',
+        'total_pool_volume': 'pool_volume',
+        'total_pool_heating_kw': 'pool_heating_load_kw',
+        'heater_total': 'heater_subtotal',
+        'pool_heater_total': 'pool_heater_subtotal',
+    }
+
     sequence = fields.Integer(string="Sequence", default=10)
     
     project_id = fields.Many2one(
@@ -71,64 +84,43 @@ class HVACHotWaterSpace(models.Model):
     # Computed Methods
     @api.depends("space_type", "shower_count", "bathtub_count", "sink_count", "qty")
     def _compute_demand(self):
-        # Standard hot water demand per fixture (liters/day)
-        DEMAND = {
-            'shower': 50,
-            'bathtub': 100,
-            'sink': 20,
-        }
-        for rec in self:
-            if rec.space_type in ('bathroom', 'kitchen', 'laundry'):
-                demand = (
-                    (rec.shower_count or 0) * DEMAND['shower'] +
-                    (rec.bathtub_count or 0) * DEMAND['bathtub'] +
-                    (rec.sink_count or 0) * DEMAND['sink']
-                )
-                rec.demand_liters_per_day = demand * (rec.qty or 1)
-            else:
-                rec.demand_liters_per_day = 0
+        demands = loads.fixture_demands(
+            self.mapped("space_type"),
+            self.mapped("shower_count"),
+            self.mapped("bathtub_count"),
+            self.mapped("sink_count"),
+            self.mapped("qty"),
+        )
+        for rec, demand in zip(self, demands):
+            rec.demand_liters_per_day = demand
 
     @api.depends("shower_count", "bathtub_count", "sink_count")
     def _compute_peak_flow(self):
-        # Peak flow rates (L/min)
-        FLOW = {
-            'shower': 10,
-            'bathtub': 15,
-            'sink': 5,
-        }
-        for rec in self:
-            rec.peak_flow_lpm = (
-                (rec.shower_count or 0) * FLOW['shower'] +
-                (rec.bathtub_count or 0) * FLOW['bathtub'] +
-                (rec.sink_count or 0) * FLOW['sink']
-            )
+        flows = loads.peak_flows(self.mapped("shower_count"), self.mapped("bathtub_count"), self.mapped("sink_count"))
+        for rec, flow in zip(self, flows):
+            rec.peak_flow_lpm = flow
 
     @api.depends("pool_length", "pool_width", "pool_depth")
     def _compute_pool_dimensions(self):
-        for rec in self:
-            rec.pool_area = (rec.pool_length or 0) * (rec.pool_width or 0)
-            rec.pool_volume = rec.pool_area * (rec.pool_depth or 1.5)
+        areas, volumes = loads.pool_dimensions_batch(
+            self.mapped("pool_length"), self.mapped("pool_width"), self.mapped("pool_depth"),
+        )
+        for rec, area, volume in zip(self, areas, volumes):
+            rec.pool_area = area
+            rec.pool_volume = volume
 
     @api.depends("pool_volume", "space_type")
     def _compute_pool_heating(self):
-        # Pool heating load calculation
-        # Approximate: 1 kW per 5 m³ for initial heating
-        for rec in self:
-            if rec.space_type in ('pool', 'jacuzzi') and rec.pool_volume:
-                rec.pool_heating_load_kw = rec.pool_volume / 5
-            else:
-                rec.pool_heating_load_kw = 0
+        heating_kws = loads.pool_heating_kws(self.mapped("space_type"), self.mapped("pool_volume"))
+        for rec, heating_kw in zip(self, heating_kws):
+            rec.pool_heating_load_kw = heating_kw
 
     @api.depends("demand_liters_per_day", "space_type")
     def _compute_suggested_heater(self):
+        heaters = self.env["hvac.capacity.index"]._get_catalog("hvac.water.heater").index()
         for rec in self:
             if rec.space_type not in ('pool', 'jacuzzi') and rec.demand_liters_per_day:
-                # Find suitable water heater
-                heater = self.env["hvac.water.heater"].search([
-                    ('capacity_liters', '>=', rec.demand_liters_per_day * 0.5),  # Half daily demand as storage
-                    ('active', '=', True)
-                ], order='capacity_liters asc', limit=1)
-                rec.suggested_heater_id = heater.id if heater else False
+                rec.suggested_heater_id = heaters.smallest_covering(loads.heater_storage(rec.demand_liters_per_day))
             else:
                 rec.suggested_heater_id = False
 
@@ -139,13 +131,10 @@ class HVACHotWaterSpace(models.Model):
 
     @api.depends("pool_heating_load_kw", "space_type", "pool_volume")
     def _compute_suggested_pool_heater(self):
+        pool_heaters = self.env["hvac.capacity.index"]._get_catalog("hvac.pool.heater").index()
         for rec in self:
             if rec.space_type in ('pool', 'jacuzzi') and rec.pool_heating_load_kw:
-                heater = self.env["hvac.pool.heater"].search([
-                    ('heating_capacity_kw', '>=', rec.pool_heating_load_kw),
-                    ('active', '=', True)
-                ], order='heating_capacity_kw asc', limit=1)
-                rec.suggested_pool_heater_id = heater.id if heater else False
+                rec.suggested_pool_heater_id = pool_heaters.smallest_covering(rec.pool_heating_load_kw)
             else:
                 rec.suggested_pool_heater_id = False
 
@@ -169,6 +158,12 @@ class HVACHotWaterSpace(models.Model):
         for rec in self:
             rec.space_subtotal = rec.heater_subtotal + rec.pool_heater_subtotal
 
+    def _get_project_total_values(self):
+        values = super()._get_project_total_values()
+        if self.space_type not in ('pool', 'jacuzzi'):
+            values['total_pool_volume'] = 0
+        return values
+
     # Onchange
     @api.onchange("space_type")
     def _onchange_space_type(self):
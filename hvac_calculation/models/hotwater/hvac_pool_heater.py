@@ -1,8 +1,12 @@
 from odoo import models, fields, api
+from ...engine import loads
+from ..hvac_perf_stat import instrument_methods
 
 
+@instrument_methods
 class HVACPoolHeater(models.Model):
     _name = "hvac.pool.heater"
+    _inherit = ["hvac.catalog.mixin"]
     _description = "Pool Heater"
     _order = "heating_capacity_kw asc"
 
@@ -44,7 +48,7 @@ class HVACPoolHeater(models.Model):
     @api.depends("heating_capacity_kw")
     def _compute_capacity_btu(self):
         for rec in self:
-            rec.heating_capacity_btu = rec.heating_capacity_kw * 3412 if rec.heating_capacity_kw else 0
+            rec.heating_capacity_btu = loads.kw_to_btu(rec.heating_capacity_kw)
 
     def name_get(self):
         result = []
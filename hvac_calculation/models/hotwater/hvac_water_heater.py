@@ -1,8 +1,11 @@
-from odoo import models, fields, api
+from odoo import models, fields
+from ..hvac_perf_stat import instrument_methods
 
 
+@instrument_methods
 class HVACWaterHeater(models.Model):
     _name = "hvac.water.heater"
+    _inherit = ["hvac.catalog.mixin"]
     _description = "Hot Water Heater"
     _order = "capacity_liters asc"
 
@@ -0,0 +1,62 @@
+from odoo import models, api, tools
+
+from ..engine.memo import selection_memo
+from ..engine.selection import EquipmentCatalog
+
+
+class HVACCatalogMixin(models.AbstractModel):
+    _name = "hvac.catalog.mixin"
+    _description = "HVAC Equipment Catalog Mixin"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+
+class HVACCapacityIndex(models.AbstractModel):
+    _name = "hvac.capacity.index"
+    _description = "HVAC Equipment Capacity Index"
+
+    # model: (capacity field, other fields kept on the cached rows)
+    _catalogs = {
+        "hvac.fcu": ("cooling_capacity_kw", ["name", "fcu_type", "price"]),
+        "hvac.chiller": ("cooling_capacity_kw", ["name", "chiller_type", "price", "cop", "eer"]),
+        "hvac.boiler": ("kw_output", ["name", "boiler_type", "price", "efficiency"]),
+        "hvac.radiator": ("watt_output", ["name", "radiator_type", "height", "price"]),
+        "hvac.water.heater": ("capacity_liters", ["heater_type", "price"]),
+        "hvac.pool.heater": ("heating_capacity_kw", ["heater_type", "price"]),
+    }
+
+    @api.model
+    @tools.ormcache("model_name")
+    def _get_catalog(self, model_name):
+        """Active rows of ``model_name``, cached per database.
+
+        The catalogs almost never change, so the rows are kept in the registry
+        cache and only reloaded after a create/write/unlink on the catalog
+        model (see ``hvac.catalog.mixin``), which clears the cache in every
+        worker. The returned catalog is shared: treat it as read-only.
+        """
+        capacity_field, other_fields = self._catalogs[model_name]
+        rows = self.env[model_name].sudo().search_read(
+            [('active', '=', True)],
+            ["id", capacity_field] + other_fields,
+        )
+        return EquipmentCatalog(rows, capacity_field)
+
+    @api.model
+    def get_selection_memo_stats(self):
+        """Hit/miss counters of the selection memo of this worker process."""
+        return selection_memo.stats()
@@ -0,0 +1,78 @@
+from collections import defaultdict
+
+from odoo import models, fields, api
+
+
+class HVACFloorSummaryMixin(models.AbstractModel):
+    """Per-floor subtotals of a project, rebuilt from its spaces with one
+    grouped query over the floors that change (see ``hvac.space.mixin``)."""
+    _name = "hvac.floor.summary.mixin"
+    _description = "HVAC Floor Summary Mixin"
+    _order = "project_id, floor_sequence, id"
+
+    _space_model = None
+    # summary field: space field summed into it
+    _summary_sums = {
+        'room_count': 'qty',
+        'area': 'area',
+        'equipment_cost': 'space_subtotal',
+    }
+
+    floor = fields.Selection(selection="_get_floor_selection", string="Floor", readonly=True)
+    floor_sequence = fields.Integer(string="Floor Sequence", readonly=True)
+    room_count = fields.Integer(string="Rooms", readonly=True)
+    area = fields.Float(string="Area (m²)", readonly=True)
+    equipment_cost = fields.Float(string="Equipment Cost", readonly=True)
+
+    def _get_floor_selection(self):
+        if not self._space_model:
+            return []
+        return self.env[self._space_model]._fields['floor'].selection
+
+    @api.model
+    def _refresh_projects(self, project_ids):
+        """Rebuild all the summaries of the given projects."""
+        project_ids = [project_id for project_id in set(project_ids) if project_id]
+        if project_ids:
+            self._refresh([('project_id', 'in', project_ids)])
+
+    @api.model
+    def _refresh_floors(self, floor_keys):
+        """Rebuild only the summaries of the given ``(project id, floor)``
+        pairs, so editing a space re-sums its floor instead of the project."""
+        floors = defaultdict(set)
+        for project_id, floor in floor_keys:
+            if project_id:
+                floors[project_id].add(floor)
+        if not floors:
+            return
+        domain = ['|'] * (len(floors) - 1)
+        for project_id, project_floors in floors.items():
+            domain += ['&', ('project_id', '=', project_id), ('floor', 'in', list(project_floors))]
+        self._refresh(domain)
+
+    @api.model
+    def _refresh(self, domain):
+        """Rebuild the summaries matching ``domain`` (on project and floor)
+        from a single ``_read_group`` of the matching spaces by (project, floor)."""
+        summaries = self.sudo()
+        existing = {
+            (summary.project_id.id, summary.floor): summary
+            for summary in summaries.search(domain)
+        }
+        vals_list = []
+        for project, floor, floor_sequence, *values in self.env[self._space_model]._read_group(
+            domain,
+            ['project_id', 'floor'],
+            ['floor_sequence:min'] + [f"{fname}:sum" for fname in self._summary_sums.values()],
+        ):
+            vals = dict(zip(self._summary_sums, (value or 0 for value in values)))
+            vals['floor_sequence'] = floor_sequence
+            summary = existing.pop((project.id, floor), None)
+            if summary is None:
+                vals_list.append({'project_id': project.id, 'floor': floor, **vals})
+            elif any(summary[fname] != value for fname, value in vals.items()):
+                summary.write(vals)
+        if vals_list:
+            summaries.create(vals_list)
+        summaries.browse([summary.id for summary in existing.values()]).unlink()
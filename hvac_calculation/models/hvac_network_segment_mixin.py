@@ -0,0 +1,87 @@
+from odoo import models, fields, api
+from odoo.exceptions import ValidationError
+
+
+class HVACNetworkSegmentMixin(models.AbstractModel):
+    """A segment of a pipe or duct network (a tree fed from the plant).
+
+    Edits to a segment, or to the spaces at its end, mark it dirty; the
+    project then re-sizes only the dirty branches and the segments upstream
+    of them (see ``_resize_dirty_networks``). The drops from the plant and
+    the index circuit follow from the sized segments without being stored,
+    so re-sizing one branch writes that branch alone.
+    """
+    _name = "hvac.network.segment.mixin"
+    _description = "HVAC Network Segment Mixin"
+
+    # project field of the last segment of the index circuit
+    _index_segment_field = None
+    # segment fields the sizing reads
+    _network_inputs = ('parent_id', 'length')
+    dirty = fields.Boolean(
+        string="To Size", default=True, readonly=True, copy=False,
+        help="The segment or its rooms changed since the last sizing.",
+    )
+
+    @api.depends("pressure_drop", "parent_id.path_pressure_drop")
+    def _compute_path_pressure_drop(self):
+        drops = {}
+        for rec in self:
+            chain = []
+            segment = rec
+            while segment and segment.id not in drops:
+                chain.append(segment)
+                segment = segment.parent_id
+            drop = drops[segment.id] if segment else 0
+            for segment in reversed(chain):
+                drop += segment.pressure_drop
+                drops[segment.id] = drop
+            rec.path_pressure_drop = drops[rec.id]
+
+    def _compute_is_index(self):
+        index_paths = {}
+        for project in self.project_id:
+            path = set()
+            segment = project[self._index_segment_field]
+            while segment and segment.id not in path:
+                path.add(segment.id)
+                segment = segment.parent_id
+            index_paths[project.id] = path
+        for rec in self:
+            rec.is_index = rec.id in index_paths.get(rec.project_id.id, ())
+
+    @api.constrains("parent_id")
+    def _check_parent_id(self):
+        if self._has_cycle():
+            raise ValidationError("A segment cannot feed itself, even through other segments.")
+        for rec in self:
+            if rec.parent_id and rec.parent_id.project_id != rec.project_id:
+                raise ValidationError("A segment must be fed from a segment of the same project.")
+
+    def _mark_dirty(self):
+        """Mark ``self`` to be sized again, and re-size the dirty branches."""
+        self.filtered(lambda rec: not rec.dirty).write({'dirty': True})
+        self.project_id._resize_dirty_networks()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._mark_dirty()
+        return records
+
+    def write(self, vals):
+        if not set(self._network_inputs) & set(vals):
+            return super().write(vals)
+        # the branch the segment leaves changes too
+        old_parents = self.parent_id
+        res = super().write(vals)
+        (self | old_parents).exists()._mark_dirty()
+        return res
+
+    def unlink(self):
+        parents = self.parent_id - self
+        projects = self.project_id
+        res = super().unlink()
+        parents.exists().filtered(lambda rec: not rec.dirty).write({'dirty': True})
+        projects.exists()._resize_dirty_networks()
+        return res
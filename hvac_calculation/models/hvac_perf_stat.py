@@ -0,0 +1,157 @@
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from odoo import models, fields, api, SUPERUSER_ID
+from odoo.tools import str2bool
+
+_logger = logging.getLogger(__name__)
+
+PERF_PARAM = "hvac_calculation.perf_instrumentation"
+RETENTION_PARAM = "hvac_calculation.perf_retention_days"
+RETENTION_DAYS = 30  # default age after which the stored statistics are removed
+FLUSH_INTERVAL = 60  # seconds between two writes of the collected samples
+
+# {dbname: {(model, method): [(wall time ms, queries, records), ...]}}
+_samples = defaultdict(lambda: defaultdict(list))
+_samples_since = {}
+_samples_lock = threading.Lock()
+
+
+def _is_enabled(env):
+    return str2bool(env['ir.config_parameter'].sudo().get_param(PERF_PARAM, 'False'), False)
+
+
+def _record_sample(env, model_name, method_name, wall_ms, queries, size):
+    dbname = env.cr.dbname
+    now = time.time()
+    with _samples_lock:
+        _samples[dbname][(model_name, method_name)].append((wall_ms, queries, size))
+        since = _samples_since.setdefault(dbname, now)
+        due = now - since >= FLUSH_INTERVAL
+        if due:
+            _samples_since[dbname] = now + FLUSH_INTERVAL  # one flush scheduled at a time
+    if due:
+        registry = env.registry
+        env.cr.postcommit.add(lambda: HVACPerfStat._flush_samples(registry, since))
+
+
+def _instrument(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not _is_enabled(self.env):
+            return method(self, *args, **kwargs)
+        cr = self.env.cr
+        queries = cr.sql_log_count
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            _record_sample(
+                self.env, self._name, method.__name__,
+                (time.perf_counter() - start) * 1000, cr.sql_log_count - queries, len(self),
+            )
+    return wrapper
+
+
+def instrument_methods(cls):
+    """Class decorator wrapping the ``_compute_*``, ``_onchange_*`` and
+    ``action_*`` methods of an HVAC model with the opt-in timing probe.
+
+    The probe only measures when the ``hvac_calculation.perf_instrumentation``
+    system parameter is set; the ``api`` decorator attributes are preserved.
+    """
+    for name, member in list(vars(cls).items()):
+        if inspect.isfunction(member) and name.startswith(('_compute_', '_onchange_', 'action_')):
+            setattr(cls, name, _instrument(member))
+    return cls
+
+
+def _percentile(sorted_values, percent):
+    index = max(0, -(-len(sorted_values) * percent // 100) - 1)
+    return sorted_values[int(index)]
+
+
+class HVACPerfStat(models.Model):
+    _name = "hvac.perf.stat"
+    _description = "HVAC Performance Statistics"
+    _order = "period_end desc, wall_time_p95 desc"
+    _rec_name = "method"
+
+    model_name = fields.Char(string="Model", readonly=True)
+    method = fields.Char(string="Method", readonly=True)
+    period_start = fields.Datetime(string="Period Start", readonly=True)
+    period_end = fields.Datetime(string="Period End", readonly=True)
+
+    call_count = fields.Integer(string="Calls", readonly=True)
+    calls_per_minute = fields.Float(string="Calls / min", readonly=True, aggregator="avg")
+    wall_time_avg = fields.Float(string="Avg Time (ms)", readonly=True, aggregator="avg")
+    wall_time_p50 = fields.Float(string="p50 Time (ms)", readonly=True, aggregator="avg")
+    wall_time_p95 = fields.Float(string="p95 Time (ms)", readonly=True, aggregator="max")
+    wall_time_max = fields.Float(string="Max Time (ms)", readonly=True, aggregator="max")
+    query_avg = fields.Float(string="Avg Queries", readonly=True, aggregator="avg")
+    query_max = fields.Integer(string="Max Queries", readonly=True, aggregator="max")
+    records_avg = fields.Float(string="Avg Records", readonly=True, aggregator="avg")
+
+    @api.model
+    def _prepare_stat_vals(self, model_name, method, samples, period_start, period_end):
+        wall_times = sorted(sample[0] for sample in samples)
+        queries = [sample[1] for sample in samples]
+        minutes = max((period_end - period_start).total_seconds() / 60, 1 / 60)
+        return {
+            'model_name': model_name,
+            'method': method,
+            'period_start': period_start,
+            'period_end': period_end,
+            'call_count': len(samples),
+            'calls_per_minute': len(samples) / minutes,
+            'wall_time_avg': sum(wall_times) / len(wall_times),
+            'wall_time_p50': _percentile(wall_times, 50),
+            'wall_time_p95': _percentile(wall_times, 95),
+            'wall_time_max': wall_times[-1],
+            'query_avg': sum(queries) / len(queries),
+            'query_max': max(queries),
+            'records_avg': sum(sample[2] for sample in samples) / len(samples),
+        }
+
+    @api.autovacuum
+    def _gc_perf_stats(self):
+        """Remove the statistics older than the retention window, in days
+        (``hvac_calculation.perf_retention_days``, 0 keeps them forever)."""
+        param = self.env['ir.config_parameter'].sudo().get_param(RETENTION_PARAM, RETENTION_DAYS)
+        try:
+            days = int(param)
+        except ValueError:
+            _logger.warning("Invalid %s value %r, using %s days", RETENTION_PARAM, param, RETENTION_DAYS)
+            days = RETENTION_DAYS
+        if days <= 0:
+            return
+        limit = fields.Datetime.now() - timedelta(days=days)
+        self.sudo().search([('period_end', '<', limit)]).unlink()
+
+    @staticmethod
+    def _flush_samples(registry, since):
+        """Aggregate the samples collected in this process into stat records,
+        in a transaction of their own."""
+        dbname = registry.db_name
+        with _samples_lock:
+            samples = _samples.pop(dbname, {})
+            _samples_since.pop(dbname, None)
+        if not samples:
+            return
+        period_start = datetime.fromtimestamp(since, timezone.utc).replace(tzinfo=None)
+        period_end = fields.Datetime.now()
+        try:
+            with registry.cursor() as cr:
+                env = api.Environment(cr, SUPERUSER_ID, {})
+                stats = env['hvac.perf.stat']
+                stats.create([
+                    stats._prepare_stat_vals(model_name, method, method_samples, period_start, period_end)
+                    for (model_name, method), method_samples in samples.items()
+                ])
+        except Exception:
+            _logger.exception("Could not store HVAC performance statistics")
@@ -0,0 +1,311 @@
+from odoo import models, fields, api
+from odoo.tools import SQL
+
+DISCIPLINES = [
+    ('cooling', 'Air Conditioning'),
+    ('heating', 'Central Heating'),
+    ('hotwater', 'Hot Water & Pool'),
+]
+
+PROJECT_STATES = [
+    ('draft', 'Draft'),
+    ('confirmed', 'Confirmed'),
+    ('quoted', 'Quotation Created'),
+    ('done', 'Done'),
+    ('cancelled', 'Cancelled'),
+]
+
+
+class HVACMaterializedReport(models.AbstractModel):
+    """Reporting model read from a PostgreSQL materialized view.
+
+    The view is refreshed by cron, and only when one of its source tables
+    changed since the last refresh; ``CONCURRENTLY`` keeps it readable
+    while it is rebuilt. The reports implement ``_query()``, the ``SELECT``
+    of the view, with a unique ``id`` column.
+    """
+    _name = "hvac.materialized.report"
+    _description = "HVAC Materialized Report"
+
+    # models whose tables the view reads
+    _source_models = ()
+
+    def _table_sql(self, model_name):
+        return SQL.identifier(self.env[model_name]._table)
+
+    def init(self):
+        if self._abstract:
+            return
+        cr = self.env.cr
+        table = SQL.identifier(self._table)
+        cr.execute(SQL("DROP MATERIALIZED VIEW IF EXISTS %s CASCADE", table))
+        cr.execute(SQL("CREATE MATERIALIZED VIEW %s AS (%s)", table, self._query()))
+        # required by REFRESH ... CONCURRENTLY
+        cr.execute(SQL(
+            "CREATE UNIQUE INDEX %s ON %s (id)", SQL.identifier(f"{self._table}_id_uniq"), table,
+        ))
+        self.env['ir.config_parameter'].sudo().set_param(self._stamp_param(), self._get_source_stamp())
+
+    def _stamp_param(self):
+        return f"hvac_calculation.{self._table}.source_stamp"
+
+    def _get_source_stamp(self):
+        """Last write and row count of every source table: it changes with
+        any insert, update or delete the view depends on."""
+        self.env.flush_all()
+        self.env.cr.execute(SQL("SELECT %s", SQL(", ").join(
+            SQL("(SELECT row(max(write_date), count(*))::text FROM %s)", self._table_sql(model_name))
+            for model_name in self._source_models
+        )))
+        return repr(self.env.cr.fetchone())
+
+    def _refresh(self, force=False):
+        """Refresh the view if its sources changed. Return whether it did."""
+        stamp = self._get_source_stamp()
+        params = self.env['ir.config_parameter'].sudo()
+        if not force and params.get_param(self._stamp_param()) == stamp:
+            return False
+        self.env.cr.execute(SQL("REFRESH MATERIALIZED VIEW CONCURRENTLY %s", SQL.identifier(self._table)))
+        params.set_param(self._stamp_param(), stamp)
+        self.invalidate_model()
+        return True
+
+    def _materialized_reports(self):
+        return [
+            self.env[model_name]
+            for model_name in self.env.registry["hvac.materialized.report"]._inherit_children
+        ]
+
+    @api.model
+    def _cron_refresh_views(self):
+        for report in self._materialized_reports():
+            report._refresh()
+
+    @api.model
+    def action_refresh_views(self):
+        for report in self._materialized_reports():
+            report._refresh(force=True)
+        return {'type': 'ir.actions.client', 'tag': 'soft_reload'}
+
+
+class HVACPortfolioReport(models.Model):
+    _name = "hvac.portfolio.report"
+    _inherit = ["hvac.materialized.report"]
+    _description = "HVAC Portfolio Analysis"
+    _auto = False
+    _order = "date desc, id desc"
+
+    _source_models = (
+        "hvac.cooling.project", "hvac.heating.project", "hvac.hotwater.project",
+        "hvac.hotwater.space", "hvac.chiller", "hvac.boiler", "hvac.water.heater", "hvac.pool.heater",
+    )
+
+    discipline = fields.Selection(DISCIPLINES, string="Discipline", readonly=True)
+    project_ref = fields.Reference([
+        ('hvac.cooling.project', 'Cooling Project'),
+        ('hvac.heating.project', 'Heating Project'),
+        ('hvac.hotwater.project', 'Hot Water Project'),
+    ], string="Project", readonly=True)
+    name = fields.Char(string="Project Name", readonly=True)
+    offer_code = fields.Char(string="Offer Code", readonly=True)
+    customer_id = fields.Many2one("res.partner", string="Customer", readonly=True)
+    company_id = fields.Many2one("res.company", string="Company", readonly=True)
+    date = fields.Date(string="Date", readonly=True)
+    state = fields.Selection(PROJECT_STATES, string="Status", readonly=True)
+    project_count = fields.Integer(string="Projects", readonly=True)
+    quoted_count = fields.Integer(string="Quoted Projects", readonly=True)
+    installed_kw = fields.Float(string="Installed Capacity (kW)", readonly=True)
+    area = fields.Float(string="Area (m²)", readonly=True)
+    grand_total = fields.Float(string="Grand Total", readonly=True)
+    price_per_sqm = fields.Float(string="Price / m²", readonly=True, aggregator="avg")
+
+    def _query(self):
+        return SQL("""
+            SELECT p.id * 3 AS id, 'cooling' AS discipline, 'hvac.cooling.project,' || p.id AS project_ref,
+                   p.name, p.offer_code, p.customer_id, p.company_id, p.date, p.state,
+                   1 AS project_count, (p.sale_order_id IS NOT NULL)::int AS quoted_count,
+                   coalesce(c.cooling_capacity_kw * p.chiller_qty, 0) AS installed_kw,
+                   coalesce(p.total_cooling_area, 0) AS area,
+                   coalesce(p.grand_total, 0) AS grand_total,
+                   p.grand_total / nullif(p.total_cooling_area, 0) AS price_per_sqm
+              FROM %(cooling)s p
+         LEFT JOIN %(chiller)s c ON c.id = p.chiller_id
+         UNION ALL
+            SELECT p.id * 3 + 1, 'heating', 'hvac.heating.project,' || p.id,
+                   p.name, p.offer_code, p.customer_id, p.company_id, p.date, p.state,
+                   1, (p.sale_order_id IS NOT NULL)::int,
+                   coalesce(b.kw_output * p.boiler_qty, 0),
+                   coalesce(p.total_heating_area, 0),
+                   coalesce(p.grand_total, 0),
+                   p.grand_total / nullif(p.total_heating_area, 0)
+              FROM %(heating)s p
+         LEFT JOIN %(boiler)s b ON b.id = p.boiler_id
+         UNION ALL
+            SELECT p.id * 3 + 2, 'hotwater', 'hvac.hotwater.project,' || p.id,
+                   p.name, p.offer_code, p.customer_id, p.company_id, p.date, p.state,
+                   1, (p.sale_order_id IS NOT NULL)::int,
+                   coalesce(s.installed_kw, 0),
+                   coalesce(s.pool_area, 0),
+                   coalesce(p.grand_total, 0),
+                   p.grand_total / nullif(s.pool_area, 0)
+              FROM %(hotwater)s p
+         LEFT JOIN (
+                SELECT s.project_id,
+                       sum(coalesce(wh.power_kw * coalesce(nullif(s.heater_qty, 0), 1), 0)
+                           + coalesce(ph.heating_capacity_kw, 0)) AS installed_kw,
+                       sum(s.pool_area) AS pool_area
+                  FROM %(hotwater_space)s s
+             LEFT JOIN %(water_heater)s wh ON wh.id = s.heater_id
+             LEFT JOIN %(pool_heater)s ph ON ph.id = s.pool_heater_id
+              GROUP BY s.project_id
+            ) s ON s.project_id = p.id
+        """,
+            cooling=self._table_sql("hvac.cooling.project"),
+            chiller=self._table_sql("hvac.chiller"),
+            heating=self._table_sql("hvac.heating.project"),
+            boiler=self._table_sql("hvac.boiler"),
+            hotwater=self._table_sql("hvac.hotwater.project"),
+            hotwater_space=self._table_sql("hvac.hotwater.space"),
+            water_heater=self._table_sql("hvac.water.heater"),
+            pool_heater=self._table_sql("hvac.pool.heater"),
+        )
+
+    def action_open_project(self):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self.project_ref._name,
+            'res_id': self.project_ref.id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
+
+
+class HVACEquipmentMixReport(models.Model):
+    _name = "hvac.equipment.mix.report"
+    _inherit = ["hvac.materialized.report"]
+    _description = "HVAC Equipment Mix Analysis"
+    _auto = False
+    _order = "date desc, id desc"
+
+    _source_models = (
+        "hvac.cooling.project", "hvac.cooling.space", "hvac.heating.project", "hvac.heating.space",
+        "hvac.hotwater.project", "hvac.hotwater.space", "hvac.chiller", "hvac.ahu", "hvac.fcu",
+        "hvac.boiler", "hvac.radiator", "hvac.water.heater", "hvac.pool.heater",
+    )
+
+    discipline = fields.Selection(DISCIPLINES, string="Discipline", readonly=True)
+    category = fields.Selection([
+        ('chiller', 'Chiller'),
+        ('ahu', 'Air Handling Unit'),
+        ('fcu', 'Fan Coil Unit'),
+        ('boiler', 'Boiler'),
+        ('radiator', 'Radiator'),
+        ('ufh', 'Under Floor Heating'),
+        ('water_heater', 'Water Heater'),
+        ('pool_heater', 'Pool Heater'),
+    ], string="Category", readonly=True)
+    equipment = fields.Char(string="Equipment", readonly=True)
+    project_ref = fields.Reference([
+        ('hvac.cooling.project', 'Cooling Project'),
+        ('hvac.heating.project', 'Heating Project'),
+        ('hvac.hotwater.project', 'Hot Water Project'),
+    ], string="Project", readonly=True)
+    customer_id = fields.Many2one("res.partner", string="Customer", readonly=True)
+    company_id = fields.Many2one("res.company", string="Company", readonly=True)
+    date = fields.Date(string="Date", readonly=True)
+    state = fields.Selection(PROJECT_STATES, string="Status", readonly=True)
+    quantity = fields.Float(string="Quantity", readonly=True)
+    installed_kw = fields.Float(string="Installed Capacity (kW)", readonly=True)
+    amount = fields.Float(string="Amount", readonly=True)
+
+    def _query(self):
+        ahu_field = self.env["hvac.cooling.project"]._fields["ahu_ids"]
+        categories = [key for key, _label in self._fields["category"].selection]
+        # the id is built from the natural key (project, category, unit), so
+        # it does not change when the view is refreshed: the category implies
+        # the discipline, and the unit id takes the 24 low bits, which keeps
+        # the ids within the 53 bits the web client holds exactly
+        return SQL("""
+            SELECT ((m.project_id::bigint * %(category_count)s
+                     + array_position(%(categories)s::varchar[], m.category)) << 24)
+                   + coalesce(m.unit_id, 0) AS id,
+                   m.discipline, m.category, m.equipment,
+                   'hvac.' || m.discipline || '.project,' || m.project_id AS project_ref,
+                   p.customer_id, p.company_id, p.date, p.state,
+                   m.quantity, m.installed_kw, m.amount
+              FROM (
+                SELECT 'cooling' AS discipline, p.id AS project_id, 'chiller' AS category,
+                       c.id AS unit_id, c.name AS equipment,
+                       p.chiller_qty::float AS quantity, c.cooling_capacity_kw * p.chiller_qty AS installed_kw,
+                       p.chiller_price AS amount
+                  FROM %(cooling)s p
+                  JOIN %(chiller)s c ON c.id = p.chiller_id
+             UNION ALL
+                SELECT 'cooling', r.%(ahu_project_col)s, 'ahu', a.id, a.name, 1, a.cooling_capacity_kw, a.price
+                  FROM %(ahu_rel)s r
+                  JOIN %(ahu)s a ON a.id = r.%(ahu_col)s
+             UNION ALL
+                SELECT 'cooling', s.project_id, 'fcu', f.id, f.name, sum(s.fcu_qty),
+                       sum(f.cooling_capacity_kw * s.fcu_qty), sum(s.fcu_subtotal)
+                  FROM %(cooling_space)s s
+                  JOIN %(fcu)s f ON f.id = s.fcu_id
+                 WHERE s.system_type = 'fcu'
+              GROUP BY s.project_id, f.id, f.name
+             UNION ALL
+                SELECT 'heating', p.id, 'boiler', b.id, b.name, p.boiler_qty, b.kw_output * p.boiler_qty, p.boiler_price
+                  FROM %(heating)s p
+                  JOIN %(boiler)s b ON b.id = p.boiler_id
+             UNION ALL
+                SELECT 'heating', s.project_id, 'radiator', r.id, r.name, sum(s.radiator_qty),
+                       sum(r.watt_output * s.radiator_qty) / 1000, sum(s.radiator_subtotal)
+                  FROM %(heating_space)s s
+                  JOIN %(radiator)s r ON r.id = s.radiator_id
+                 WHERE s.system_type = 'radiator'
+              GROUP BY s.project_id, r.id, r.name
+             UNION ALL
+                SELECT 'heating', s.project_id, 'ufh', NULL, 'Under Floor Heating', sum(s.area),
+                       sum(s.heat_load) / 1000, sum(s.ufh_subtotal)
+                  FROM %(heating_space)s s
+                 WHERE s.system_type = 'ufh'
+              GROUP BY s.project_id
+             UNION ALL
+                SELECT 'hotwater', s.project_id, 'water_heater', w.id, w.name, sum(coalesce(nullif(s.heater_qty, 0), 1)),
+                       sum(w.power_kw * coalesce(nullif(s.heater_qty, 0), 1)), sum(s.heater_subtotal)
+                  FROM %(hotwater_space)s s
+                  JOIN %(water_heater)s w ON w.id = s.heater_id
+              GROUP BY s.project_id, w.id, w.name
+             UNION ALL
+                SELECT 'hotwater', s.project_id, 'pool_heater', h.id, h.name, count(*),
+                       sum(h.heating_capacity_kw), sum(s.pool_heater_subtotal)
+                  FROM %(hotwater_space)s s
+                  JOIN %(pool_heater)s h ON h.id = s.pool_heater_id
+              GROUP BY s.project_id, h.id, h.name
+              ) m
+              JOIN (
+                SELECT 'cooling' AS discipline, id, customer_id, company_id, date, state FROM %(cooling)s
+                 UNION ALL
+                SELECT 'heating', id, customer_id, company_id, date, state FROM %(heating)s
+                 UNION ALL
+                SELECT 'hotwater', id, customer_id, company_id, date, state FROM %(hotwater)s
+              ) p ON p.discipline = m.discipline AND p.id = m.project_id
+        """,
+            cooling=self._table_sql("hvac.cooling.project"),
+            cooling_space=self._table_sql("hvac.cooling.space"),
+            heating=self._table_sql("hvac.heating.project"),
+            heating_space=self._table_sql("hvac.heating.space"),
+            hotwater=self._table_sql("hvac.hotwater.project"),
+            hotwater_space=self._table_sql("hvac.hotwater.space"),
+            chiller=self._table_sql("hvac.chiller"),
+            ahu=self._table_sql("hvac.ahu"),
+            ahu_rel=SQL.identifier(ahu_field.relation),
+            ahu_project_col=SQL.identifier(ahu_field.column1),
+            ahu_col=SQL.identifier(ahu_field.column2),
+            fcu=self._table_sql("hvac.fcu"),
+            boiler=self._table_sql("hvac.boiler"),
+            radiator=self._table_sql("hvac.radiator"),
+            water_heater=self._table_sql("hvac.water.heater"),
+            pool_heater=self._table_sql("hvac.pool.heater"),
+            categories=categories,
+            category_count=len(categories),
+        )
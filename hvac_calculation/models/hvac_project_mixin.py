@@ -0,0 +1,355 @@
+import hashlib
+import logging
+from collections import defaultdict
+
+from odoo import models, api
+from odoo.exceptions import UserError
+from odoo.tools import SQL
+from .hvac_perf_stat import instrument_methods
+
+_logger = logging.getLogger(__name__)
+
+
+@instrument_methods
+class HVACProjectMixin(models.AbstractModel):
+    _name = "hvac.project.mixin"
+    _description = "HVAC Project Mixin"
+
+    # xmlid of the offer report, and the one2many fields printed in it
+    _offer_report = None
+    _report_child_fields = ()
+    # stored fields left out of the offer fingerprint
+    _report_ignored_fields = ('create_uid', 'create_date', 'write_uid', 'write_date', 'sale_order_id', 'state')
+    # project total: one2many of the takeoff lines summed into it (see hvac.takeoff.line.mixin)
+    _line_totals = {}
+
+    # Totals
+    def _get_space_totals(self):
+        """Re-sum the totals of ``self`` from all their spaces."""
+        space_model = self.env[self._fields['space_ids'].comodel_name]
+        spaces = space_model.search([('project_id', 'in', self.ids)])
+        totals = spaces._sum_project_totals()
+        return {
+            project.id: {total: totals[project.id][total] for total in space_model._project_totals}
+            for project in self
+        }
+
+    def _get_totals(self):
+        """Re-sum the totals of ``self`` from all their spaces and takeoff lines."""
+        totals = self._get_space_totals()
+        for total, fname in self._line_totals.items():
+            subtotals = dict(self.env[self._fields[fname].comodel_name]._read_group(
+                [('project_id', 'in', self.ids)], ['project_id'], ['subtotal:sum'],
+            ))
+            for project in self:
+                totals[project.id][total] = subtotals.get(project, 0)
+        return totals
+
+    def action_recompute_totals(self):
+        """Rebuild the incrementally maintained totals with a full re-sum."""
+        totals = self._get_totals()
+        for project in self:
+            project.write(totals[project.id])
+        self._refresh_floor_summaries()
+
+    @api.model
+    def _cron_check_totals(self, batch_size=200):
+        """Nightly consistency check of the incrementally maintained totals."""
+        projects = self.search([])
+        fixed = 0
+        for start in range(0, len(projects), batch_size):
+            batch = projects[start:start + batch_size]
+            totals = batch._get_totals()
+            for project in batch:
+                vals = {
+                    total: value for total, value in totals[project.id].items()
+                    if round(project[total] - value, 6)
+                }
+                if vals:
+                    project.write(vals)
+                    fixed += 1
+            batch._refresh_floor_summaries()
+        if fixed:
+            _logger.info("%s: fixed the totals of %s project(s)", self._name, fixed)
+
+    # Networks
+    def _resize_dirty_networks(self):
+        """Re-size the branches of the pipe or duct networks of ``self`` whose
+        segments are marked dirty."""
+
+    def _write_by_id(self, model_name, values_by_id, current=None):
+        """Write ``{id: values}`` to records of ``model_name`` with one
+        ``write`` per distinct set of values; the values equal to those of
+        ``current`` (``{id: row}`` as read) are left out."""
+        groups = defaultdict(list)
+        for id_, vals in values_by_id.items():
+            row = current.get(id_, {}) if current else {}
+            vals = {fname: value for fname, value in vals.items() if fname not in row or row[fname] != value}
+            if vals:
+                groups[tuple(sorted(vals.items()))].append(id_)
+        records = self.env[model_name]
+        for items, ids in groups.items():
+            records.browse(ids).write(dict(items))
+
+    def _sync_generated_lines(self, line_field, key_fields, vals_list):
+        """Bring the generated lines of ``line_field`` in line with
+        ``vals_list``, matched on ``key_fields``: only the lines whose values
+        differ are written, the missing ones are created in one batch and
+        the others removed."""
+        self.ensure_one()
+        lines = self[line_field].filtered("generated")
+        wanted = {tuple(vals.get(fname) or False for fname in key_fields): vals for vals in vals_list}
+        field_names = set(key_fields).union(*vals_list)
+        stale = []
+        for row in lines.read(list(field_names), load=None):
+            vals = wanted.pop(tuple(row[fname] or False for fname in key_fields), None)
+            if vals is None:
+                stale.append(row["id"])
+                continue
+            changed = {fname: value for fname, value in vals.items() if row[fname] != value}
+            if changed:
+                lines.browse(row["id"]).write(changed)
+        if stale:
+            lines.browse(stale).unlink()
+        if wanted:
+            self.env[self._fields[line_field].comodel_name].create([
+                dict(vals, project_id=self.id, generated=True) for vals in wanted.values()
+            ])
+
+    # Floors
+    def _refresh_floor_summaries(self):
+        """Rebuild the per-floor subtotals of ``self``, if the project has any."""
+        field = self._fields.get('floor_summary_ids')
+        if field and self:
+            self.env[field.comodel_name]._refresh_projects(self.ids)
+
+    def get_floor_summaries(self):
+        """Per-floor subtotals of ``self`` as ``{project id: [values]}``, in
+        floor order, read with one query (used by riser and plant sizing and
+        by external clients)."""
+        field = self._fields.get('floor_summary_ids')
+        result = {project.id: [] for project in self}
+        if not field:
+            return result
+        summaries = self.env[field.comodel_name]
+        fnames = [
+            fname for fname, f in summaries._fields.items()
+            if f.store and fname not in self._report_ignored_fields
+        ]
+        for row in summaries.search_read([('project_id', 'in', self.ids)], fnames, load=None):
+            result[row['project_id']].append(row)
+        return result
+
+    # Plant
+    def _describe_plant_options(self, catalog, options, efficiency_format):
+        """One line per plant option, for the plant comparison shown on the form."""
+        lines = []
+        for option in options:
+            standby = " + 1 standby" if option.qty > option.duty_qty else ""
+            lines.append(
+                f"{option.qty} x {catalog.by_id[option.unit_id]['name']}{standby}: "
+                f"{option.capacity:.0f} kW, {option.load_ratio:.0%} load, "
+                f"{efficiency_format.format(option.efficiency)}, {option.cost:,.0f}"
+            )
+        return "\n".join(lines)
+
+    # Offer
+    def _read_report_rows(self, records, references):
+        """Stored values of ``records`` as printed in the offer; the records
+        they refer to are collected in ``references`` (model: ids)."""
+        fnames = [
+            fname for fname, field in records._fields.items()
+            if field.store and field.type != 'binary' and fname not in self._report_ignored_fields
+        ]
+        rows = records.read(fnames, load=None)
+        for fname in fnames:
+            field = records._fields[fname]
+            if field.type not in ('many2one', 'many2many') or field.comodel_name == self._name:
+                continue
+            ids = references[field.comodel_name]
+            for row in rows:
+                value = row[fname]
+                ids.update(value if isinstance(value, list) else [value] if value else [])
+        return rows
+
+    def _get_report_fingerprint(self):
+        """Hash of the offer content: the stored fields of the project (terms
+        HTML included), the rows of its printed lines, and the last update of
+        every record they refer to (equipment, customer, ...). Any write that
+        may change the printed offer changes it.
+
+        The fingerprints found in the ``hvac_offer_fingerprints`` context key
+        (see ``_get_report_fingerprints``) are reused as is.
+        """
+        self.ensure_one()
+        fingerprint = self.env.context.get('hvac_offer_fingerprints', {}).get((self._name, self.id))
+        if fingerprint:
+            return fingerprint
+        references = defaultdict(set)
+        content = [self._name, self._read_report_rows(self, references)]
+        for fname in self._report_child_fields:
+            content.append(self._read_report_rows(self[fname], references))
+        for model_name, ids in sorted(references.items()):
+            records = self.env[model_name].sudo().browse(sorted(ids))
+            content.append((model_name, [(rec.id, str(rec.write_date)) for rec in records.exists()]))
+        return hashlib.sha256(repr(content).encode()).hexdigest()
+
+    def _get_report_fingerprints(self):
+        """Context value fingerprinting each offer of ``self`` once, so that
+        one print hashes the project content once whatever the number of
+        attachment lookups."""
+        fingerprints = dict(self.env.context.get('hvac_offer_fingerprints', {}))
+        for project in self:
+            fingerprints[(project._name, project.id)] = project._get_report_fingerprint()
+        return fingerprints
+
+    def _get_offer_filename(self):
+        self.ensure_one()
+        return (self.offer_code or self.name or "Offer").replace('/', '_')
+
+    def _get_offer_attachment_name(self):
+        """Name of the cached offer PDF (``attachment`` of the offer report).
+
+        It embeds the content fingerprint, so a reprint of an unchanged offer
+        reuses the stored PDF and any change renders a new one.
+        """
+        self.ensure_one()
+        return f"{self._get_offer_filename()}-{self._get_report_fingerprint()[:16]}.pdf"
+
+    def _get_offer_attachment(self):
+        self.ensure_one()
+        return self.env['ir.attachment'].search([
+            ('res_model', '=', self._name),
+            ('res_id', '=', self.id),
+            ('name', '=', self._get_offer_attachment_name()),
+        ], limit=1)
+
+    def _unlink_stale_offer_attachments(self):
+        """Drop the cached offer PDFs rendered from an older content."""
+        for project in self:
+            self.env['ir.attachment'].sudo().search([
+                ('res_model', '=', project._name),
+                ('res_id', '=', project.id),
+                ('name', '=like', f"{project._get_offer_filename()}-%.pdf"),
+                ('name', '!=', project._get_offer_attachment_name()),
+            ]).unlink()
+
+    def action_print_offer_async(self):
+        """Render the offers of ``self`` in the background; each user gets a
+        notification when their PDF is attached to the project."""
+        jobs = self.env['hvac.report.job']._enqueue(self)
+        ready = jobs.filtered(lambda j: j.state == 'done')
+        message = f"{len(jobs) - len(ready)} offer(s) queued for rendering."
+        if ready:
+            message += " Unchanged since last rendering, already attached: %s." % ", ".join(ready.mapped('name'))
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': "Offers",
+                'message': message,
+                'type': 'info',
+                'sticky': False,
+            },
+        }
+
+    # Quotation
+    # Projects define ``_prepare_quotation_lines()``, returning
+    # ``{project id: sale order line commands}`` for every project of the
+    # batch, read with a few ``read``/``search_read`` calls.
+    def _prepare_sale_order_vals_list(self):
+        order_lines = self._prepare_quotation_lines()
+        return [{
+            'partner_id': project.customer_id.id,
+            'origin': project.offer_code,
+            'order_line': order_lines[project.id],
+        } for project in self]
+
+    def _read_by_id(self, model_name, ids, field_names):
+        """Read ``field_names`` of the given records, as ``{id: values}``."""
+        records = self.env[model_name].browse([id_ for id_ in ids if id_])
+        return {row['id']: row for row in records.read(field_names, load=None)}
+
+    def _quotation_line(self, name, quantity, price_unit):
+        return (0, 0, {
+            "name": name,
+            "product_uom_qty": quantity,
+            "price_unit": price_unit,
+        })
+
+    def _filter_quotable(self):
+        """Projects of ``self`` a quotation can be created for: confirmed,
+        with a customer and not quoted yet (as the Create Quotation button)."""
+        return self.filtered(lambda p: p.state == 'confirmed' and p.customer_id and not p.sale_order_id)
+
+    def _mark_quoted(self, sale_orders):
+        """Link each project of ``self`` to the order at the same position
+        and mark the projects quoted.
+
+        The state goes through one ORM ``write``. The links differ per
+        project, so they are set with a single UPDATE instead of one write
+        per project, and the cache and dependents are refreshed after it.
+        """
+        if not self:
+            return
+        self.write({'state': 'quoted'})
+        self.flush_recordset(['sale_order_id'])
+        self.env.cr.execute(SQL(
+            """
+            UPDATE %s AS project
+               SET sale_order_id = link.order_id
+              FROM (VALUES %s) AS link(project_id, order_id)
+             WHERE project.id = link.project_id
+            """,
+            SQL.identifier(self._table),
+            SQL(", ").join(SQL("(%s, %s)", project.id, order.id) for project, order in zip(self, sale_orders)),
+        ))
+        self.invalidate_recordset(['sale_order_id'])
+        self.modified(['sale_order_id'])
+
+    # Actions
+    def action_create_quotation(self):
+        self.ensure_one()
+        if not self.customer_id:
+            raise UserError("Please select a customer first.")
+
+        sale_order = self.env['sale.order'].create(self._prepare_sale_order_vals_list())
+
+        self.write({'sale_order_id': sale_order.id, 'state': 'quoted'})
+
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': 'sale.order',
+            'res_id': sale_order.id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
+
+    def action_create_quotations(self):
+        """Create the quotations of a whole selection of projects at once.
+
+        Projects that are not confirmed, have no customer or are already
+        quoted are skipped and listed in the returned notification.
+        """
+        projects = self._filter_quotable()
+        skipped = self - projects
+
+        sale_orders = self.env['sale.order'].create(projects._prepare_sale_order_vals_list())
+        projects._mark_quoted(sale_orders)
+
+        message = f"{len(sale_orders)} quotation(s) created."
+        if skipped:
+            message += " Skipped (not confirmed, no customer or already quoted): %s." % ", ".join(
+                skipped.mapped(lambda p: p.offer_code or p.name)
+            )
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': "Quotations",
+                'message': message,
+                'type': 'warning' if skipped else 'success',
+                'sticky': bool(skipped),
+                'next': {'type': 'ir.actions.client', 'tag': 'soft_reload'},
+            },
+        }
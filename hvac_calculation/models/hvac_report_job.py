@@ -0,0 +1,146 @@
+import logging
+import time
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+
+class HVACReportJob(models.Model):
+    _name = "hvac.report.job"
+    _description = "HVAC Offer Rendering Job"
+    _order = "id desc"
+
+    name = fields.Char(string="Offer", required=True, readonly=True)
+    res_model = fields.Char(string="Project Model", required=True, readonly=True)
+    res_id = fields.Many2oneReference(string="Project", model_field="res_model", required=True, readonly=True)
+    report_xmlid = fields.Char(string="Report", required=True, readonly=True)
+    fingerprint = fields.Char(string="Fingerprint", index=True, readonly=True,
+                              help="Identifies the project content the offer was rendered from.")
+    user_id = fields.Many2one("res.users", string="Requested By", default=lambda self: self.env.user, readonly=True)
+
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string="Status", default='pending', required=True, readonly=True)
+    attachment_id = fields.Many2one("ir.attachment", string="PDF", readonly=True, ondelete="set null")
+    pdf = fields.Binary(string="Download", related="attachment_id.datas")
+    pdf_name = fields.Char(related="attachment_id.name")
+    error = fields.Text(string="Error", readonly=True)
+    date_done = fields.Datetime(string="Rendered On", readonly=True)
+    duration = fields.Float(string="Duration (s)", readonly=True, digits=(16, 2))
+
+    @api.model
+    def _enqueue(self, projects):
+        """Queue the offer of each project, unless an identical one is already
+        queued or rendered. Return the jobs, existing ones included."""
+        jobs = self.browse()
+        vals_list = []
+        for project in projects:
+            fingerprint = project._get_report_fingerprint()
+            job = self.search([
+                ('res_model', '=', project._name),
+                ('res_id', '=', project.id),
+                ('fingerprint', '=', fingerprint),
+                ('state', 'in', ('pending', 'done')),
+            ], limit=1)
+            if job.state == 'done' and not job.attachment_id:
+                job = self.browse()
+            if job:
+                jobs |= job
+            else:
+                vals_list.append({
+                    'name': project.offer_code or project.name,
+                    'res_model': project._name,
+                    'res_id': project.id,
+                    'report_xmlid': project._offer_report,
+                    'fingerprint': fingerprint,
+                })
+        if vals_list:
+            jobs |= self.create(vals_list)
+            self.env.ref('hvac_calculation.ir_cron_hvac_report_jobs')._trigger()
+        return jobs
+
+    def _render(self):
+        self.ensure_one()
+        start = time.perf_counter()
+        project = self.env[self.res_model].browse(self.res_id)
+        project = project.with_context(hvac_offer_fingerprints=project._get_report_fingerprints())
+        report = project.env['ir.actions.report'].with_user(self.user_id).with_company(self.user_id.company_id)
+        # the offer reports store their PDF as a content-keyed attachment
+        pdf, _format = report._render_qweb_pdf(self.report_xmlid, [self.res_id])
+        attachment = project._get_offer_attachment() or self.env['ir.attachment'].create({
+            'name': project._get_offer_attachment_name(),
+            'type': 'binary',
+            'raw': pdf,
+            'mimetype': 'application/pdf',
+            'res_model': self.res_model,
+            'res_id': self.res_id,
+        })
+        self.write({
+            'state': 'done',
+            'attachment_id': attachment.id,
+            'date_done': fields.Datetime.now(),
+            'duration': time.perf_counter() - start,
+            'error': False,
+        })
+
+    def _notify(self):
+        for job in self:
+            done = job.state == 'done'
+            job.user_id._bus_send("simple_notification", {
+                'type': 'success' if done else 'danger',
+                'title': "Offer Ready" if done else "Offer Rendering Failed",
+                'message': f"{job.name}: " + (
+                    "the PDF is attached to the project and listed in Offer Rendering Jobs."
+                    if done else job.error
+                ),
+                'sticky': not done,
+            })
+
+    @api.model
+    def _cron_process_jobs(self, limit=20):
+        """Render pending offers one by one, each in its own transaction.
+
+        Jobs are claimed with ``FOR UPDATE SKIP LOCKED``, so several cron
+        workers can drain the queue in parallel without rendering twice.
+        """
+        cr = self.env.cr
+        for _i in range(limit):
+            cr.execute("""
+                SELECT id FROM hvac_report_job
+                 WHERE state = 'pending'
+              ORDER BY id
+                 LIMIT 1
+                   FOR UPDATE SKIP LOCKED
+            """)
+            row = cr.fetchone()
+            if not row:
+                return
+            job = self.browse(row[0])
+            try:
+                # a savepoint, not a rollback, undoes a failed rendering: the row lock is kept
+                with cr.savepoint():
+                    job._render()
+            except Exception as e:
+                _logger.exception("Rendering of offer job %s failed", job.id)
+                job.write({'state': 'failed', 'error': str(e)})
+            job._notify()
+            cr.commit()
+        # more pending jobs: run again right away
+        self.env.ref('hvac_calculation.ir_cron_hvac_report_jobs')._trigger()
+
+    def action_retry(self):
+        self.filtered(lambda j: j.state == 'failed').write({'state': 'pending', 'error': False})
+        self.env.ref('hvac_calculation.ir_cron_hvac_report_jobs')._trigger()
+
+    def action_open_project(self):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self.res_model,
+            'res_id': self.res_id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
@@ -0,0 +1,314 @@
+from odoo import models, fields, api
+from odoo.exceptions import UserError, ValidationError
+from ..engine import memo, optimizer, scenario, sweep
+from .hvac_perf_stat import instrument_methods
+
+# sweep baseline of each (database, discipline, project, parameter), at the
+# version of the project it was computed for
+_sweep_baselines = memo.VersionedMemo()
+
+PREFERRED_HEIGHTS = [
+    ('580', '580 mm'),
+    ('680', '680 mm'),
+    ('880', '880 mm'),
+]
+
+
+@instrument_methods
+class HVACScenario(models.Model):
+    """What-if variants of a cooling or heating project, compared with the
+    project as designed without copying it: the spaces are read once and
+    every variant is evaluated on the rows (see ``engine.scenario``)."""
+    _name = "hvac.scenario"
+    _description = "HVAC What-If Scenario"
+    _order = "id desc"
+
+    # discipline: (project field, space model, engine function, terminal unit catalog, plant catalog)
+    _disciplines = {
+        'cooling': ('cooling_project_id', 'hvac.cooling.space', scenario.cooling_variant, 'hvac.fcu', 'hvac.chiller'),
+        'heating': ('heating_project_id', 'hvac.heating.space', scenario.heating_variant, 'hvac.radiator', 'hvac.boiler'),
+    }
+    # discipline: space fields read by the engine
+    _space_inputs = {
+        'cooling': (
+            'area', 'watt_per_sqm', 'load_factor_percent', 'qty', 'system_type', 'selected_fcu_id',
+            'thermostat_price', 'orientation', 'wall_area', 'window_area', 'occupants',
+            'lighting_w_per_sqm', 'equipment_w_per_sqm', 'schedule',
+        ),
+        'heating': (
+            'area', 'watt_per_sqm', 'load_factor_percent', 'qty', 'system_type', 'is_bathroom',
+            'preferred_height', 'selected_radiator_id', 'ufh_price_per_sqm', 'thermostat_price',
+        ),
+    }
+    # discipline: {engine input: project field}
+    _project_inputs = {
+        'cooling': {
+            'max_units_per_space': 'max_units_per_space', 'plant_max_units': 'plant_max_units',
+            'redundancy': 'chiller_redundancy', 'plant_ranking': 'plant_ranking',
+            'equipment_discount': 'equipment_discount', 'network_total': 'ductwork_total_after_discount',
+            'ahu_total': 'ahu_total', 'load_method': 'load_method', 'design_temp': 'design_temp',
+            'daily_range': 'daily_range', 'indoor_temp': 'indoor_temp',
+        },
+        'heating': {
+            'max_units_per_space': 'max_units_per_space', 'plant_max_units': 'plant_max_units',
+            'redundancy': 'boiler_redundancy', 'plant_ranking': 'plant_ranking',
+            'equipment_discount': 'equipment_discount', 'network_total': 'piping_total_after_discount',
+        },
+    }
+    # discipline: space field defaults the engine falls back to
+    _space_defaults = {'cooling': ('thermostat_price',), 'heating': ('ufh_price_per_sqm', 'thermostat_price')}
+    # discipline: {engine input: space model setting}
+    _space_settings = {
+        'cooling': {'combination_step': '_fcu_combination_step'},
+        'heating': {'combination_step': '_radiator_combination_step', 'ufh_watt_per_sqm': '_ufh_watt_per_sqm'},
+    }
+    # discipline: space field of the terminal unit kept by the sweeps
+    _sweep_terminal_fields = {'cooling': 'fcu_id', 'heating': 'radiator_id'}
+
+    name = fields.Char(string="Scenario", required=True)
+    discipline = fields.Selection([
+        ('cooling', 'Air Conditioning'),
+        ('heating', 'Central Heating'),
+    ], string="Discipline", required=True, default='cooling')
+    cooling_project_id = fields.Many2one("hvac.cooling.project", string="Cooling Project", ondelete="cascade")
+    heating_project_id = fields.Many2one("hvac.heating.project", string="Heating Project", ondelete="cascade")
+    company_id = fields.Many2one('res.company', string='Company', required=True, default=lambda self: self.env.company)
+    currency_id = fields.Many2one('res.currency', string='Currency', related='company_id.currency_id', readonly=True)
+
+    variant_ids = fields.One2many("hvac.scenario.variant", "scenario_id", string="Variants", copy=True)
+
+    # Baseline: the project evaluated without overrides
+    baseline_load_kw = fields.Float(string="Load (kW)", readonly=True, copy=False, digits=(16, 1))
+    baseline_plant = fields.Char(string="Plant", readonly=True, copy=False)
+    baseline_terminal_qty = fields.Integer(string="Terminal Units", readonly=True, copy=False)
+    baseline_equipment_total = fields.Float(string="Equipment Total", readonly=True, copy=False)
+    baseline_grand_total = fields.Float(string="Grand Total", readonly=True, copy=False)
+    project_grand_total = fields.Float(
+        string="Project Grand Total", compute="_compute_project_grand_total",
+        help="Grand total of the project as quoted, with the quantities entered by hand.",
+    )
+    evaluated_on = fields.Datetime(string="Evaluated On", readonly=True, copy=False)
+    notes = fields.Text(string="Notes")
+
+    @api.depends("discipline", "cooling_project_id.grand_total", "heating_project_id.grand_total")
+    def _compute_project_grand_total(self):
+        for rec in self:
+            rec.project_grand_total = rec._get_project().grand_total
+
+    def _get_project(self):
+        self.ensure_one()
+        return self[self._disciplines[self.discipline][0]]
+
+    @api.model
+    def _get_project_values(self, discipline, project):
+        """Project inputs of the engine, with the settings and defaults of
+        the space model."""
+        space_model = self.env[self._disciplines[discipline][1]]
+        values = {key: project[fname] for key, fname in self._project_inputs[discipline].items()}
+        values.update(space_model.default_get(list(self._space_defaults[discipline])))
+        values.update({key: getattr(space_model, attr) for key, attr in self._space_settings[discipline].items()})
+        return values
+
+    def _describe_plant(self, catalog, result):
+        if not result.plant_unit_id:
+            return False
+        return f"{result.plant_qty} x {catalog.by_id[result.plant_unit_id]['name']}"
+
+    def _get_result_values(self, plants, result):
+        return {
+            'load_kw': result.load_kw,
+            'plant': self._describe_plant(plants, result),
+            'terminal_qty': result.terminal_qty,
+            'equipment_total': result.equipment_total,
+            'grand_total': result.grand_total,
+        }
+
+    # Actions
+    def action_evaluate(self):
+        """Evaluate the project as designed and every variant."""
+        for rec in self:
+            rec._evaluate()
+
+    def _evaluate(self):
+        self.ensure_one()
+        project = self._get_project()
+        if not project:
+            raise UserError("Please select the project of the scenario first.")
+        _fname, space_model, evaluate, unit_model, plant_model = self._disciplines[self.discipline]
+        spaces = self.env[space_model].search_read(
+            [('project_id', '=', project.id)], list(self._space_inputs[self.discipline]), load=None,
+        )
+        index = self.env["hvac.capacity.index"]
+        units, plants = index._get_catalog(unit_model), index._get_catalog(plant_model)
+        values = self._get_project_values(self.discipline, project)
+
+        baseline = evaluate(spaces, values, {}, units, plants)
+        vals = {f"baseline_{fname}": value for fname, value in self._get_result_values(plants, baseline).items()}
+        vals['evaluated_on'] = fields.Datetime.now()
+        self.write(vals)
+        for variant in self.variant_ids:
+            result = evaluate(spaces, values, variant._get_overrides(), units, plants)
+            variant.write(dict(
+                self._get_result_values(plants, result),
+                grand_total_delta=result.grand_total - baseline.grand_total,
+            ))
+
+    # Sensitivity sweeps
+    @api.model
+    def get_sensitivity_sweep(self, discipline, project_id, parameter, start, stop, points=100):
+        """Totals of a cooling or heating project over ``points`` values of
+        ``parameter`` from ``start`` to ``stop``, and the values where its
+        suggested plant unit changes (used by the pricing tool, see
+        ``controllers``).
+
+        ``parameter`` is ``load_factor_percent`` or ``watt_per_sqm``, set on
+        every space, or for heating the radiator ``height`` (the standard
+        heights within the range). The rooms keep their terminal model, see
+        ``engine.sweep``.
+        """
+        if discipline not in self._disciplines:
+            raise UserError(f"Unknown discipline: {discipline}.")
+        fname, space_model, _evaluate, unit_model, plant_model = self._disciplines[discipline]
+        project = self.env[self._fields[fname].comodel_name].browse(project_id).exists()
+        if not project:
+            raise UserError("The project to sweep does not exist.")
+        project.check_access('read')
+        points = int(points)
+        if not 2 <= points <= sweep.MAX_POINTS:
+            raise UserError(f"A sweep has from 2 to {sweep.MAX_POINTS} points.")
+        index = self.env["hvac.capacity.index"]
+        units, plants = index._get_catalog(unit_model), index._get_catalog(plant_model)
+        values = self._get_project_values(discipline, project)
+
+        if parameter == 'height':
+            if discipline != 'heating':
+                raise UserError("Only heating projects can be swept over the radiator height.")
+            low, high = sorted((start, stop))
+            heights = [height for height in sweep.RADIATOR_HEIGHTS if low <= height <= high]
+            spaces = self._get_sweep_spaces(discipline, project.id)
+            result, breakpoints = sweep.height_sweep(spaces, values, heights, units, plants)
+        elif parameter in sweep.LINEAR_PARAMETERS:
+            if min(start, stop) <= 0:
+                raise UserError("The swept values must be positive.")
+            baseline = self._get_sweep_baseline(discipline, project, parameter, values, units)
+            result, breakpoints = sweep.sweep(
+                baseline, sweep.sweep_values(start, stop, points), values, plants, sweep.BASELINES[discipline][1],
+            )
+        else:
+            raise UserError(f"Unknown sweep parameter: {parameter}.")
+
+        def unit_name(unit_id):
+            return plants.by_id[unit_id]['name'] if unit_id else False
+
+        return {
+            'parameter': parameter,
+            'points': [point._asdict() for point in result],
+            'breakpoints': [
+                dict(change._asdict(), from_unit=unit_name(change.from_unit_id), to_unit=unit_name(change.to_unit_id))
+                for change in breakpoints
+            ],
+        }
+
+    @api.model
+    def _get_sweep_version(self, project, space_model):
+        """Version of ``project`` for the sweep baselines: any write on the
+        project or on its spaces, and any space added or removed, changes it."""
+        [(last_write, count)] = self.env[space_model]._read_group(
+            [('project_id', '=', project.id)], aggregates=['write_date:max', '__count'],
+        )
+        return str(project.write_date), str(last_write), count
+
+    @api.model
+    def _get_sweep_spaces(self, discipline, project_id):
+        """Engine rows of the spaces of a project."""
+        space_model = self._disciplines[discipline][1]
+        return self.env[space_model].sudo().search_read(
+            [('project_id', '=', project_id)],
+            list(self._space_inputs[discipline]) + [self._sweep_terminal_fields[discipline]],
+            load=None,
+        )
+
+    @api.model
+    def _get_sweep_baseline(self, discipline, project, parameter, values, units):
+        """Engine baseline of the linear sweeps of a project over ``parameter``.
+
+        It is kept per project and parameter for the next sweeps, and
+        computed again once the project, its spaces, the project ``values``
+        or the terminal unit catalog change.
+        """
+        version = (
+            self._get_sweep_version(project, self._disciplines[discipline][1]),
+            sorted(values.items()), units.revision,
+        )
+        return _sweep_baselines.get(
+            (self.env.cr.dbname, discipline, project.id, parameter), version,
+            lambda: sweep.BASELINES[discipline][0](
+                self._get_sweep_spaces(discipline, project.id), values, parameter, units,
+            ),
+        )
+
+
+class HVACScenarioVariant(models.Model):
+    """One what-if of a scenario: the project inputs it overrides, empty
+    ones keeping the project value, and its evaluated figures."""
+    _name = "hvac.scenario.variant"
+    _description = "HVAC Scenario Variant"
+    _order = "sequence, id"
+
+    sequence = fields.Integer(string="Sequence", default=10)
+    scenario_id = fields.Many2one("hvac.scenario", string="Scenario", required=True, index=True, ondelete="cascade")
+    discipline = fields.Selection(related="scenario_id.discipline")
+    currency_id = fields.Many2one(related="scenario_id.currency_id")
+    name = fields.Char(string="Variant", required=True)
+
+    # Overrides, applied to every space
+    watt_per_sqm = fields.Float(string="Watt / m²")
+    load_factor_percent = fields.Float(string="Load Factor (%)")
+    heating_system_type = fields.Selection([
+        ('ufh', 'Under Floor Heating'),
+        ('radiator', 'Radiator'),
+    ], string="System Type")
+    preferred_height = fields.Selection(PREFERRED_HEIGHTS, string="Radiator Height")
+    # Overrides of the project
+    max_units_per_space = fields.Integer(string="Max Units per Room")
+    redundancy = fields.Selection([
+        ('yes', 'N+1'),
+        ('no', 'No Standby'),
+    ], string="Redundancy")
+    plant_ranking = fields.Selection([
+        ('price', 'Lowest Price'),
+        ('efficiency', 'Best Efficiency'),
+    ], string="Rank Plants By")
+    plant_max_units = fields.Integer(string="Max Plant Units")
+
+    # Results
+    load_kw = fields.Float(string="Load (kW)", readonly=True, copy=False, digits=(16, 1))
+    plant = fields.Char(string="Plant", readonly=True, copy=False)
+    terminal_qty = fields.Integer(string="Terminal Units", readonly=True, copy=False)
+    equipment_total = fields.Float(string="Equipment Total", readonly=True, copy=False)
+    grand_total = fields.Float(string="Grand Total", readonly=True, copy=False)
+    grand_total_delta = fields.Float(string="vs Baseline", readonly=True, copy=False)
+
+    @api.constrains("max_units_per_space")
+    def _check_max_units_per_space(self):
+        for rec in self:
+            # 0 keeps the value of the project
+            if rec.max_units_per_space and not 1 <= rec.max_units_per_space <= optimizer.MAX_UNITS:
+                raise ValidationError(f"The units per room must be between 1 and {optimizer.MAX_UNITS}.")
+
+    def _get_overrides(self):
+        """Engine overrides of this variant: its non-empty inputs."""
+        self.ensure_one()
+        overrides = {
+            'watt_per_sqm': self.watt_per_sqm,
+            'load_factor_percent': self.load_factor_percent,
+            'system_type': self.heating_system_type if self.discipline == 'heating' else False,
+            'preferred_height': self.preferred_height,
+            'max_units_per_space': self.max_units_per_space,
+            'plant_ranking': self.plant_ranking,
+            'plant_max_units': self.plant_max_units,
+        }
+        overrides = {key: value for key, value in overrides.items() if value}
+        if self.redundancy:
+            overrides['redundancy'] = self.redundancy == 'yes'
+        return overrides
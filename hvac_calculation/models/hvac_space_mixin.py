@@ -0,0 +1,129 @@
+from collections import defaultdict
+
+from odoo import models, fields, api
+
+
+class HVACSpaceMixin(models.AbstractModel):
+    _name = "hvac.space.mixin"
+    _description = "HVAC Space Mixin"
+
+    # project total field: space field summed into it
+    _project_totals = {}
+    # fields that do not show in any project total or floor summary
+    _summary_neutral_fields = {'sequence', 'notes'}
+    # fields the network sizing reads, the segment of the space first
+    _network_fields = ()
+
+    building_room_id = fields.Many2one(
+        "hvac.building.room", string="Building Room", index="btree_not_null", readonly=True, ondelete="set null",
+        help="Room of a building this space is calculated for; its shared fields are edited on the building.",
+    )
+
+    def _get_project_total_values(self):
+        """Contribution of this space to each of its project totals."""
+        self.ensure_one()
+        return {total: self[fname] for total, fname in self._project_totals.items()}
+
+    def _sum_project_totals(self):
+        """Sum the contributions of ``self`` per project: ``{project id: {total: value}}``."""
+        totals = defaultdict(lambda: defaultdict(float))
+        for rec in self:
+            project_totals = totals[rec.project_id.id]
+            for total, value in rec._get_project_total_values().items():
+                project_totals[total] += value or 0
+        return totals
+
+    def _apply_project_total_deltas(self, before, after):
+        """Add the difference between two ``_sum_project_totals`` snapshots to
+        the stored project totals, so editing one space costs O(1) whatever
+        the size of the project."""
+        projects = self.env[self._fields['project_id'].comodel_name]
+        for project_id in set(before) | set(after):
+            if not project_id:
+                continue
+            project = projects.browse(project_id).exists()
+            if not project:
+                continue
+            old, new = before.get(project_id, {}), after.get(project_id, {})
+            vals = {}
+            for total in self._project_totals:
+                delta = new.get(total, 0) - old.get(total, 0)
+                if delta:
+                    vals[total] = project[total] + delta
+            if vals:
+                project.write(vals)
+
+    def _get_network_state(self):
+        """Network inputs of each space: ``{space id: values}``."""
+        if not self._network_fields:
+            return {}
+        return {rec.id: tuple(rec[fname] for fname in self._network_fields) for rec in self}
+
+    def _mark_network_dirty(self, before, after):
+        """Mark dirty the segments of the spaces whose network inputs differ
+        between two ``_get_network_state`` snapshots, so that only their
+        branches are re-sized."""
+        if not self._network_fields:
+            return
+        segments = self.env[self._fields[self._network_fields[0]].comodel_name]
+        for space_id in set(before) | set(after):
+            old, new = before.get(space_id), after.get(space_id)
+            if old != new:
+                segments |= (old[0] if old else segments) | (new[0] if new else segments)
+        segments.exists()._mark_dirty()
+
+    def _get_floor_keys(self):
+        """``(project id, floor)`` of each space, if the project has floor summaries."""
+        projects = self.env[self._fields['project_id'].comodel_name]
+        if 'floor_summary_ids' not in projects._fields:
+            return set()
+        return {(rec.project_id.id, rec.floor) for rec in self}
+
+    def _refresh_floor_summaries(self, floor_keys):
+        if floor_keys:
+            projects = self.env[self._fields['project_id'].comodel_name]
+            self.env[projects._fields['floor_summary_ids'].comodel_name]._refresh_floors(floor_keys)
+
+    def _defer_totals(self):
+        """Whether the project totals and floor summaries are left to one
+        ``action_recompute_totals`` of the caller, as bulk imports do with
+        the ``hvac_defer_totals`` context key."""
+        return self.env.context.get('hvac_defer_totals')
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        if not records._defer_totals():
+            totals = records._sum_project_totals()
+            records._apply_project_total_deltas({}, totals)
+            records._refresh_floor_summaries(records._get_floor_keys())
+        records._mark_network_dirty({}, records._get_network_state())
+        return records
+
+    def write(self, vals):
+        if not set(vals) - self._summary_neutral_fields:
+            return super().write(vals)
+        network_before = self._get_network_state()
+        if self._defer_totals():
+            res = super().write(vals)
+        else:
+            before = self._sum_project_totals()
+            floors_before = self._get_floor_keys()
+            res = super().write(vals)
+            self._apply_project_total_deltas(before, self._sum_project_totals())
+            self._refresh_floor_summaries(floors_before | self._get_floor_keys())
+        self._mark_network_dirty(network_before, self._get_network_state())
+        return res
+
+    def unlink(self):
+        network_before = self._get_network_state()
+        if self._defer_totals():
+            res = super().unlink()
+        else:
+            before = self._sum_project_totals()
+            floors_before = self._get_floor_keys()
+            res = super().unlink()
+            self._apply_project_total_deltas(before, {})
+            self._refresh_floor_summaries(floors_before)
+        self._mark_network_dirty(network_before, {})
+        return res
@@ -0,0 +1,52 @@
+from collections import defaultdict
+
+from odoo import models, api
+
+
+class HVACTakeoffLineMixin(models.AbstractModel):
+    """Quantity lines of a project (ductwork, piping) whose subtotals are
+    summed into a project total. The total is kept by delta on every
+    create, write and unlink, so rewriting a few lines of a large takeoff
+    does not re-sum the others."""
+    _name = "hvac.takeoff.line.mixin"
+    _description = "HVAC Takeoff Line Mixin"
+
+    # project field the subtotals are summed into
+    _project_total = None
+
+    def _sum_subtotals(self):
+        """Subtotals of ``self`` per project: ``{project id: amount}``."""
+        totals = defaultdict(float)
+        for rec in self:
+            totals[rec.project_id.id] += rec.subtotal or 0
+        return totals
+
+    def _apply_subtotal_deltas(self, before, after):
+        projects = self.env[self._fields['project_id'].comodel_name]
+        for project_id in set(before) | set(after):
+            delta = after.get(project_id, 0) - before.get(project_id, 0)
+            if not project_id or not round(delta, 6):
+                continue
+            project = projects.browse(project_id).exists()
+            if project:
+                project.write({self._project_total: project[self._project_total] + delta})
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._apply_subtotal_deltas({}, records._sum_subtotals())
+        return records
+
+    def write(self, vals):
+        if not {'project_id', 'quantity', 'unit_price'} & set(vals):
+            return super().write(vals)
+        before = self._sum_subtotals()
+        res = super().write(vals)
+        self._apply_subtotal_deltas(before, self._sum_subtotals())
+        return res
+
+    def unlink(self):
+        before = self._sum_subtotals()
+        res = super().unlink()
+        self._apply_subtotal_deltas(before, {})
+        return res
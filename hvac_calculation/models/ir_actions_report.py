@@ -0,0 +1,18 @@
+from odoo import models
+
+
+class IrActionsReport(models.Model):
+    _inherit = "ir.actions.report"
+
+    def _render_qweb_pdf(self, report_ref, res_ids=None, data=None):
+        report = self._get_report(report_ref)
+        model = self.env[report.model]
+        offers = bool(res_ids and report.attachment and getattr(model, '_offer_report', None))
+        if offers:
+            # the attachment name, the stored PDF lookup and the cleanup share one fingerprint
+            self = self.with_context(hvac_offer_fingerprints=model.browse(res_ids).exists()._get_report_fingerprints())
+        result = super()._render_qweb_pdf(report_ref, res_ids=res_ids, data=data)
+        if offers:
+            # keep only the PDF of the current content of each offer
+            self.env[report.model].browse(res_ids).exists()._unlink_stale_offer_attachments()
+        return result
@@ -0,0 +1 @@
+from . import hvac_project_report
@@ -0,0 +1,337 @@
+from collections import defaultdict
+
+from odoo import models, api
+
+
+def _money(value):
+    return '{:,.0f}'.format(value or 0)
+
+
+class HVACProjectReport(models.AbstractModel):
+    """Data of the offer reports, read for all the printed projects at once.
+
+    The templates only loop over the plain, already formatted dicts of
+    ``offers[doc.id]``: no relational field is read while rendering. The
+    reports of each discipline implement ``_prepare_offers(projects)``,
+    returning ``{project id: {'groups': [...], 'totals': {...}, 'lines':
+    [...], 'grand_total': str}}``.
+    """
+    _name = "report.hvac_calculation.project_offer"
+    _description = "HVAC Offer Report Data"
+
+    _project_model = None
+    _space_model = None
+    # space field the load table is grouped by, and the group subtotals
+    # (space field: format)
+    _group_field = "floor"
+    _group_sums = {}
+    # per-floor summary model holding the subtotals, if any
+    _summary_model = None
+
+    @api.model
+    def _get_report_values(self, docids, data=None):
+        docs = self.env[self._project_model].browse(docids)
+        return {
+            'doc_ids': docids,
+            'doc_model': self._project_model,
+            'docs': docs,
+            'offers': self._prepare_offers(docs),
+        }
+
+    # Helpers
+    def _labels(self, model_name, fname):
+        field = self.env[model_name]._fields[fname]
+        return dict(field._description_selection(self.env))
+
+    def _group_spaces(self, projects, spaces, make_row):
+        """Rows of the load table per project, grouped by ``_group_field``,
+        each group with its subtotals."""
+        sums = self._get_group_sums(projects)
+        labels = self._labels(self._space_model, self._group_field)
+        groups = defaultdict(list)
+        by_key = {}
+        for space in spaces:
+            key = (space['project_id'], space[self._group_field])
+            group = by_key.get(key)
+            if group is None:
+                group = by_key[key] = {
+                    'label': labels.get(key[1], key[1] or ''),
+                    'rows': [],
+                    **{
+                        fname: fmt.format(value or 0)
+                        for (fname, fmt), value in zip(self._group_sums.items(), sums.get(key, ()))
+                    },
+                }
+                groups[key[0]].append(group)
+            group['rows'].append(make_row(space))
+        return groups
+
+    def _get_group_sums(self, projects):
+        """Subtotals per (project id, group key), in ``_group_sums`` order:
+        the stored floor summaries when the discipline has them, a grouped
+        query of the spaces otherwise."""
+        if self._summary_model:
+            return {
+                (row['project_id'], row['floor']): [row[fname] for fname in self._group_sums]
+                for row in self.env[self._summary_model].search_read(
+                    [('project_id', 'in', projects.ids)],
+                    ['project_id', 'floor', *self._group_sums], load=None,
+                )
+            }
+        return {
+            (project.id, key): values
+            for project, key, *values in self.env[self._space_model]._read_group(
+                [('project_id', 'in', projects.ids)],
+                ['project_id', self._group_field],
+                [f"{fname}:sum" for fname in self._group_sums],
+            )
+        }
+
+    def _line(self, name, unit, qty, price, total):
+        return {'name': name, 'unit': unit, 'qty': qty, 'price': _money(price), 'total': _money(total)}
+
+    def _extra_lines(self, model_name, projects, qty_format):
+        """Financial lines of the free lines (ductwork, piping, equipment)."""
+        units = self._labels(model_name, 'unit')
+        lines = defaultdict(list)
+        for line in self.env[model_name].search_read(
+            [('project_id', 'in', projects.ids)],
+            ['project_id', 'name', 'unit', 'quantity', 'unit_price', 'subtotal'], load=None,
+        ):
+            lines[line['project_id']].append(self._line(
+                line['name'], units.get(line['unit'], line['unit'] or ''),
+                qty_format.format(line['quantity'] or 0), line['unit_price'], line['subtotal'],
+            ))
+        return lines
+
+
+class ReportCoolingProject(models.AbstractModel):
+    _name = "report.hvac_calculation.report_cooling_project_document"
+    _inherit = "report.hvac_calculation.project_offer"
+    _description = "Cooling Offer Report"
+
+    _project_model = "hvac.cooling.project"
+    _space_model = "hvac.cooling.space"
+    _summary_model = "hvac.cooling.floor.summary"
+    _group_sums = {
+        'area': '{:.2f}',
+        'cooling_load_watt': '{:.0f}',
+        'cooling_load_btu': '{:.0f}',
+        'cooling_load_ton': '{:.2f}',
+    }
+
+    def _prepare_offers(self, projects):
+        docs = projects.read([
+            "total_cooling_area", "total_cooling_load_watt", "total_cooling_load_btu", "total_cooling_load_ton",
+            "chiller_id", "chiller_qty", "chiller_price", "ahu_ids", "thermostat_count", "thermostat_total",
+            "grand_total",
+        ], load=None)
+        spaces = self.env[self._space_model].search_read([('project_id', 'in', projects.ids)], [
+            "project_id", "floor", "room_name", "area", "cooling_load_watt", "cooling_load_btu",
+            "cooling_load_ton", "fcu_id", "fcu_qty", "fcu_subtotal",
+        ], load=None)
+        chillers = projects._read_by_id("hvac.chiller", {d["chiller_id"] for d in docs}, ["name", "cooling_capacity_ton", "price"])
+        ahus = projects._read_by_id("hvac.ahu", {i for d in docs for i in d["ahu_ids"]}, ["name", "airflow_cfm", "price"])
+        fcus = projects._read_by_id("hvac.fcu", {s["fcu_id"] for s in spaces}, ["name", "cooling_capacity_kw", "price"])
+
+        def make_row(space):
+            fcu = fcus.get(space["fcu_id"])
+            return {
+                'room': space["room_name"] or '',
+                'area': '%.2f' % space["area"],
+                'load_watt': '%.0f' % space["cooling_load_watt"],
+                'load_btu': '%.0f' % space["cooling_load_btu"],
+                'load_ton': '%.2f' % space["cooling_load_ton"],
+                'equipment': '%.1f kW x %s' % (fcu["cooling_capacity_kw"], space["fcu_qty"]) if fcu else '',
+            }
+
+        groups = self._group_spaces(projects, spaces, make_row)
+        fcu_lines = defaultdict(list)
+        for space in spaces:
+            fcu = fcus.get(space["fcu_id"])
+            if fcu:
+                fcu_lines[space["project_id"]].append(self._line(
+                    f"{fcu['name']} - {space['room_name'] or ''}", "No.", space["fcu_qty"],
+                    fcu["price"], space["fcu_subtotal"],
+                ))
+        duct_lines = self._extra_lines("hvac.duct.line", projects, '{:.2f}')
+
+        offers = {}
+        for doc in docs:
+            lines = []
+            chiller = chillers.get(doc["chiller_id"])
+            if chiller:
+                lines.append(self._line(
+                    f"{chiller['name']} ({chiller['cooling_capacity_ton']:.1f} TR)", "No.", doc["chiller_qty"],
+                    chiller["price"], doc["chiller_price"],
+                ))
+            for ahu in (ahus[i] for i in doc["ahu_ids"]):
+                lines.append(self._line(
+                    f"{ahu['name']} ({ahu['airflow_cfm']:.0f} CFM)", "No.", 1, ahu["price"], ahu["price"],
+                ))
+            lines += fcu_lines[doc["id"]]
+            if doc["thermostat_count"]:
+                lines.append(self._line(
+                    "Room Thermostat", "No.", doc["thermostat_count"],
+                    doc["thermostat_total"] / doc["thermostat_count"], doc["thermostat_total"],
+                ))
+            lines += duct_lines[doc["id"]]
+            offers[doc["id"]] = {
+                'groups': groups[doc["id"]],
+                'totals': {
+                    'area': '%.2f' % doc["total_cooling_area"],
+                    'load_watt': '%.0f' % doc["total_cooling_load_watt"],
+                    'load_btu': '%.0f' % doc["total_cooling_load_btu"],
+                    'load_ton': '%.2f' % doc["total_cooling_load_ton"],
+                },
+                'lines': lines,
+                'grand_total': _money(doc["grand_total"]),
+            }
+        return offers
+
+
+class ReportHeatingProject(models.AbstractModel):
+    _name = "report.hvac_calculation.report_heating_project_document"
+    _inherit = "report.hvac_calculation.project_offer"
+    _description = "Heating Offer Report"
+
+    _project_model = "hvac.heating.project"
+    _space_model = "hvac.heating.space"
+    _summary_model = "hvac.heating.floor.summary"
+    _group_sums = {
+        'area': '{:.2f}',
+        'heat_load': '{:.0f}',
+    }
+
+    def _prepare_offers(self, projects):
+        docs = projects.read([
+            "total_heating_area", "total_heat_load", "total_heat_load_kw", "boiler_id", "boiler_qty",
+            "boiler_price", "thermostat_count", "thermostat_total", "grand_total",
+        ], load=None)
+        spaces = self.env[self._space_model].search_read([('project_id', 'in', projects.ids)], [
+            "project_id", "floor", "room_name", "area", "heat_load", "system_type", "radiator_id",
+            "radiator_qty", "radiator_subtotal", "ufh_price_per_sqm", "ufh_subtotal",
+        ], load=None)
+        boilers = projects._read_by_id("hvac.boiler", {d["boiler_id"] for d in docs}, ["name", "price"])
+        radiators = projects._read_by_id("hvac.radiator", {s["radiator_id"] for s in spaces}, ["size_display", "price"])
+        system_types = self._labels(self._space_model, "system_type")
+
+        def make_row(space):
+            radiator = radiators.get(space["radiator_id"])
+            return {
+                'room': space["room_name"] or '',
+                'area': '%.2f' % space["area"],
+                'heat_load': '%.0f' % space["heat_load"],
+                'system': system_types.get(space["system_type"], ''),
+                'equipment': f"{radiator['size_display']} x {space['radiator_qty']}" if radiator else '',
+            }
+
+        groups = self._group_spaces(projects, spaces, make_row)
+        radiator_lines = defaultdict(list)
+        ufh_lines = defaultdict(list)
+        for space in spaces:
+            radiator = radiators.get(space["radiator_id"])
+            if radiator and space["system_type"] == 'radiator':
+                radiator_lines[space["project_id"]].append(self._line(
+                    f"Radiator ({radiator['size_display']}) - {space['room_name'] or ''}", "No.",
+                    space["radiator_qty"], radiator["price"], space["radiator_subtotal"],
+                ))
+            elif space["system_type"] == 'ufh':
+                ufh_lines[space["project_id"]].append(self._line(
+                    f"Under Floor Heating - {space['room_name'] or ''}", "m²", '%.2f' % space["area"],
+                    space["ufh_price_per_sqm"], space["ufh_subtotal"],
+                ))
+        piping_lines = self._extra_lines("hvac.heating.piping.line", projects, '{:.2f}')
+
+        offers = {}
+        for doc in docs:
+            lines = []
+            boiler = boilers.get(doc["boiler_id"])
+            if boiler:
+                lines.append(self._line(boiler["name"], "No.", doc["boiler_qty"], boiler["price"], doc["boiler_price"]))
+            lines += radiator_lines[doc["id"]]
+            lines += ufh_lines[doc["id"]]
+            if doc["thermostat_count"]:
+                lines.append(self._line(
+                    "Room Thermostat (UFH)", "No.", doc["thermostat_count"],
+                    doc["thermostat_total"] / doc["thermostat_count"], doc["thermostat_total"],
+                ))
+            lines += piping_lines[doc["id"]]
+            offers[doc["id"]] = {
+                'groups': groups[doc["id"]],
+                'totals': {
+                    'area': '%.2f' % doc["total_heating_area"],
+                    'heat_load': '%.0f' % doc["total_heat_load"],
+                    'heat_load_kw': '%.2f' % doc["total_heat_load_kw"],
+                },
+                'lines': lines,
+                'grand_total': _money(doc["grand_total"]),
+            }
+        return offers
+
+
+class ReportHotWaterProject(models.AbstractModel):
+    _name = "report.hvac_calculation.report_hotwater_project_document"
+    _inherit = "report.hvac_calculation.project_offer"
+    _description = "Hot Water Offer Report"
+
+    _project_model = "hvac.hotwater.project"
+    _space_model = "hvac.hotwater.space"
+    _group_field = "space_type"
+    _group_sums = {
+        'demand_liters_per_day': '{:.0f}',
+        'pool_volume': '{:.1f}',
+    }
+
+    def _prepare_offers(self, projects):
+        docs = projects.read(["total_demand_liters", "total_pool_volume", "grand_total"], load=None)
+        spaces = self.env[self._space_model].search_read([('project_id', 'in', projects.ids)], [
+            "project_id", "space_type", "name", "qty", "demand_liters_per_day", "pool_volume",
+            "heater_id", "heater_qty", "heater_subtotal", "pool_heater_id", "pool_heater_subtotal",
+        ], load=None)
+        heaters = projects._read_by_id("hvac.water.heater", {s["heater_id"] for s in spaces}, ["name", "price"])
+        pool_heaters = projects._read_by_id("hvac.pool.heater", {s["pool_heater_id"] for s in spaces}, ["name", "price"])
+
+        def make_row(space):
+            equipment = [
+                unit["name"] for unit in (heaters.get(space["heater_id"]), pool_heaters.get(space["pool_heater_id"]))
+                if unit
+            ]
+            return {
+                'name': space["name"] or '',
+                'qty': space["qty"],
+                'demand': '%.0f' % space["demand_liters_per_day"],
+                'pool_volume': '%.1f' % space["pool_volume"],
+                'equipment': " ".join(equipment),
+            }
+
+        groups = self._group_spaces(projects, spaces, make_row)
+        heater_lines = defaultdict(list)
+        pool_heater_lines = defaultdict(list)
+        for space in spaces:
+            heater = heaters.get(space["heater_id"])
+            if heater:
+                heater_lines[space["project_id"]].append(self._line(
+                    f"{heater['name']} - {space['name'] or ''}", "No.", space["heater_qty"],
+                    heater["price"], space["heater_subtotal"],
+                ))
+            pool_heater = pool_heaters.get(space["pool_heater_id"])
+            if pool_heater:
+                pool_heater_lines[space["project_id"]].append(self._line(
+                    f"{pool_heater['name']} - {space['name'] or ''}", "No.", 1,
+                    pool_heater["price"], space["pool_heater_subtotal"],
+                ))
+        equipment_lines = self._extra_lines("hvac.hotwater.equipment.line", projects, '{:.0f}')
+
+        offers = {}
+        for doc in docs:
+            offers[doc["id"]] = {
+                'groups': groups[doc["id"]],
+                'totals': {
+                    'demand': '%.0f' % doc["total_demand_liters"],
+                    'pool_volume': '%.1f' % doc["total_pool_volume"],
+                },
+                'lines': heater_lines[doc["id"]] + pool_heater_lines[doc["id"]] + equipment_lines[doc["id"]],
+                'grand_total': _money(doc["grand_total"]),
+            }
+        return offers
@@ -0,0 +1,5 @@
+from . import test_benchmark
+from . import test_engine
+from . import test_project_totals
+from . import test_quotation
+from . import test_networks
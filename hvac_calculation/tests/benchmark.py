@@ -0,0 +1,141 @@
+"""Benchmark of the compute chains of the three HVAC project types.
+
+Used by ``test_benchmark`` (TransactionCase) and by the standalone runner
+``scripts/hvac_benchmark.py``. Both build synthetic projects of growing size
+and time the same steps, recording wall time and SQL query count.
+"""
+import time
+
+FLOORS = ['basement', 'ground', 'first', 'second', 'third', 'fourth', 'roof', 'annex']
+
+REPORTS = {
+    'hvac.cooling.project': 'hvac_calculation.action_report_cooling_project',
+    'hvac.heating.project': 'hvac_calculation.action_report_heating_project',
+    'hvac.hotwater.project': 'hvac_calculation.action_report_hotwater_project',
+}
+
+
+def cooling_space_vals(index):
+    return {
+        'floor': FLOORS[index % len(FLOORS)],
+        'room_name': f"Room {index + 1}",
+        'area': 10 + index % 40,
+        'qty': 1 + index % 3,
+        'system_type': 'fcu',
+    }
+
+
+def heating_space_vals(index):
+    return {
+        'floor': FLOORS[index % len(FLOORS)],
+        'room_name': f"Room {index + 1}",
+        'area': 8 + index % 30,
+        'is_bathroom': index % 5 == 0,
+        'system_type': 'ufh' if index % 4 == 0 else 'radiator',
+        'preferred_height': ['580', '680', '880'][index % 3],
+    }
+
+
+def hotwater_space_vals(index):
+    if index % 500 == 499:
+        return {
+            'space_type': 'pool',
+            'name': f"Pool {index + 1}",
+            'pool_length': 12,
+            'pool_width': 6,
+        }
+    return {
+        'space_type': 'kitchen' if index % 6 == 0 else 'bathroom',
+        'name': f"Unit {index + 1}",
+        'shower_count': 0 if index % 6 == 0 else 1,
+        'bathtub_count': 1 if index % 7 == 0 else 0,
+        'sink_count': 1,
+    }
+
+
+# project model: (space vals factory, field edited on one space, mass-written vals)
+PROJECT_TYPES = {
+    'hvac.cooling.project': (cooling_space_vals, 'area', {'watt_per_sqm': 120}),
+    'hvac.heating.project': (heating_space_vals, 'area', {'watt_per_sqm': 90}),
+    'hvac.hotwater.project': (hotwater_space_vals, 'qty', {'sink_count': 2}),
+}
+
+
+class HVACBenchmark:
+    """Time create, edit, mass write, equipment selection, report rendering and
+    quotation creation for synthetic projects of each requested size."""
+
+    def __init__(self, env, sizes=(10, 100, 1000, 10000), render_reports=True):
+        self.env = env
+        self.sizes = sizes
+        self.render_reports = render_reports
+        self.results = []
+
+    def measure(self, project_type, size, step, func):
+        env = self.env
+        env.flush_all()
+        env.invalidate_all()
+        queries = env.cr.sql_log_count
+        start = time.perf_counter()
+        func()
+        env.flush_all()
+        seconds = time.perf_counter() - start
+        self.results.append({
+            'project_type': project_type,
+            'size': size,
+            'step': step,
+            'seconds': round(seconds, 6),
+            'queries': env.cr.sql_log_count - queries,
+        })
+
+    def run(self):
+        customer = self.env['res.partner'].create({'name': "HVAC Benchmark Customer"})
+        for project_type in PROJECT_TYPES:
+            for size in self.sizes:
+                self.run_project(project_type, size, customer)
+        return self.results
+
+    def run_project(self, project_type, size, customer):
+        env = self.env
+        space_vals, edited_field, mass_vals = PROJECT_TYPES[project_type]
+        projects = env[project_type]
+        space_model = env[projects._fields['space_ids'].comodel_name]
+        state = {}
+
+        def create():
+            state['project'] = projects.create({
+                'name': f"Benchmark {size}",
+                'customer_id': customer.id,
+                'space_ids': [(0, 0, space_vals(i)) for i in range(size)],
+            })
+
+        def single_field_edit():
+            space = state['project'].space_ids[:1]
+            space[edited_field] += 1
+
+        def mass_write():
+            state['project'].space_ids.write(mass_vals)
+
+        def recompute_equipment():
+            project = state['project']
+            spaces = project.space_ids
+            for fname in ('suggested_fcu_id', 'suggested_radiator_id', 'suggested_heater_id', 'suggested_pool_heater_id'):
+                if fname in space_model._fields:
+                    env.add_to_compute(space_model._fields[fname], spaces)
+            for fname in ('suggested_chiller_id', 'suggested_boiler_id'):
+                if fname in projects._fields:
+                    env.add_to_compute(projects._fields[fname], project)
+
+        def render_report():
+            env['ir.actions.report']._render_qweb_pdf(REPORTS[project_type], state['project'].ids)
+
+        def create_quotation():
+            state['project'].action_create_quotation()
+
+        self.measure(project_type, size, 'create', create)
+        self.measure(project_type, size, 'single_field_edit', single_field_edit)
+        self.measure(project_type, size, 'mass_write', mass_write)
+        self.measure(project_type, size, 'recompute_equipment', recompute_equipment)
+        if self.render_reports:
+            self.measure(project_type, size, 'render_report', render_report)
+        self.measure(project_type, size, 'create_quotation', create_quotation)
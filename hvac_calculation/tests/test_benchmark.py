@@ -0,0 +1,30 @@
+import json
+import os
+
+from odoo.tests import TransactionCase, tagged
+
+from .benchmark import HVACBenchmark, PROJECT_TYPES
+
+
+@tagged('post_install', '-at_install', '-standard', 'hvac_benchmark')
+class TestHVACBenchmark(TransactionCase):
+    """Run with ``--test-tags hvac_benchmark``.
+
+    ``HVAC_BENCHMARK_SIZES`` (default ``10,100``) sets the project sizes and
+    ``HVAC_BENCHMARK_OUTPUT`` the JSON file the results are written to.
+    """
+
+    def test_benchmark(self):
+        sizes = [int(size) for size in os.environ.get('HVAC_BENCHMARK_SIZES', '10,100').split(',')]
+        results = HVACBenchmark(self.env, sizes).run()
+
+        steps = {'create', 'single_field_edit', 'mass_write', 'recompute_equipment', 'render_report', 'create_quotation'}
+        for project_type in PROJECT_TYPES:
+            for size in sizes:
+                measured = {r['step'] for r in results if r['project_type'] == project_type and r['size'] == size}
+                self.assertEqual(measured, steps)
+
+        output = os.environ.get('HVAC_BENCHMARK_OUTPUT')
+        if output:
+            with open(output, 'w') as f:
+                json.dump({'sizes': sizes, 'results': results}, f, indent=2)
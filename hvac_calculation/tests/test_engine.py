@@ -0,0 +1,256 @@
+from odoo.tests import BaseCase, tagged
+
+from ..engine import duct, hourly, hydronic, loads, memo, plant, scenario, selection, sweep
+
+
+@tagged('post_install', '-at_install')
+class TestHVACEngine(BaseCase):
+    """The calculation core, without database."""
+
+    def test_cooling_loads(self):
+        watts, btus, tons = loads.cooling_loads([20, 0, 10], [150, 150, 0], [100, 50, 0], [2, 1, 0])
+        self.assertEqual(watts, [6000, 0, 1500])
+        self.assertAlmostEqual(btus[0], 6000 * 3.412)
+        self.assertAlmostEqual(tons[0], 6000 / 3517)
+        self.assertEqual(loads.cooling_load(20, 150, 100, 2), (watts[0], btus[0], tons[0]))
+
+    def test_hourly_block_load(self):
+        outdoor = hourly.outdoor_temperatures(43, 12)
+        self.assertEqual((max(outdoor), outdoor.index(max(outdoor))), (43, 15))
+        room = {'area': 20, 'window_area': 6, 'wall_area': 10, 'occupants': 2}
+        east = hourly.room_profile(dict(room, orientation='e'), outdoor)
+        west = hourly.room_profile(dict(room, orientation='w'), outdoor)
+        self.assertLess(hourly.peak(east)[1], 12)
+        self.assertGreater(hourly.peak(west)[1], 12)
+        self.assertEqual(hourly.room_profile(dict(room, qty=3), outdoor), [
+            load * 3 for load in hourly.room_profile(room, outdoor)
+        ])
+        # east and west glass peak at different hours: the block peak is
+        # below the sum of the room peaks
+        block_peak, _hour, diversity = hourly.block_load([east, west, False])
+        self.assertLess(block_peak, max(east) + max(west))
+        self.assertAlmostEqual(diversity, block_peak / (max(east) + max(west)))
+        self.assertEqual(hourly.block_load([]), (0.0, 0, 1.0))
+
+    def test_heat_loads(self):
+        self.assertEqual(loads.heat_loads([12, 30], [0, 80], [100, 50], [1, 2]), [1200, 2400])
+        self.assertEqual(loads.units_needed(2400, 1000), 3)
+        self.assertEqual(loads.units_needed(0, 1000), 1)
+        self.assertEqual(loads.units_needed(2400, 0), 1)
+
+    def test_hot_water(self):
+        self.assertEqual(
+            loads.fixture_demands(['bathroom', 'pool', 'kitchen'], [1, 1, 0], [1, 0, 0], [1, 0, 2], [2, 1, 1]),
+            [340, 0, 40],
+        )
+        self.assertEqual(loads.peak_flows([1, 0], [1, 0], [2, 1]), [35, 5])
+        areas, volumes = loads.pool_dimensions_batch([10, 0], [5, 4], [0, 2])
+        self.assertEqual((areas, volumes), ([50, 0], [75, 0]))
+        self.assertEqual(loads.pool_heating_kws(['pool', 'other'], [75, 75]), [15, 0])
+
+    def test_hydronic_network(self):
+        pipes = [hydronic.Pipe(pipe_id, diameter, 0.007, 0) for pipe_id, diameter in ((1, 16), (2, 20), (3, 32))]
+        # boiler -> 1 -> (2, 3), emitters of 2 kW at the end of 2 and 3
+        segments = {
+            1: {'parent_id': None, 'length': 10, 'heat_load': 0},
+            2: {'parent_id': 1, 'length': 5, 'heat_load': 2000},
+            3: {'parent_id': 1, 'length': 20, 'heat_load': 2000},
+        }
+        result = hydronic.solve(segments, pipes)
+        self.assertEqual(result.segments[1].heat_load, 4000)
+        self.assertAlmostEqual(result.segments[1].flow, 2 * result.segments[2].flow)
+        self.assertGreaterEqual(result.segments[1].pipe_id, result.segments[2].pipe_id)
+        self.assertEqual(result.index_path, [1, 3])
+        self.assertAlmostEqual(
+            result.index_pressure_drop,
+            result.segments[1].pressure_drop + result.segments[3].pressure_drop + hydronic.EMITTER_PRESSURE_DROP,
+        )
+        # more load at the end of 2: only 2 and the segment feeding it are sized again
+        changed = {**segments, 2: dict(segments[2], heat_load=6000)}
+        incremental = hydronic.solve(changed, pipes, previous=result.segments, dirty=[2])
+        self.assertEqual(incremental.resized, [1, 2])
+        self.assertEqual(incremental.segments, hydronic.solve(changed, pipes).segments)
+        oversized = {**segments, 4: {'parent_id': None, 'length': 1, 'heat_load': 10 ** 6}}
+        self.assertEqual(hydronic.solve(oversized, pipes).unsized, [4])
+        with self.assertRaises(ValueError):
+            hydronic.topological_order({1: 2, 2: 1})
+
+    def test_duct_network(self):
+        # AHU -> 1 -> (2, 3), rooms of 400 CFM at the end of 2 and 3
+        segments = {
+            1: {'parent_id': None, 'length': 10, 'airflow': 0},
+            2: {'parent_id': 1, 'length': 5, 'airflow': 400},
+            3: {'parent_id': 1, 'length': 20, 'airflow': 400},
+        }
+        result = duct.solve(segments)
+        main, branch = result.segments[1], result.segments[3]
+        self.assertEqual(main.airflow, 800)
+        self.assertGreater(main.diameter, branch.diameter)
+        self.assertLessEqual(main.gradient, duct.FRICTION_RATE)
+        self.assertLessEqual(main.velocity, duct.MAX_VELOCITY)
+        self.assertGreaterEqual(duct.equivalent_diameter(main.width, main.height), main.diameter)
+        self.assertEqual(result.index_path, [1, 3])
+        self.assertAlmostEqual(result.index_pressure_drop, main.pressure_drop + branch.pressure_drop)
+        # static regain slows the branches down: never smaller than equal friction
+        regain = duct.solve(segments, 'static_regain')
+        self.assertGreaterEqual(regain.segments[3].diameter, branch.diameter)
+        changed = {**segments, 3: dict(segments[3], airflow=1200)}
+        incremental = duct.solve(changed, previous=result.segments, dirty=[3])
+        self.assertEqual(incremental.resized, [1, 3])
+        self.assertEqual(incremental.segments, duct.solve(changed).segments)
+        oversized = {**segments, 4: {'parent_id': None, 'length': 1, 'airflow': 10 ** 6}}
+        self.assertEqual(duct.solve(oversized).unsized, [4])
+        self.assertAlmostEqual(duct.sheet_weight(1, 1), 7.85)
+        diffusers = [(1, 150), (2, 300), (3, 500)]
+        self.assertEqual(duct.select_diffusers(250, diffusers), (2, 1))
+        self.assertEqual(duct.select_diffusers(550, diffusers), (2, 2))
+        self.assertIsNone(duct.select_diffusers(0, diffusers))
+
+    def test_selection(self):
+        catalog = selection.EquipmentCatalog([
+            {'id': 1, 'watt_output': 800, 'radiator_type': 'aluminum', 'height': 680},
+            {'id': 2, 'watt_output': 1500, 'radiator_type': 'aluminum', 'height': 680},
+            {'id': 3, 'watt_output': 600, 'radiator_type': 'towel', 'height': 1200},
+        ], 'watt_output')
+        self.assertEqual(catalog.index(radiator_type='aluminum').smallest_covering_batch([500, 1000, 2000]), [1, 2, False])
+        self.assertEqual(selection.suggest_radiator(catalog, 1000, False, 680), 2)
+        self.assertEqual(selection.suggest_radiator(catalog, 3000, False, 680), 2)
+        self.assertEqual(selection.suggest_radiator(catalog, 3000, False, 880), 2)
+        self.assertEqual(selection.suggest_radiator(catalog, 400, True, 680), 3)
+
+    def test_cheapest_combination(self):
+        catalog = selection.EquipmentCatalog([
+            {'id': 1, 'name': 'FCU 2', 'cooling_capacity_kw': 2.0, 'price': 450},
+            {'id': 2, 'name': 'FCU 3', 'cooling_capacity_kw': 3.0, 'price': 900},
+            {'id': 3, 'name': 'FCU 5', 'cooling_capacity_kw': 5.0, 'price': 1000},
+        ], 'cooling_capacity_kw')
+        table = catalog.combinations(0.1, 3)
+        # 2 x FCU 2 is cheaper than the single FCU 5 covering 4 kW
+        self.assertEqual(table.cheapest(4.0).units, ((1, 2),))
+        # 5 + 2 covers 6.5 kW for less than 2 x FCU 5 or 4 x FCU 2
+        best = table.cheapest(6.5)
+        self.assertEqual((best.units, best.cost), (((3, 1), (1, 1)), 1450))
+        self.assertEqual(catalog.describe(best), "1 x FCU 5 + 1 x FCU 2")
+        self.assertEqual(table.cheapest_homogeneous(6.5).units, ((3, 2),))
+        self.assertIsNone(table.cheapest(16))
+        self.assertIs(catalog.combinations(0.1, 3), table)
+
+    def test_plant_staging(self):
+        chillers = selection.EquipmentCatalog([
+            {'id': 1, 'name': 'CH 300', 'cooling_capacity_kw': 300, 'price': 75000, 'cop': 3.0, 'eer': 0},
+            {'id': 2, 'name': 'CH 500', 'cooling_capacity_kw': 500, 'price': 90000, 'cop': 0, 'eer': 13.6},
+        ], 'cooling_capacity_kw')
+        table = chillers.plants(plant.chiller_cop, 4)
+        # no single unit covers 1100 kW: 3 x CH 500 is cheaper than 4 x CH 300
+        best = table.cheapest(1100)
+        self.assertEqual((best.unit_id, best.duty_qty, best.qty, best.cost), (2, 3, 3, 270000))
+        best = table.cheapest(1100, redundancy=True)
+        self.assertEqual((best.unit_id, best.qty, best.cost), (2, 4, 360000))
+        self.assertEqual(table.best(550, ranking='efficiency').unit_id, 2)
+        self.assertEqual(table.best(550, ranking='price').unit_id, 1)
+        self.assertEqual([option.unit_id for option in table.options(550)], [1, 2])
+        self.assertIsNone(table.cheapest(2100))
+
+    def test_scenario_variants(self):
+        radiators = selection.EquipmentCatalog([
+            {'id': 1, 'name': 'R 680', 'watt_output': 1000, 'radiator_type': 'aluminum', 'height': 680, 'price': 100},
+            {'id': 2, 'name': 'R 880', 'watt_output': 1400, 'radiator_type': 'aluminum', 'height': 880, 'price': 130},
+        ], 'watt_output')
+        boilers = selection.EquipmentCatalog([
+            {'id': 1, 'name': 'B 30', 'kw_output': 30, 'price': 3000, 'efficiency': 92},
+        ], 'kw_output')
+        room = {
+            'area': 20, 'watt_per_sqm': 100, 'load_factor_percent': 100, 'qty': 1, 'system_type': 'radiator',
+            'is_bathroom': False, 'preferred_height': '680', 'selected_radiator_id': False,
+            'ufh_price_per_sqm': 1500, 'thermostat_price': 5000,
+        }
+        project = {
+            'max_units_per_space': 4, 'plant_max_units': 4, 'redundancy': False, 'plant_ranking': 'price',
+            'equipment_discount': 0, 'network_total': 500,
+            'combination_step': 25, 'ufh_watt_per_sqm': 80, 'ufh_price_per_sqm': 1500, 'thermostat_price': 5000,
+        }
+        base = scenario.heating_variant([room] * 10, project, {}, radiators, boilers)
+        # 10 rooms of 2 kW: 2 x R 680 each, one boiler
+        self.assertEqual((base.load_kw, base.plant_qty, base.terminal_qty), (20, 1, 20))
+        self.assertEqual(base.grand_total, 3000 + 20 * 100 + 500)
+        taller = scenario.heating_variant([room] * 10, project, {'preferred_height': '880'}, radiators, boilers)
+        self.assertEqual(taller.terminal_qty, 20)
+        self.assertEqual(taller.equipment_total, 3000 + 20 * 130)
+        # UFH at 80 W/m²: area and thermostat prices instead of radiators
+        ufh = scenario.heating_variant([room] * 10, project, {'system_type': 'ufh'}, radiators, boilers)
+        self.assertEqual((ufh.load_kw, ufh.terminal_qty), (16, 0))
+        self.assertEqual(ufh.equipment_total, 3000 + 10 * (20 * 1500 + 5000))
+        standby = scenario.heating_variant([room] * 10, project, {'redundancy': True}, radiators, boilers)
+        self.assertEqual(standby.plant_qty, 2)
+
+    def test_sensitivity_sweep(self):
+        radiators = selection.EquipmentCatalog([
+            {'id': 1, 'name': 'R 680', 'watt_output': 1000, 'radiator_type': 'aluminum', 'height': 680, 'price': 100},
+            {'id': 2, 'name': 'R 580', 'watt_output': 800, 'radiator_type': 'aluminum', 'height': 580, 'price': 70},
+        ], 'watt_output')
+        boilers = selection.EquipmentCatalog([
+            {'id': 1, 'name': 'B 30', 'kw_output': 30, 'price': 3000, 'efficiency': 92},
+            {'id': 2, 'name': 'B 60', 'kw_output': 60, 'price': 4000, 'efficiency': 94},
+        ], 'kw_output')
+        room = {
+            'area': 20, 'watt_per_sqm': 100, 'load_factor_percent': 100, 'qty': 1, 'system_type': 'radiator',
+            'is_bathroom': False, 'preferred_height': '680', 'selected_radiator_id': 1, 'radiator_id': 1,
+            'ufh_price_per_sqm': 0, 'thermostat_price': 0,
+        }
+        project = {
+            'max_units_per_space': 4, 'plant_max_units': 1, 'redundancy': False, 'plant_ranking': 'price',
+            'equipment_discount': 0, 'network_total': 500,
+            'combination_step': 25, 'ufh_watt_per_sqm': 80, 'ufh_price_per_sqm': 1500, 'thermostat_price': 5000,
+        }
+        spaces = [room] * 10
+        baseline = sweep.heating_baseline(spaces, project, 'load_factor_percent', radiators)
+        self.assertEqual((baseline.load_slope, sum(baseline.terminals.values())), (200, 10))
+        points, breakpoints = sweep.sweep(
+            baseline, sweep.sweep_values(50, 200, 7), project, boilers, plant.boiler_efficiency,
+        )
+        # each point as the variant with the same load factor
+        for point in points:
+            variant = scenario.heating_variant(spaces, project, {'load_factor_percent': point.value}, radiators, boilers)
+            self.assertEqual(point[1:], variant)
+        # 200 W per % of load factor: the 30 kW boiler is too small above 150 %
+        self.assertEqual(len(breakpoints), 1)
+        self.assertAlmostEqual(breakpoints[0].value, 150, places=3)
+        self.assertEqual(breakpoints[0][1:], (1, 2))
+        points, breakpoints = sweep.height_sweep(spaces, project, [580, 680], radiators, boilers)
+        # the radiators are re-selected: 3 x R 580 or 2 x R 680 per room
+        self.assertEqual([point.terminal_qty for point in points], [30, 20])
+        self.assertEqual([point.equipment_total for point in points], [3000 + 30 * 70, 3000 + 20 * 100])
+        self.assertFalse(breakpoints)
+
+    def test_selection_memo(self):
+        rows = [{'id': 1, 'name': 'FCU 2', 'cooling_capacity_kw': 2.0, 'price': 450}]
+        catalog = selection.EquipmentCatalog(rows, 'cooling_capacity_kw')
+        stats = memo.selection_memo.stats()
+        self.assertEqual(selection.optimal_fcu(catalog, 3.001, 0.1, 4), 1)
+        self.assertEqual(selection.optimal_fcu(catalog, 3.0012, 0.1, 4), 1)
+        self.assertEqual(memo.selection_memo.hits, stats['hits'] + 1)
+        self.assertEqual(memo.selection_memo.misses, stats['misses'] + 1)
+        # a new catalog revision never reuses the old results
+        selection.optimal_fcu(selection.EquipmentCatalog(rows, 'cooling_capacity_kw'), 3.001, 0.1, 4)
+        self.assertEqual(memo.selection_memo.misses, stats['misses'] + 2)
+
+        # the load is rounded up to its bucket, so the memoised result still covers it
+        rows = [{'id': 1, 'name': 'FCU 2.5', 'cooling_capacity_kw': 2.5, 'price': 100}]
+        catalog = selection.EquipmentCatalog(rows, 'cooling_capacity_kw')
+        best = selection.cheapest_fcus(catalog, 5.004, 0.1, 4)
+        self.assertEqual(best.units, ((1, 3),))
+        self.assertGreaterEqual(best.capacity, 5.004)
+
+        lru = memo.SelectionMemo(maxsize=2)
+        for key in ('a', 'b', 'a', 'c'):
+            lru.get(key, lambda: key.upper())
+        self.assertEqual(lru.stats()['size'], 2)
+        self.assertEqual(lru.get('b', lambda: 'new'), 'new')
+        self.assertEqual((lru.hits, lru.misses), (1, 4))
+
+        versioned = memo.VersionedMemo(maxsize=2)
+        self.assertEqual(versioned.get('a', 1, lambda: 'a1'), 'a1')
+        self.assertEqual(versioned.get('a', 1, lambda: 'new'), 'a1')
+        # a new version replaces the entry of the key
+        self.assertEqual(versioned.get('a', 2, lambda: 'a2'), 'a2')
+        self.assertEqual(len(versioned._data), 1)
@@ -0,0 +1,29 @@
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestHVACNetworks(TransactionCase):
+
+    def test_piping_resize_without_pipes(self):
+        pipe = self.env['hvac.heating.piping.material'].create({
+            'name': "PPR 32", 'material_type': 'ppr', 'diameter': 32, 'unit': 'meter', 'price_per_unit': 10,
+        })
+        project = self.env['hvac.heating.project'].create({'name': "Piping"})
+        segment = self.env['hvac.heating.pipe.segment'].create({'project_id': project.id, 'name': "Main"})
+        space = self.env['hvac.heating.space'].create({
+            'project_id': project.id, 'room_name': "Bedroom", 'area': 12, 'pipe_segment_id': segment.id,
+        })
+        project.action_size_piping()
+        self.assertFalse(segment.dirty)
+        self.assertEqual(segment.material_id, pipe)
+
+        # without any pipe, the edits are saved and the network is left to size
+        pipe.active = False
+        space.area = 20
+        project.pipe_material_type = 'pex'
+        self.assertTrue(segment.dirty)
+
+        pipe.active = True
+        project.pipe_material_type = 'ppr'
+        self.assertFalse(segment.dirty)
+        self.assertAlmostEqual(segment.heat_load, space.heat_load)
@@ -0,0 +1,112 @@
+from odoo.exceptions import ValidationError
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestHVACProjectTotals(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # two units: the small one is cheaper in copies, the large one alone covers the rooms
+        cls.env['hvac.fcu'].search([]).write({'active': False})
+        cls.small_fcu, cls.large_fcu = cls.env['hvac.fcu'].create([
+            {'name': "FCU 2 kW", 'cooling_capacity_kw': 2, 'price': 100},
+            {'name': "FCU 6 kW", 'cooling_capacity_kw': 6, 'price': 1000},
+        ])
+        cls.env['hvac.radiator'].search([]).write({'active': False})
+        cls.small_radiator, cls.large_radiator = cls.env['hvac.radiator'].create([
+            {'name': "Radiator 500 W", 'radiator_type': 'aluminum', 'height': 680, 'watt_output': 500, 'price': 100},
+            {'name': "Radiator 1500 W", 'radiator_type': 'aluminum', 'height': 680, 'watt_output': 1500, 'price': 1000},
+        ])
+
+    def assertTotalsConsistent(self, project):
+        totals = project._get_totals()[project.id]
+        for total, value in totals.items():
+            self.assertAlmostEqual(project[total], value, msg=total)
+
+    def test_cooling_max_units_per_space(self):
+        project = self.env['hvac.cooling.project'].create({
+            'name': "Max units",
+            'space_ids': [(0, 0, {'room_name': "Office", 'area': 30, 'watt_per_sqm': 150, 'system_type': 'fcu'})],
+        })
+        self.assertEqual(project.space_ids.fcu_id, self.small_fcu)
+        self.assertEqual(project.fcu_total, 100)
+
+        project.max_units_per_space = 1
+        self.assertEqual(project.space_ids.fcu_id, self.large_fcu)
+        self.assertEqual(project.fcu_total, 1000)
+        self.assertEqual(project.floor_summary_ids.equipment_cost, project.space_ids.space_subtotal)
+        self.assertTotalsConsistent(project)
+
+        for value in (0, -1, 11):
+            with self.assertRaises(ValidationError), self.cr.savepoint():
+                project.max_units_per_space = value
+
+    def test_heating_max_units_per_space(self):
+        project = self.env['hvac.heating.project'].create({
+            'name': "Max units",
+            'space_ids': [(0, 0, {
+                'room_name': "Bedroom", 'area': 10, 'watt_per_sqm': 100,
+                'system_type': 'radiator', 'preferred_height': '680',
+            })],
+        })
+        self.assertEqual(project.space_ids.radiator_id, self.small_radiator)
+        self.assertEqual(project.radiator_total, 100)
+
+        project.max_units_per_space = 1
+        self.assertEqual(project.space_ids.radiator_id, self.large_radiator)
+        self.assertEqual(project.radiator_total, 1000)
+        self.assertEqual(project.floor_summary_ids.equipment_cost, project.space_ids.space_subtotal)
+        self.assertTotalsConsistent(project)
+
+    def test_floor_summaries(self):
+        project = self.env['hvac.cooling.project'].create({
+            'name': "Floors",
+            'space_ids': [
+                (0, 0, {'room_name': "Lobby", 'floor': 'ground', 'area': 20, 'system_type': 'fcu'}),
+                (0, 0, {'room_name': "Office", 'floor': 'first', 'area': 30, 'system_type': 'fcu'}),
+            ],
+        })
+        lobby, office = project.space_ids
+        lobby.area = 25
+        office.floor = 'ground'
+        self.assertEqual(project.floor_summary_ids.mapped('floor'), ['ground'])
+        self.assertEqual(project.floor_summary_ids.area, 55)
+        lobby.unlink()
+        self.assertEqual(project.floor_summary_ids.area, 30)
+
+    def test_deferred_totals(self):
+        project = self.env['hvac.cooling.project'].create({'name': "Import"})
+        self.env['hvac.cooling.space'].with_context(hvac_defer_totals=True).create([{
+            'project_id': project.id, 'room_name': f"Office {i}", 'area': 20, 'system_type': 'fcu',
+        } for i in range(3)])
+        self.assertFalse(project.total_cooling_area)
+        self.assertFalse(project.floor_summary_ids)
+        project.action_recompute_totals()
+        self.assertEqual(project.total_cooling_area, 60)
+        self.assertEqual(project.floor_summary_ids.area, 60)
+        self.assertTotalsConsistent(project)
+
+    def test_plant_qty_without_form(self):
+        cooling = self.env['hvac.cooling.project'].create({
+            'name': "Plant",
+            'chiller_redundancy': True,
+            'space_ids': [(0, 0, {'room_name': "Hall", 'area': 100, 'system_type': 'fcu'})],
+        })
+        self.assertGreaterEqual(cooling.suggested_chiller_qty, 2)
+        self.assertEqual(cooling.chiller_qty, cooling.suggested_chiller_qty)
+        self.assertEqual(cooling.chiller_price, cooling.chiller_id.price * cooling.suggested_chiller_qty)
+
+        heating = self.env['hvac.heating.project'].create({
+            'name': "Plant",
+            'boiler_redundancy': True,
+            'space_ids': [(0, 0, {'room_name': "Hall", 'area': 100, 'system_type': 'ufh'})],
+        })
+        self.assertGreaterEqual(heating.suggested_boiler_qty, 2)
+        self.assertEqual(heating.boiler_qty, heating.suggested_boiler_qty)
+        self.assertEqual(heating.boiler_price, heating.boiler_id.price * heating.suggested_boiler_qty)
+        # a larger quantity set by hand is kept
+        qty = heating.boiler_qty = heating.suggested_boiler_qty + 1
+        heating.boiler_redundancy = False
+        self.assertEqual(heating.boiler_qty, qty)
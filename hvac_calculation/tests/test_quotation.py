@@ -0,0 +1,46 @@
+from odoo.exceptions import UserError
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestHVACQuotation(TransactionCase):
+
+    def test_create_quotations(self):
+        customer = self.env['res.partner'].create({'name': "Customer"})
+        confirmed, draft = self.env['hvac.cooling.project'].create([{
+            'name': name,
+            'customer_id': customer.id,
+            'space_ids': [(0, 0, {'room_name': "Office", 'area': 20, 'system_type': 'fcu'})],
+        } for name in ("Confirmed", "Draft")])
+        confirmed.action_confirm()
+
+        (confirmed | draft).action_create_quotations()
+        self.assertEqual(confirmed.state, 'quoted')
+        self.assertTrue(confirmed.sale_order_id)
+        self.assertEqual(confirmed.sale_order_id.partner_id, customer)
+        self.assertEqual(draft.state, 'draft')
+        self.assertFalse(draft.sale_order_id)
+
+    def test_building_quotation(self):
+        customer = self.env['res.partner'].create({'name': "Customer"})
+        building = self.env['hvac.building'].create({
+            'name': "Building",
+            'customer_id': customer.id,
+            'with_hotwater': False,
+            'room_ids': [(0, 0, {'room_name': "Office", 'area': 20})],
+        })
+        building.action_generate_projects()
+        self.assertEqual(building.room_count, 1)
+        cooling, heating = building.cooling_project_id, building.heating_project_id
+        cooling.action_confirm()
+
+        building.action_create_quotation()
+        # only the confirmed project is quoted
+        self.assertEqual(cooling.sale_order_id, building.sale_order_id)
+        self.assertEqual(cooling.state, 'quoted')
+        self.assertFalse(heating.sale_order_id)
+        self.assertEqual(heating.state, 'draft')
+        # nothing left to quote
+        with self.assertRaises(UserError):
+            building.action_create_quotation()
+        self.assertEqual(cooling.sale_order_id, building.sale_order_id)
@@ -0,0 +1,196 @@
+import base64
+import csv
+import io
+import time
+from itertools import islice
+
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+from ..models.hvac_perf_stat import instrument_methods
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+
+@instrument_methods
+class HVACSpaceImport(models.TransientModel):
+    _name = "hvac.space.import"
+    _description = "Import Room Schedule"
+
+    # project model: (space model, importable space fields)
+    _space_models = {
+        "hvac.cooling.project": ("hvac.cooling.space", [
+            "sequence", "floor", "room_name", "area", "height", "watt_per_sqm",
+            "load_factor_percent", "qty", "system_type", "thermostat_price", "orientation",
+            "wall_area", "window_area", "occupants", "lighting_w_per_sqm", "equipment_w_per_sqm",
+            "schedule", "notes",
+        ]),
+        "hvac.heating.project": ("hvac.heating.space", [
+            "sequence", "floor", "room_name", "is_bathroom", "area", "watt_per_sqm",
+            "load_factor_percent", "qty", "system_type", "preferred_height",
+            "ufh_price_per_sqm", "thermostat_price", "notes",
+        ]),
+        "hvac.hotwater.project": ("hvac.hotwater.space", [
+            "sequence", "space_type", "name", "qty", "shower_count", "bathtub_count",
+            "sink_count", "pool_length", "pool_width", "pool_depth", "notes",
+        ]),
+    }
+
+    project_ref = fields.Reference([
+        ('hvac.cooling.project', 'Cooling Project'),
+        ('hvac.heating.project', 'Heating Project'),
+        ('hvac.hotwater.project', 'Hot Water Project'),
+    ], string="Project", required=True)
+
+    file = fields.Binary(string="Room Schedule", required=True, attachment=False)
+    filename = fields.Char(string="File Name")
+    chunk_size = fields.Integer(string="Rows per Batch", default=500)
+
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('done', 'Done'),
+    ], string="Status", default='draft')
+    imported_count = fields.Integer(string="Imported Rows", readonly=True)
+    duration = fields.Float(string="Duration (s)", readonly=True, digits=(16, 3))
+    rows_per_second = fields.Float(string="Throughput (rows/s)", readonly=True, digits=(16, 1))
+
+    @api.model
+    def default_get(self, fields_list):
+        res = super().default_get(fields_list)
+        active_model = self.env.context.get('active_model')
+        active_id = self.env.context.get('active_id')
+        if 'project_ref' in fields_list and active_model in self._space_models and active_id:
+            res['project_ref'] = f"{active_model},{active_id}"
+        return res
+
+    # Reading
+    def _iter_rows(self):
+        """Yield the file rows one by one, header row included."""
+        data = base64.b64decode(self.file)
+        if (self.filename or '').lower().endswith(('.xlsx', '.xlsm')):
+            if openpyxl is None:
+                raise UserError("Reading Excel files requires the openpyxl library.")
+            workbook = openpyxl.load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+            try:
+                for row in workbook.active.iter_rows(values_only=True):
+                    yield row
+            finally:
+                workbook.close()
+        else:
+            stream = io.TextIOWrapper(io.BytesIO(data), encoding='utf-8-sig', newline='')
+            sample = stream.read(4096)
+            stream.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+            except csv.Error:
+                dialect = csv.excel
+            yield from csv.reader(stream, dialect)
+
+    def _get_column_map(self, header, space_model, field_names):
+        """Map each column index to a space field, by field name or label."""
+        lookup = {}
+        for fname in field_names:
+            field = space_model._fields[fname]
+            lookup[fname] = fname
+            lookup[field.string.strip().lower()] = fname
+        column_map = {}
+        for index, title in enumerate(header):
+            key = str(title or '').strip().lower()
+            fname = lookup.get(key) or lookup.get(key.replace(' ', '_'))
+            if fname:
+                column_map[index] = fname
+        if not column_map:
+            raise UserError(
+                "No known column found in the file header. Expected some of: %s"
+                % ", ".join(field_names)
+            )
+        return column_map
+
+    def _convert_value(self, field, value, row_number):
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return None
+        if isinstance(value, str):
+            value = value.strip()
+        try:
+            if field.type == 'float':
+                return float(value)
+            if field.type == 'integer':
+                return int(float(value))
+        except (TypeError, ValueError):
+            raise UserError(f"Row {row_number}: '{value}' is not a valid number for {field.string}.")
+        if field.type == 'boolean':
+            return str(value).lower() in ('1', 'true', 'yes', 'y', 'x')
+        if field.type == 'selection':
+            for key, label in field._description_selection(self.env):
+                if str(value).lower() in (str(key).lower(), str(label).lower()):
+                    return key
+            raise UserError(f"Row {row_number}: '{value}' is not a valid value for {field.string}.")
+        return str(value)
+
+    def _prepare_space_vals(self, row, row_number, column_map, space_model, project):
+        vals = {'project_id': project.id}
+        for index, fname in column_map.items():
+            if index >= len(row):
+                continue
+            value = self._convert_value(space_model._fields[fname], row[index], row_number)
+            if value is not None:
+                vals[fname] = value
+        return vals
+
+    # Action
+    def action_import(self):
+        self.ensure_one()
+        project = self.project_ref
+        if not project:
+            raise UserError("Please select a project first.")
+        space_model_name, field_names = self._space_models[project._name]
+        # the totals and floor summaries are recomputed once, after the last batch
+        space_model = self.env[space_model_name].with_context(hvac_defer_totals=True)
+        chunk_size = max(1, self.chunk_size or 500)
+
+        start = time.perf_counter()
+        rows = self._iter_rows()
+        header = next(rows, None)
+        if not header:
+            raise UserError("The file is empty.")
+        column_map = self._get_column_map(header, space_model, field_names)
+
+        imported = 0
+        row_number = 1
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            vals_list = []
+            for row in chunk:
+                row_number += 1
+                if not any(cell not in (None, '') for cell in row):
+                    continue
+                vals_list.append(self._prepare_space_vals(row, row_number, column_map, space_model, project))
+            if vals_list:
+                space_model.create(vals_list)
+                # Compute and store the space fields of this batch only; the
+                # project-level plant selection stays pending until the end.
+                space_model.flush_model()
+                space_model.invalidate_model()
+                imported += len(vals_list)
+
+        if imported:
+            project.action_recompute_totals()
+        project.flush_recordset()
+        duration = time.perf_counter() - start
+        self.write({
+            'state': 'done',
+            'imported_count': imported,
+            'duration': duration,
+            'rows_per_second': imported / duration if duration else 0,
+        })
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
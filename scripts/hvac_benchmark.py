@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Standalone runner of the HVAC compute-chain benchmark.
+
+Runs the same steps as ``hvac_calculation/tests/test_benchmark.py`` against an
+existing database where ``hvac_calculation`` is installed, rolls everything
+back and writes the results as JSON so releases can be compared::
+
+    python scripts/hvac_benchmark.py -c odoo.conf -d hvac_bench \
+        --sizes 10,100,1000,10000 --output bench-19.0.3.json
+"""
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-c', '--config', help="Odoo configuration file")
+    parser.add_argument('-d', '--database', required=True)
+    parser.add_argument('--sizes', default='10,100,1000,10000', help="comma-separated space counts")
+    parser.add_argument('--no-reports', action='store_true', help="skip PDF report rendering")
+    parser.add_argument('--output', help="JSON file to write (default: stdout)")
+    args = parser.parse_args()
+
+    import odoo
+    from odoo.tools import config
+
+    config.parse_config(['-c', args.config] if args.config else [])
+    from odoo.addons.hvac_calculation.tests.benchmark import HVACBenchmark
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    registry = odoo.modules.registry.Registry(args.database)
+    with registry.cursor() as cr:
+        env = odoo.api.Environment(cr, odoo.SUPERUSER_ID, {})
+        module_version = env['ir.module.module'].search([('name', '=', 'hvac_calculation')]).latest_version
+        results = HVACBenchmark(env, sizes, render_reports=not args.no_reports).run()
+        cr.rollback()
+
+    payload = {
+        'date': datetime.now(timezone.utc).isoformat(),
+        'odoo_version': odoo.release.version,
+        'module_version': module_version,
+        'python_version': platform.python_version(),
+        'sizes': sizes,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(payload, f, indent=2)
+    else:
+        json.dump(payload, sys.stdout, indent=2)
+
+
+if __name__ == '__main__':
+    main()